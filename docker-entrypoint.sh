@@ -0,0 +1,9 @@
+#!/bin/sh
+# Production-запуск: применение миграций из репозитория (без makemigrations), создание таблиц кэшей и gunicorn с воркерами uvicorn
+set -e
+
+cd /app/project
+python manage.py migrate --noinput
+# Таблицы кэшей с {NAME}_CACHE_BACKEND=database
+python manage.py createcachetable
+exec gunicorn core.asgi:application --config core/gunicorn.conf.py
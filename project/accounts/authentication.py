@@ -0,0 +1,201 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+from accounts.models import Profile
+from companies.models import Company
+
+# Поля пользователя, профиля и компании, сохраняемые в кэше токенов (в порядке полей моделей для from_db)
+USER_FIELDS = ('id', 'is_superuser', 'username', 'is_staff', 'is_active')
+PROFILE_FIELDS = ('id', 'user_id', 'team_id', 'position', 'is_administrator')
+TEAM_FIELDS = ('id', 'name', 'structure_id')
+
+
+class ProfileTokenAuthentication(TokenAuthentication):
+    """
+    Аутентификация по токену с загрузкой пользователя, профиля и компании одним запросом.
+    Профиль текущего пользователя доступен в обработчиках как request.user.profile
+    без повторных запросов к БД
+    """
+
+    def authenticate_credentials(self, key):
+        token = self.get_token(key)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return token.user, token
+
+    # Метод для получения токена вместе с пользователем и профилем
+    def get_token(self, key: str) -> Token:
+        model = self.get_model()
+        try:
+            return model.objects.select_related('user__profile__team').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+
+class TokenCache:
+    """
+    Кэш токенов: ограниченный LRU в памяти процесса и общий уровень на Django cache для нескольких воркеров.
+    Сброс записи виден в других воркерах после истечения их локальных записей (local_ttl),
+    поэтому время жизни локального уровня ограничивает окно устаревших данных
+    """
+
+    def __init__(self, max_size: int, ttl: float, alias: str | None = None, local_ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.local_ttl = ttl if local_ttl is None else min(local_ttl, ttl)
+        self.alias = alias
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> 'TokenCache':
+        options = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+        return cls(max_size=options.get('MAX_SIZE', 10000),
+                   ttl=options.get('TTL', 60),
+                   alias=options.get('CACHE_ALIAS'),
+                   local_ttl=options.get('LOCAL_TTL'))
+
+    # Ключ общего кэша не содержит сам токен
+    @staticmethod
+    def shared_key(key: str) -> str:
+        return f'token-auth:{hashlib.sha256(key.encode()).hexdigest()}'
+
+    def get(self, key: str) -> dict | None:
+        with self.lock:
+            item = self.entries.get(key)
+            if item is not None:
+                expires_at, entry = item
+                if expires_at > time.monotonic():
+                    self.entries.move_to_end(key)
+                    return entry
+                del self.entries[key]
+
+        if self.alias:
+            entry = caches[self.alias].get(self.shared_key(key))
+            if entry is not None:
+                self.set_local(key, entry)
+                return entry
+        return None
+
+    def set(self, key: str, entry: dict) -> None:
+        self.set_local(key, entry)
+        if self.alias:
+            caches[self.alias].set(self.shared_key(key), entry, timeout=self.ttl)
+
+    def set_local(self, key: str, entry: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.local_ttl, entry)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+        if self.alias:
+            caches[self.alias].delete(self.shared_key(key))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache.from_settings()
+
+
+def invalidate_user_token(user_id: int) -> None:
+    """
+    Удаление из кэша токенов пользователя после изменения его статуса или профиля.
+    Повторное удаление после фиксации транзакции не дает другим запросам
+    вернуть в кэш еще не измененные данные
+    """
+    invalidate_tokens(Token.objects.filter(user_id=user_id))
+
+
+def invalidate_team_tokens(team_id: int) -> None:
+    """
+    Удаление из кэша токенов сотрудников компании после изменения ее данных
+    """
+    invalidate_tokens(Token.objects.filter(user__profile__team_id=team_id))
+
+
+def invalidate_tokens(tokens) -> None:
+    for key in tokens.values_list('key', flat=True):
+        token_cache.delete(key)
+        transaction.on_commit(lambda key=key: token_cache.delete(key))
+
+
+class CachedTokenAuthentication(ProfileTokenAuthentication):
+    """
+    Аутентификация по токену с кэшированием пользователя, профиля и компании.
+    Повторные запросы с тем же токеном не обращаются к БД в течение TOKEN_AUTH_CACHE['TTL'].
+    Данные, прочитанные внутри незафиксированной транзакции, в кэш не попадают
+    """
+    cache = token_cache
+
+    def get_token(self, key: str) -> Token:
+        entry = self.cache.get(key)
+        if entry is not None:
+            return self.from_entry(key, entry)
+
+        token = super().get_token(key)
+        if not connection.in_atomic_block:
+            self.cache.set(key, self.to_entry(token))
+        return token
+
+    # Асинхронная аутентификация для async-обработчиков.
+    # При попадании в кэш токен восстанавливается без обращения к БД и пулу потоков
+    async def aauthenticate(self, request) -> tuple[User, Token] | None:
+        auth = get_authorization_header(request).split()
+        if len(auth) == 2 and auth[0].lower() == self.keyword.lower().encode():
+            key = auth[1].decode(errors='replace')
+            entry = self.cache.get(key)
+            if entry is not None:
+                token = self.from_entry(key, entry)
+                if token.user.is_active:
+                    return token.user, token
+        return await sync_to_async(self.authenticate)(request)
+
+    # Метод для преобразования токена в запись кэша
+    @staticmethod
+    def to_entry(token: Token) -> dict:
+        profile = getattr(token.user, 'profile', None)
+        team = profile.team if profile else None
+        return {
+            'user': [getattr(token.user, i) for i in USER_FIELDS],
+            'profile': [getattr(profile, i) for i in PROFILE_FIELDS] if profile else None,
+            'team': [getattr(team, i) for i in TEAM_FIELDS] if team else None,
+        }
+
+    # Метод для восстановления токена, пользователя, профиля и компании из записи кэша
+    @staticmethod
+    def from_entry(key: str, entry: dict) -> Token:
+        user = User.from_db(connection.alias, USER_FIELDS, entry['user'])
+        profile = None
+        if entry['profile'] is not None:
+            profile = Profile.from_db(connection.alias, PROFILE_FIELDS, entry['profile'])
+            Profile.user.field.set_cached_value(profile, user)
+            if entry.get('team') is not None:
+                Profile.team.field.set_cached_value(profile, Company.from_db(connection.alias, TEAM_FIELDS,
+                                                                             entry['team']))
+        Profile.user.field.remote_field.set_cached_value(user, profile)
+
+        token = Token.from_db(connection.alias, ('key', 'user_id'), (key, user.id))
+        Token.user.field.set_cached_value(token, user)
+        return token
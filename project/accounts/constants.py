@@ -8,6 +8,15 @@ class Position(models.TextChoices):
     BOSS = 'BOSS', _('Генеральный Менеджер')
 
 
+class ImportStatuses(models.TextChoices):
+    CREATED = 'CREATED', _('Сотрудник зарегистрирован')
+    INVALID = 'INVALID', _('Некорректные данные')
+    DUPLICATE = 'DUPLICATE', _('Имя повторяется в файле')
+    EXISTS = 'EXISTS', _('Пользователь с таким именем уже существует')
+    TEAM_NOT_FOUND = 'TEAM_NOT_FOUND', _('Компания не найдена')
+    FAILED = 'FAILED', _('Ошибка сохранения')
+
+
 class TestProfileData:
     user_1 = {
         'username': 'Petrov',
@@ -43,4 +52,22 @@ class TestProfileData:
 
     new_structure = {'name': 'Линейно-Функциональная'}
 
-
+    profile_search = {'search': 'iv'}
+    profile_filter = {'position': 'BOSS', 'is_administrator': 'false'}
+    profile_page = {'page_size': 2}
+    employees = [
+        {'username': 'Orlov', 'password': 'user1234', 'is_staff': True},
+        {'username': 'Sokolov', 'password': 'user1234'},
+        {'username': 'Orlov', 'password': 'user1234'},
+        {'username': 'Petrov', 'password': 'user1234'},
+        {'username': 'Lebedev', 'password': '123'},
+        {'username': 'Kozlov', 'password': 'user1234', 'team': 999999},
+    ]
+    employees_weak_passwords = [
+        {'username': 'Volkov', 'password': 'password'},
+        {'username': 'Morozov', 'password': 'morozov1'},
+        {'username': 'Zaitsev', 'password': 'user1234'},
+    ]
+    employees_csv = ('username,password,is_staff,team\n'
+                     'Orlov,user1234,true,\n'
+                     'Sokolov,user1234,,\n')
@@ -0,0 +1,64 @@
+import copy
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper
+from rest_framework.authtoken.models import Token
+
+from core.benchmark import measure
+
+# Запрос аутентификации по токену (выполняется в каждом запросе клиента)
+TOKEN_QUERY = ('SELECT t.key, u.id, u.username, u.is_active FROM authtoken_token t '
+               'INNER JOIN auth_user u ON u.id = t.user_id WHERE t.key = %s')
+
+
+class Command(BaseCommand):
+    help = 'Замер стоимости соединения с БД на запрос: новое соединение, постоянное и пул'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200,
+                            help='Количество повторов замера')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stderr.write('Замер доступен только для PostgreSQL')
+            return
+
+        modes = {
+            'new connection': {'CONN_MAX_AGE': 0, 'OPTIONS': {}},
+            'persistent': {'CONN_MAX_AGE': 600, 'OPTIONS': {}},
+            'pool': {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': {'min_size': 1, 'max_size': 2}}},
+            'pool, prepared': {'CONN_MAX_AGE': 0, 'OPTIONS': {'pool': {'min_size': 1, 'max_size': 2},
+                                                              'server_side_binding': True,
+                                                              'prepare_threshold': 1}},
+        }
+
+        # Соединения открываются отдельными обработчиками БД, поэтому токен фиксируется и удаляется явно
+        user = User.objects.create_user(username='benchmark_db_connections', password='benchmark')
+        try:
+            token = Token.objects.create(user=user)
+            for title, overrides in modes.items():
+                settings_dict = {**copy.deepcopy(connection.settings_dict), **overrides}
+                wrapper = DatabaseWrapper(settings_dict, alias=f'benchmark_{title.replace(' ', '_')}')
+                try:
+                    self.report(title, measure(lambda: self.request(wrapper, token.key), options['repeat']))
+                    if wrapper.pool:
+                        self.stdout.write(f'{'':<16} pool stats: {wrapper.pool.get_stats()}')
+                finally:
+                    wrapper.close()
+                    wrapper.close_pool()
+        finally:
+            user.delete()
+
+    # Метод для имитации обработки запроса: начало запроса, аутентификация, завершение запроса
+    @staticmethod
+    def request(wrapper: DatabaseWrapper, key: str) -> None:
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor() as cursor:
+            cursor.execute(TOKEN_QUERY, [key])
+            cursor.fetchone()
+        wrapper.close_if_unusable_or_obsolete()
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<16} median={result['median']}ms p95={result['p95']}ms p99={result['p99']}ms')
@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+
+from accounts.authentication import ProfileTokenAuthentication, CachedTokenAuthentication, TokenCache
+from accounts.models import Profile
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Замер накладных расходов аутентификации по токену с кэшем и без'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=1000,
+                            help='Количество повторов замера')
+        parser.add_argument('--alias', default=None,
+                            help='Алиас общего кэша из CACHES для замера второго уровня')
+
+    def handle(self, *args, **options):
+        # Кэш заполняется только вне транзакций, поэтому данные удаляются явно
+        user = User.objects.create_user(username='benchmark_token_auth', password='benchmark')
+        try:
+            Profile.objects.create(user=user)
+            token = Token.objects.create(user=user)
+            request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {token.key}')
+
+            cached = CachedTokenAuthentication()
+            cached.cache = TokenCache(max_size=100, ttl=3600)
+            backends = [('uncached', ProfileTokenAuthentication()), ('cached', cached)]
+            if options['alias']:
+                shared = CachedTokenAuthentication()
+                shared.cache = TokenCache(max_size=0, ttl=3600, alias=options['alias'])
+                backends.append((f'shared ({options['alias']})', shared))
+
+            for title, backend in backends:
+                backend.authenticate(request)
+                with CaptureQueriesContext(connection) as queries:
+                    backend.authenticate(request)
+                result = measure(lambda: backend.authenticate(request), options['repeat'])
+                self.stdout.write(f'{title:<20} queries={len(queries)} '
+                                  f'median={result['median']}ms p95={result['p95']}ms '
+                                  f'p99={result['p99']}ms')
+        finally:
+            user.delete()
@@ -0,0 +1,50 @@
+import os
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.utils import EmployeeImport
+
+
+class Command(BaseCommand):
+    help = 'Пакетная регистрация сотрудников из CSV или JSON файла с построчным отчетом (JSON Lines)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу сотрудников (.csv или .json)')
+        parser.add_argument('--format', choices=['csv', 'json'], default=None,
+                            help='Формат файла (по умолчанию по расширению)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Количество процессов для хеширования паролей '
+                                 '(по умолчанию количество CPU)')
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Количество строк в одной транзакции '
+                                 '(по умолчанию EMPLOYEE_IMPORT["CHUNK_SIZE"])')
+        parser.add_argument('--report', default=None,
+                            help='Путь к файлу отчета (по умолчанию вывод в stdout)')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        kind = options['format'] or path.suffix.lstrip('.').lower()
+        if kind not in ('csv', 'json'):
+            raise CommandError('Не удалось определить формат файла, укажите --format csv|json')
+
+        try:
+            with path.open(encoding='utf-8-sig', newline='') as stream:
+                rows = EmployeeImport.read_csv(stream) if kind == 'csv' else EmployeeImport.read_json(stream)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Ошибка чтения файла сотрудников. Детали ошибки: {error}.')
+
+        importer = EmployeeImport(rows, workers=options['workers'], chunk_size=options['chunk_size'])
+        report = open(options['report'], 'w', encoding='utf-8') if options['report'] else None
+        try:
+            for line in importer.report():
+                if report:
+                    report.write(line)
+                else:
+                    self.stdout.write(line, ending='')
+        finally:
+            if report:
+                report.close()
+
+        self.stderr.write(self.style.SUCCESS(
+            f'Зарегистрировано сотрудников: {importer.counts["CREATED"]} из {len(rows)}'))
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Индекс для поиска сотрудников по началу имени без учета регистра
+    (username__istartswith -> UPPER(username::text) LIKE UPPER('...%'))
+    """
+
+    dependencies = [
+        ('accounts', '0003_alter_profile_position'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS accounts_user_username_upper_idx '
+                'ON auth_user (UPPER(username::text) text_pattern_ops)',
+            reverse_sql='DROP INDEX IF EXISTS accounts_user_username_upper_idx',
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.contrib.auth.models import User
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
 from rest_framework import serializers
 
-from accounts.constants import Position
+from accounts.constants import Position, ImportStatuses
 from accounts.models import Profile
 from activities.serializers import TaskEstimationSerializer
 
@@ -45,6 +48,58 @@ class ProfileSerializer(serializers.ModelSerializer):
         }
 
 
+class ProfileFilterSerializer(serializers.Serializer):
+    """
+    Сериализатор для параметров фильтрации списка профилей
+    """
+    team = serializers.IntegerField(required=False)
+    position = serializers.ChoiceField(choices=Position.choices, required=False)
+    is_administrator = serializers.BooleanField(required=False, allow_null=True, default=None)
+    search = serializers.CharField(required=False, max_length=150)
+
+
+class EmployeeRowSerializer(serializers.Serializer):
+    """
+    Сериализатор строки импорта сотрудников (без запросов к БД при валидации)
+    """
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    password = serializers.CharField(write_only=True, min_length=8)
+    is_staff = serializers.BooleanField(default=False)
+    team = serializers.IntegerField(required=False, allow_null=True, min_value=1)
+
+    # Проверка пароля валидаторами AUTH_PASSWORD_VALIDATORS (с учетом сходства с именем пользователя)
+    def validate(self, attrs):
+        try:
+            validate_password(attrs['password'], User(username=attrs['username']))
+        except ValidationError as error:
+            raise serializers.ValidationError({'password': list(error.messages)})
+        return attrs
+
+
+class EmployeeImportSerializer(serializers.Serializer):
+    """
+    Сериализатор для импорта сотрудников списком (employees) или CSV-файлом (file)
+    """
+    employees = serializers.ListField(child=serializers.DictField(), required=False, allow_empty=False)
+    file = serializers.FileField(required=False)
+
+    def validate(self, attrs):
+        if ('employees' in attrs) == ('file' in attrs):
+            raise serializers.ValidationError('Укажите список сотрудников (employees) или CSV-файл (file)')
+        return attrs
+
+
+class EmployeeImportResultSerializer(serializers.Serializer):
+    """
+    Сериализатор результата импорта строки (строка отчета в формате JSON Lines)
+    """
+    row = serializers.IntegerField()
+    username = serializers.CharField(allow_null=True)
+    status = serializers.ChoiceField(choices=ImportStatuses.choices)
+    detail = serializers.CharField()
+    profile = serializers.IntegerField(allow_null=True)
+
+
 class SuccessTokenResponse(serializers.Serializer):
     message = serializers.CharField(default='Token для текущего пользователя')
     token = serializers.CharField(default='Some secret token here...')
@@ -59,6 +114,12 @@ class SuccessResponseWithUser(serializers.Serializer):
     data = UserSerializer()
 
 
+class SuccessResponseWithProfiles(serializers.Serializer):
+    message = ProfileSerializer(many=True)
+    next = serializers.URLField(allow_null=True)
+    previous = serializers.URLField(allow_null=True)
+
+
 class Error400Response(serializers.Serializer):
     message = serializers.CharField(default='Введенные данные некорректны')
 
@@ -1,9 +1,22 @@
+import io
 import json
+import tempfile
+import warnings
+from pathlib import Path
 
-from django.test import TestCase, Client
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, Client, RequestFactory, override_settings
+from rest_framework.authtoken.models import Token
 
+from accounts.authentication import CachedTokenAuthentication, TokenCache, token_cache
 from accounts.constants import TestProfileData
 from accounts.models import Profile
+from accounts.utils import EmployeeImport, InlineExecutor
 from companies.models import Company, Structure
 
 
@@ -109,3 +122,239 @@ class TestProfile(TestCase):
             data={'team': '1'}
         )
         self.assertEqual(response.status_code, 202)
+
+    # Получение списка профилей с постраничным выводом
+    def test_get_profiles_paginated(self):
+        response = self.client.get(path=self.AUTH_URL, data=self.data.profile_page,
+                                   headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['message']), 2)
+
+        response = self.client.get(path=response.data['next'],
+                                   headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual([i['name'] for i in response.data['message']], ['Gromov'])
+        self.assertIsNone(response.data['next'])
+
+    # Поиск профилей по началу имени
+    def test_search_profiles(self):
+        response = self.client.get(path=self.AUTH_URL, data=self.data.profile_search,
+                                   headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['name'] for i in response.data['message']], ['Ivanov'])
+
+    # Фильтрация профилей по должности и статусу администратора
+    def test_filter_profiles(self):
+        response = self.client.get(path=self.AUTH_URL, data=self.data.profile_filter,
+                                   headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['name'] for i in response.data['message']], ['Ivanov'])
+
+    # Количество запросов к БД не зависит от числа профилей
+    def test_get_profiles_num_queries(self):
+        for i in range(20):
+            self.client.post(path=self.AUTH_URL, data={**self.data.user_3, 'username': f'Employee{i}'})
+
+        with self.assertNumQueries(2):
+            response = self.client.get(path=self.AUTH_URL,
+                                       headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(len(response.data['message']), 23)
+
+    # Импорт сотрудников списком с построчным отчетом
+    def test_import_employees(self):
+        response = self.client.post(path=f'{self.AUTH_URL}import/',
+                                    data={'employees': self.data.employees},
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        report = [json.loads(i) for i in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([i['status'] for i in report[:-1]],
+                         ['CREATED', 'CREATED', 'DUPLICATE', 'EXISTS', 'INVALID', 'TEAM_NOT_FOUND'])
+        self.assertEqual(report[-1]['summary']['CREATED'], 2)
+
+        profile = Profile.objects.select_related('user').get(id=report[0]['profile'])
+        self.assertEqual(profile.position, 'MANAGER')
+        self.assertTrue(profile.user.check_password(self.data.employees[0]['password']))
+        self.assertTrue(Token.objects.filter(user=profile.user).exists())
+
+    # Импорт сотрудников из CSV-файла
+    def test_import_employees_csv(self):
+        response = self.client.post(path=f'{self.AUTH_URL}import/',
+                                    data={'file': SimpleUploadedFile('employees.csv',
+                                                                     self.data.employees_csv.encode())},
+                                    headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        report = [json.loads(i) for i in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([i['status'] for i in report[:-1]], ['CREATED', 'CREATED'])
+        self.assertEqual(Profile.objects.get(user__username='Sokolov').position, 'EMPLOYEE')
+
+    # Под ASGI отчет импорта отдается построчно, до сохранения следующих порций
+    @override_settings(EMPLOYEE_IMPORT={'WORKERS': 1, 'CHUNK_SIZE': 1})
+    async def test_import_employees_asgi_streaming(self):
+        response = await self.async_client.post(path=f'{self.AUTH_URL}import/',
+                                                data={'employees': self.data.employees},
+                                                content_type='application/json',
+                                                headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            parts = aiter(response)
+            first = json.loads(await anext(parts))
+            self.assertEqual(first['status'], 'CREATED')
+            self.assertFalse(await User.objects.filter(username='Sokolov').aexists())
+            report = [first, *[json.loads(i) async for i in parts]]
+        self.assertEqual(report[-1]['summary']['CREATED'], 2)
+        self.assertTrue(await User.objects.filter(username='Sokolov').aexists())
+
+    # Импорт сотрудников командой с хешированием паролей пулом процессов
+    def test_import_employees_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, 'employees.json')
+            path.write_text(json.dumps(self.data.employees))
+            report = Path(directory, 'report.jsonl')
+            call_command('import_employees', str(path), workers=2, chunk_size=1,
+                         report=str(report), stderr=io.StringIO())
+            lines = [json.loads(i) for i in report.read_text().splitlines()]
+
+        self.assertEqual([i['row'] for i in lines[:-1]], [1, 2, 3, 4, 5, 6])
+        self.assertTrue(User.objects.get(username='Sokolov').check_password('user1234'))
+
+    # Импорт сотрудников доступен только администраторам
+    def test_import_employees_forbidden(self):
+        response = self.client.post(path=f'{self.AUTH_URL}import/',
+                                    data={'employees': self.data.employees},
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Token {self.profile_2.data['token']}'})
+        self.assertEqual(response.status_code, 403)
+
+    # Пароли импортируемых сотрудников проверяются валидаторами AUTH_PASSWORD_VALIDATORS
+    def test_import_employees_weak_passwords(self):
+        response = self.client.post(path=f'{self.AUTH_URL}import/',
+                                    data={'employees': self.data.employees_weak_passwords},
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        report = [json.loads(i) for i in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([i['status'] for i in report[:-1]], ['INVALID', 'INVALID', 'CREATED'])
+        self.assertIn('password', json.loads(report[0]['detail']))
+
+    # Пул процессов хеширования создается один раз и используется всеми импортами
+    def test_import_hashing_pool_shared(self):
+        first = EmployeeImport([], workers=2).executor(2)
+        self.assertIs(EmployeeImport([], workers=2).executor(2), first)
+        self.assertIsInstance(EmployeeImport([], workers=1).executor(2), InlineExecutor)
+
+
+class TestTokenCache(TransactionTestCase):
+    """
+    Кэширование токенов заполняется только вне транзакций, поэтому тесты
+    выполняются без общей транзакции TestCase
+    """
+
+    def setUp(self):
+        self.AUTH_URL = '/api/v1/accounts/'
+        self.data = TestProfileData()
+        token_cache.clear()
+        self.profile_1 = Client().post(path=self.AUTH_URL, data=self.data.user_1)
+        p_1 = Profile.objects.get(id=self.profile_1.data['profile']['id'])
+        p_1.position = 'BOSS'
+        p_1.save()
+        self.profile_2 = Client().post(path=self.AUTH_URL, data=self.data.user_2)
+
+    # Повторная аутентификация по токену без запросов к БД
+    def test_cached_authentication(self):
+        backend = CachedTokenAuthentication()
+        backend.authenticate_credentials(self.profile_1.data['token'])
+
+        with self.assertNumQueries(0):
+            user, token = backend.authenticate_credentials(self.profile_1.data['token'])
+            self.assertEqual(user.username, self.data.user_1['username'])
+            self.assertTrue(user.is_staff)
+            self.assertEqual(user.profile.position, 'BOSS')
+            self.assertEqual(token.user_id, user.id)
+
+    # Компания профиля восстанавливается из кэша, изменение компании сбрасывает кэш ее сотрудников
+    def test_cached_team(self):
+        team = Company.objects.create(name='Cached', structure=Structure.objects.create(name='Cached'))
+        Profile.objects.filter(id=self.profile_1.data['profile']['id']).update(team=team)
+        backend = CachedTokenAuthentication()
+        backend.authenticate_credentials(self.profile_1.data['token'])
+
+        with self.assertNumQueries(0):
+            user, _ = backend.authenticate_credentials(self.profile_1.data['token'])
+            self.assertEqual(user.profile.team.name, 'Cached')
+
+        team.name = 'Renamed'
+        team.save()
+        user, _ = backend.authenticate_credentials(self.profile_1.data['token'])
+        self.assertEqual(user.profile.team.name, 'Renamed')
+
+    # Асинхронная аутентификация по закэшированному токену без запросов к БД
+    def test_cached_async_authentication(self):
+        request = RequestFactory().get('/', headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        backend = CachedTokenAuthentication()
+        async_to_sync(backend.aauthenticate)(request)
+
+        with self.assertNumQueries(0):
+            user, token = async_to_sync(backend.aauthenticate)(request)
+        self.assertEqual(user.profile.position, 'BOSS')
+
+    # Удаленный профиль не проходит аутентификацию по закэшированному токену
+    def test_delete_profile_invalidation(self):
+        headers = {'Authorization': f'Token {self.profile_2.data['token']}'}
+        self.assertEqual(self.client.get(path=self.AUTH_URL, headers=headers).status_code, 403)
+
+        response = self.client.delete(path=f'{self.AUTH_URL}delete-profile/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(path=self.AUTH_URL, headers=headers).status_code, 401)
+
+    # Новый статус администратора виден сразу после изменения
+    def test_upgrade_profile_invalidation(self):
+        headers = {'Authorization': f'Token {self.profile_2.data['token']}'}
+        self.assertEqual(self.client.get(path=self.AUTH_URL, headers=headers).status_code, 403)
+
+        response = self.client.get(path=f'{self.AUTH_URL}{self.profile_2.data['profile']['id']}/upgrade-profile/',
+                                   headers={'Authorization': f'Token {self.profile_1.data['token']}'})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.client.get(path=self.AUTH_URL, headers=headers).status_code, 200)
+
+    # Новая должность видна сразу после изменения
+    def test_change_position_invalidation(self):
+        backend = CachedTokenAuthentication()
+        user, _ = backend.authenticate_credentials(self.profile_2.data['token'])
+        self.assertEqual(user.profile.position, 'EMPLOYEE')
+
+        response = self.client.post(
+            path=f'{self.AUTH_URL}{self.profile_2.data['profile']['id']}/change-position-profile/',
+            headers={'Authorization': f'Token {self.profile_1.data['token']}'},
+            data={'position': 'MANAGER'}
+        )
+        self.assertEqual(response.status_code, 202)
+        user, _ = backend.authenticate_credentials(self.profile_2.data['token'])
+        self.assertEqual(user.profile.position, 'MANAGER')
+
+    # Вытеснение самых старых записей и истечение времени жизни
+    def test_lru_and_ttl(self):
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set('a', {'user': 1})
+        cache.set('b', {'user': 2})
+        cache.get('a')
+        cache.set('c', {'user': 3})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'user': 1})
+
+        expired = TokenCache(max_size=2, ttl=0)
+        expired.set('a', {'user': 1})
+        self.assertIsNone(expired.get('a'))
+
+    # Сброс токена в одном воркере виден в другом после истечения локальной записи
+    def test_shared_tier_invalidation(self):
+        caches['tokens'].clear()
+        worker_1 = TokenCache(max_size=10, ttl=60, alias='tokens', local_ttl=0)
+        worker_2 = TokenCache(max_size=10, ttl=60, alias='tokens', local_ttl=0)
+        worker_1.set('a', {'user': 1})
+        self.assertEqual(worker_2.get('a'), {'user': 1})
+
+        worker_1.delete('a')
+        self.assertIsNone(worker_2.get('a'))
+
+    # Общий кэш токенов вмещает столько же записей, сколько кэш процесса
+    def test_shared_tier_size(self):
+        self.assertEqual(caches['tokens']._max_entries, settings.TOKEN_AUTH_CACHE['MAX_SIZE'])
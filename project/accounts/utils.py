@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction, IntegrityError
+from rest_framework.authtoken.models import Token
+
+from accounts.constants import Position, ImportStatuses
+from accounts.models import Profile
+from accounts.serializers import EmployeeRowSerializer
+from companies.models import Company
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """
+    Хеширование порции паролей (выполняется в процессе пула)
+    """
+    return [make_password(i) for i in passwords]
+
+
+class InlineExecutor:
+    """
+    Выполнение задач хеширования в текущем процессе с интерфейсом пула процессов
+    """
+
+    def submit(self, func, *args) -> Future:
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+class HashingPool:
+    """
+    Общий пул процессов хеширования паролей воркера, создается при первом импорте.
+    Одновременные импорты используют один пул, количество процессов ограничено размером пула
+    """
+
+    def __init__(self):
+        self.executor = None
+        self.lock = threading.Lock()
+
+    # Метод для получения пула (пул пересоздается, если его процесс аварийно завершился)
+    def get(self, workers: int) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None or getattr(self.executor, '_broken', False):
+                self.executor = ProcessPoolExecutor(max_workers=workers,
+                                                    mp_context=multiprocessing.get_context('spawn'),
+                                                    initializer=django.setup)
+            return self.executor
+
+
+hashing_pool = HashingPool()
+
+
+class EmployeeImport:
+    """
+    Пакетный импорт сотрудников.
+    Пароли хешируются пулом процессов, пользователи, токены и профили сохраняются
+    порциями через bulk_create (одна транзакция на порцию), результат возвращается построчно
+    """
+
+    def __init__(self, rows: list[dict], workers: int | None = None, chunk_size: int | None = None):
+        options = getattr(settings, 'EMPLOYEE_IMPORT', {})
+        self.rows = rows
+        self.workers = max(workers or options.get('WORKERS', 1), 1)
+        self.chunk_size = max(chunk_size or options.get('CHUNK_SIZE', 500), 1)
+        self.counts = Counter()
+
+    # Метод для чтения строк импорта из CSV (пустые значения считаются не указанными)
+    @staticmethod
+    def read_csv(stream) -> list[dict]:
+        text = stream.read()
+        if isinstance(text, bytes):
+            text = text.decode('utf-8-sig')
+        return [{key: value for key, value in row.items() if key and value not in ('', None)}
+                for row in csv.DictReader(io.StringIO(text))]
+
+    # Метод для чтения строк импорта из JSON (список сотрудников или {"employees": [...]})
+    @staticmethod
+    def read_json(stream) -> list[dict]:
+        data = json.load(stream)
+        rows = data.get('employees') if isinstance(data, dict) else data
+        if not isinstance(rows, list) or not all(isinstance(i, dict) for i in rows):
+            raise ValueError('Employees must be a list of objects')
+        return rows
+
+    # Метод для формирования результата строки импорта
+    def result(self, row: int, username: str | None, state: str, detail: str | None = None,
+               profile: int | None = None) -> dict:
+        self.counts[state] += 1
+        return {'row': row, 'username': username, 'status': state,
+                'detail': detail or str(ImportStatuses(state).label), 'profile': profile}
+
+    # Метод для проверки строк без сохранения: данные, повторы в файле,
+    # существующие имена и компании проверяются для всех строк сразу
+    def validate(self) -> tuple[list[dict | None], list[tuple[int, dict]]]:
+        results, valid = [None] * len(self.rows), []
+        for index, row in enumerate(self.rows):
+            serializer = EmployeeRowSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                username = row.get('username') if isinstance(row.get('username'), str) else None
+                results[index] = self.result(index + 1, username, ImportStatuses.INVALID,
+                                             json.dumps(serializer.errors, ensure_ascii=False))
+
+        names = {data['username'] for _, data in valid}
+        existing = set(User.objects.filter(username__in=names).values_list('username', flat=True))
+        teams = set(Company.objects.filter(id__in={data['team'] for _, data in valid if data.get('team')})
+                    .values_list('id', flat=True))
+
+        seen, accepted = set(), []
+        for index, data in valid:
+            if data['username'] in seen:
+                state = ImportStatuses.DUPLICATE
+            elif data['username'] in existing:
+                state = ImportStatuses.EXISTS
+            elif data.get('team') and data['team'] not in teams:
+                state = ImportStatuses.TEAM_NOT_FOUND
+            else:
+                seen.add(data['username'])
+                accepted.append((index, data))
+                continue
+            seen.add(data['username'])
+            results[index] = self.result(index + 1, data['username'], state)
+        return results, accepted
+
+    # Метод для сохранения порции сотрудников с уже хешированными паролями
+    def save_chunk(self, chunk: list[tuple[int, dict]], hashes: list[str]) -> list[tuple[int, dict]]:
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create(User(username=data['username'],
+                                                      password=password,
+                                                      is_staff=data['is_staff'])
+                                                 for (_, data), password in zip(chunk, hashes))
+                Token.objects.bulk_create(Token(key=Token.generate_key(), user=user) for user in users)
+                profiles = Profile.objects.bulk_create(
+                    Profile(user=user,
+                            team_id=data.get('team'),
+                            is_administrator=user.is_staff,
+                            position=Position.MANAGER if user.is_staff else Position.EMPLOYEE)
+                    for (_, data), user in zip(chunk, users))
+        except IntegrityError as error:
+            return [(index, self.result(index + 1, data['username'], ImportStatuses.FAILED, str(error)))
+                    for index, data in chunk]
+
+        return [(index, self.result(index + 1, data['username'], ImportStatuses.CREATED, profile=profile.id))
+                for (index, data), profile in zip(chunk, profiles)]
+
+    # Метод для выполнения импорта с построчной выдачей результатов в порядке строк.
+    # Хеширование всех порций запускается сразу и идет параллельно с сохранением в БД
+    def run(self):
+        results, accepted = self.validate()
+        chunks = [accepted[i:i + self.chunk_size] for i in range(0, len(accepted), self.chunk_size)]
+        position = 0
+
+        def flush():
+            nonlocal position
+            while position < len(results) and results[position] is not None:
+                yield results[position]
+                position += 1
+
+        executor = self.executor(len(accepted))
+        pending = [self.hash_chunk(executor, [data['password'] for _, data in chunk]) for chunk in chunks]
+        for chunk, hashes in zip(chunks, pending):
+            for index, result in self.save_chunk(chunk, [i for part in hashes for i in part.result()]):
+                results[index] = result
+            yield from flush()
+        yield from flush()
+
+    # Метод для получения пула процессов хеширования (для одного воркера хеширование в текущем процессе)
+    def executor(self, total: int) -> ProcessPoolExecutor | InlineExecutor:
+        if self.workers == 1 or total < 2:
+            return InlineExecutor()
+        return hashing_pool.get(self.workers)
+
+    # Метод для распределения паролей порции между процессами пула
+    def hash_chunk(self, executor, passwords: list[str]) -> list[Future]:
+        size = -(-len(passwords) // self.workers)
+        return [executor.submit(hash_passwords, passwords[i:i + size]) for i in range(0, len(passwords), size)]
+
+    # Метод для получения отчета об импорте в формате JSON Lines с итоговой строкой
+    def report(self):
+        for result in self.run():
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+        yield json.dumps({'summary': {'total': len(self.rows), **self.counts}}, ensure_ascii=False) + '\n'
@@ -3,6 +3,7 @@ from http import HTTPMethod
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import QuerySet
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter, OpenApiExample
 from rest_framework import viewsets, status
 from rest_framework.authtoken.models import Token
@@ -11,12 +12,18 @@ from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from accounts.authentication import invalidate_user_token
+from accounts.constants import Position
 from accounts.models import Profile
 from accounts.serializers import UserSerializer, ProfileSerializer, Error400Response, \
     Error403Response, Error404Response, SuccessResponse, \
-    SuccessTokenResponse, SuccessResponseWithUser
+    SuccessTokenResponse, SuccessResponseWithUser, SuccessResponseWithProfiles, \
+    ProfileFilterSerializer, EmployeeImportSerializer, EmployeeImportResultSerializer
+from accounts.utils import EmployeeImport
 from activities.utils import Service
 from companies.models import Company
+from core.pagination import IdCursorPagination
+from core.responses import ChunkedStreamingHttpResponse
 
 
 @extend_schema(tags=['Profile'])
@@ -30,6 +37,7 @@ class UserViewSet(viewsets.ModelViewSet, Service):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     permission_classes = [AllowAny, ]
+    pagination_class = IdCursorPagination
     # Разрешенные методы класса
     http_method_names = ['get', 'head', 'post', 'patch', 'delete', 'options']
 
@@ -141,6 +149,52 @@ class UserViewSet(viewsets.ModelViewSet, Service):
         return Response({'message': f'Пользователь {request.data['username']} не зарегистрирован'},
                         status=status.HTTP_404_NOT_FOUND, )
 
+    # Пакетная регистрация сотрудников администратором из списка или CSV-файла.
+    # Отчет о каждой строке передается потоком в формате JSON Lines по мере сохранения порций
+    @extend_schema(summary='Пакетная регистрация сотрудников (импорт)',
+                   request={
+                       'application/json': EmployeeImportSerializer,
+                       'multipart/form-data': EmployeeImportSerializer,
+                   },
+                   responses={
+                       (status.HTTP_200_OK, 'application/x-ndjson'): OpenApiResponse(
+                           response=EmployeeImportResultSerializer,
+                           description='Построчный отчет об импорте с итоговой строкой summary'),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Ошибка импорта сотрудников'),
+                   },
+                   examples=[
+                       OpenApiExample(
+                           'Employees import',
+                           description='Пример списка импортируемых сотрудников '
+                                       '(CSV-файл: колонки username,password,is_staff,team)',
+                           value={
+                               'employees': [{'username': 'Some name', 'password': 'Some secret password',
+                                              'is_staff': False, 'team': 1}],
+                           },
+                       )
+                   ]
+                   )
+    @action(methods=[HTTPMethod.POST, ], detail=False, url_path='import',
+            permission_classes=[IsAdminUser])
+    def import_employees(self, request: Request, *args, **kwargs) -> ChunkedStreamingHttpResponse | Response:
+        try:
+            serializer = EmployeeImportSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            if 'file' in serializer.validated_data:
+                rows = EmployeeImport.read_csv(serializer.validated_data['file'])
+            else:
+                rows = serializer.validated_data['employees']
+
+            return ChunkedStreamingHttpResponse(EmployeeImport(rows).report(),
+                                                content_type='application/x-ndjson; charset=utf-8')
+
+        except Exception as error:
+            return Response({'message': f'Ошибка импорта сотрудников.'
+                                        f'Детали ошибки: {error}.'},
+                            status=status.HTTP_400_BAD_REQUEST, )
+
     # Обновление данных пользователя. Можно изменить только пароль.
     @extend_schema(summary='Изменение пароля пользователя',
                    responses={
@@ -204,6 +258,7 @@ class UserViewSet(viewsets.ModelViewSet, Service):
             if instance:
                 instance.is_active = False
                 instance.save()
+                invalidate_user_token(instance.id)
 
                 return Response({'message': 'Данные профиля успешно удалены.'},
                                 status=status.HTTP_200_OK, )
@@ -242,6 +297,7 @@ class UserViewSet(viewsets.ModelViewSet, Service):
             instance.user.is_staff = True
             instance.save()
             instance.user.save()
+            invalidate_user_token(instance.user_id)
 
             return Response({'message': f'{instance.user} - теперь администратор.'},
                             status=status.HTTP_202_ACCEPTED, )
@@ -301,6 +357,7 @@ class UserViewSet(viewsets.ModelViewSet, Service):
             serializer.is_valid(raise_exception=True)
             instance.position = serializer.validated_data['position']
             instance.save()
+            invalidate_user_token(instance.user_id)
             result = ProfileSerializer(instance)
 
             return Response({'message': f'{result.data['name']} - теперь {result.data['detailed_position']}.'},
@@ -355,6 +412,7 @@ class UserViewSet(viewsets.ModelViewSet, Service):
             company = Company.objects.get(pk=request.data['team'])
             instance.team = company
             instance.save()
+            invalidate_user_token(instance.user_id)
 
             return Response({'message': f'{instance.user} - теперь в {company.name}.'},
                             status=status.HTTP_202_ACCEPTED, )
@@ -371,19 +429,92 @@ class UserViewSet(viewsets.ModelViewSet, Service):
     @extend_schema(summary='Получение списка профилей',
                    responses={
                        status.HTTP_200_OK: OpenApiResponse(
-                           response=ProfileSerializer,
+                           response=SuccessResponseWithProfiles,
                            description='Успешное получение данных сотрудников'
                        ),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Некорректные параметры фильтрации'),
                        status.HTTP_403_FORBIDDEN: OpenApiResponse(
                            response=Error403Response,
                            description='Нет прав на получение данных'),
                    },
+                   parameters=[
+                       OpenApiParameter(
+                           name='team',
+                           location=OpenApiParameter.QUERY,
+                           description='ID компании сотрудника',
+                           required=False,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='position',
+                           location=OpenApiParameter.QUERY,
+                           description='Должность сотрудника',
+                           required=False,
+                           type=str,
+                           enum=Position.values
+                       ),
+                       OpenApiParameter(
+                           name='is_administrator',
+                           location=OpenApiParameter.QUERY,
+                           description='Только администраторы (true) или только не администраторы (false)',
+                           required=False,
+                           type=bool
+                       ),
+                       OpenApiParameter(
+                           name='search',
+                           location=OpenApiParameter.QUERY,
+                           description='Начало имени сотрудника (без учета регистра)',
+                           required=False,
+                           type=str
+                       ),
+                       OpenApiParameter(
+                           name='cursor',
+                           location=OpenApiParameter.QUERY,
+                           description='Курсор страницы из ссылок next/previous',
+                           required=False,
+                           type=str
+                       ),
+                       OpenApiParameter(
+                           name='page_size',
+                           location=OpenApiParameter.QUERY,
+                           description='Количество профилей на странице',
+                           required=False,
+                           type=int
+                       ),
+                   ],
                    )
     def list(self, request: Request, *args, **kwargs) -> Response:
-        if request.user.is_staff:
-            query = Profile.objects.filter(user__is_active=True)
-            serializer = ProfileSerializer(query, many=True)
-            return Response({'message': serializer.data},
-                            status=status.HTTP_200_OK)
-        return Response({'message': 'У Вас недостаточно прав для получения этой информации'},
-                        status=status.HTTP_403_FORBIDDEN)
+        if not request.user.is_staff:
+            return Response({'message': 'У Вас недостаточно прав для получения этой информации'},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        filters = ProfileFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response({'message': f'Некорректные параметры фильтрации.'
+                                        f'Детали ошибки: {filters.errors}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        query = self.filter_profiles(Profile.objects.filter(user__is_active=True)
+                                     .select_related('user', 'team'),
+                                     filters.validated_data)
+        page = self.paginate_queryset(query)
+        serializer = ProfileSerializer(page, many=True)
+        return Response({'message': serializer.data,
+                         'next': self.paginator.get_next_link(),
+                         'previous': self.paginator.get_previous_link()},
+                        status=status.HTTP_200_OK)
+
+    # Метод для фильтрации списка профилей по переданным параметрам
+    @staticmethod
+    def filter_profiles(query: QuerySet, filters: dict) -> QuerySet:
+        if 'team' in filters:
+            query = query.filter(team_id=filters['team'])
+        if 'position' in filters:
+            query = query.filter(position=filters['position'])
+        if filters.get('is_administrator') is not None:
+            query = query.filter(is_administrator=filters['is_administrator'])
+        if filters.get('search'):
+            query = query.filter(user__username__istartswith=filters['search'])
+        return query
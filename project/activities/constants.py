@@ -8,6 +8,38 @@ class TaskStatuses(models.TextChoices):
     FINISHED = 'FINISHED', _('Выполнено')
 
 
+class CalendarKinds(models.TextChoices):
+    MEETING = 'MEETING', _('Встреча')
+    TASK = 'TASK', _('Задача')
+    OTHER = 'OTHER', _('Другое')
+
+
+class BulkTaskStatuses(models.TextChoices):
+    CREATED = 'CREATED', _('Задача создана')
+    NOT_FOUND = 'NOT_FOUND', _('Исполнитель не найден')
+    ALIEN = 'ALIEN', _('Исполнитель - сотрудник другой компании')
+    DUPLICATE = 'DUPLICATE', _('Задача повторяется в запросе')
+    EXISTS = 'EXISTS', _('Задача с таким названием у исполнителя уже есть')
+    PAST_DEADLINE = 'PAST_DEADLINE', _('Deadline задачи уже прошел')
+
+
+class CalendarPeriods(models.TextChoices):
+    DAILY = 'daily', _('За текущий день')
+    WEEKLY = 'weekly', _('За текущую неделю')
+    MONTHLY = 'monthly', _('За текущий месяц')
+    CUSTOM = 'custom', _('За период from-to')
+
+
+class ParticipantStatuses(models.TextChoices):
+    ADDED = 'ADDED', _('Добавлен к встрече')
+    REMOVED = 'REMOVED', _('Удален из встречи')
+    NOT_FOUND = 'NOT_FOUND', _('Пользователь не найден')
+    ALIEN = 'ALIEN', _('Сотрудник другой компании')
+    BUSY = 'BUSY', _('Занят в это время')
+    ALREADY_PARTICIPANT = 'ALREADY_PARTICIPANT', _('Уже участник встречи')
+    NOT_PARTICIPANT = 'NOT_PARTICIPANT', _('Не участник встречи')
+
+
 class TestActivityData:
     user_1 = {
         'username': 'First',
@@ -39,20 +71,48 @@ class TestActivityData:
         'start_at': '2025-02-10T18:00:00',
         'end_at': '2025-02-09T18:30:00'
     }
+    meeting_overlap = {
+        'start_at': '2025-02-10T18:15:00',
+        'end_at': '2025-02-10T19:00:00'
+    }
+    find_slot = {
+        'participants': [2],
+        'start_at': '2025-02-10T17:00:00',
+        'end_at': '2025-02-10T20:00:00',
+        'duration': 60,
+        'granularity': 30,
+        'limit': 2
+    }
+    participants = {
+        'names': ['Second', 'Unknown']
+    }
+    calendar_overlap = {'from': '2025-02-10T18:15:00', 'to': '2025-02-10T19:00:00'}
+    calendar_adjacent = {'period': 'custom', 'from': '2025-02-10T18:30:00', 'to': '2025-02-10T19:00:00'}
+    calendar_monthly = {'period': 'monthly'}
     task_1 = {
         'name': 'Task 1',
         'assigned_to': 2,
-        'deadline': '2025-02-23T12:00:00'
+        'deadline': '2035-02-23T12:00:00'
     }
     task_2 = {
         'name': 'Task 2',
         'assigned_to': 2,
-        'deadline': '2025-02-23T12:00:00'
+        'deadline': '2035-02-23T12:00:00'
     }
+    page = {'page_size': 1}
+    bulk_tasks = {'tasks': [
+        {'name': 'Sprint 1', 'assigned_to': 2, 'deadline': '2035-03-01T12:00:00'},
+        {'name': 'Sprint 1', 'assigned_to': 2, 'deadline': '2035-03-01T12:00:00'},
+        {'name': 'Sprint 2', 'assigned_to': 999999, 'deadline': '2035-03-01T12:00:00'},
+        {'name': 'Sprint 3', 'assigned_to': 2, 'deadline': '2020-03-01T12:00:00'},
+        {'name': 'Task 1', 'assigned_to': 2, 'deadline': '2035-03-01T12:00:00'},
+    ]}
+    marks_period = {'options': 'period', 'start_at': '2025-01-01T00:00:00', 'end_at': '2100-01-01T00:00:00'}
+    marks_old_period = {'options': 'period', 'start_at': '2024-01-01T00:00:00', 'end_at': '2025-01-01T00:00:00'}
     new_task = {
         'name': 'New Task 1',
         'assigned_to': 2,
-        'deadline': '2025-02-24T12:00:00'
+        'deadline': '2035-02-24T12:00:00'
     }
     new_status = {
         'status': 'FINISHED',
@@ -63,3 +123,8 @@ class TestActivityData:
         'completeness': '7',
         'quality': '2'
     }
+    task_mark_2 = {
+        'deadline_meeting': '8',
+        'completeness': '10',
+        'quality': '5'
+    }
@@ -0,0 +1,129 @@
+import datetime
+import itertools
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from activities.constants import CalendarKinds
+from activities.models import Calendar, Meeting, Task
+from core.benchmark import measure
+
+CHUNK_SIZE = 10000
+
+
+# Прежняя очистка календаря при отмене встречи (поиск записей по названию)
+def legacy_delete_meeting(meeting_id: int) -> None:
+    participants = Profile.objects.filter(participated_meetings=meeting_id)
+    meeting = Meeting.objects.get(id=meeting_id)
+    staff = [i.id for i in participants]
+    staff.append(meeting.organizer_id)
+    Calendar.objects.filter(owner_id__in=staff, name=f'Встреча {meeting_id}').delete()
+    meeting.delete()
+
+
+# Прежнее удаление задачи (поиск записи календаря по названию)
+def legacy_delete_task(task_id: int) -> None:
+    task = Task.objects.get(id=task_id)
+    calendar = Calendar.objects.get(name=f'Задача {task_id}', owner=task.assigned_to)
+    task.delete()
+    calendar.delete()
+
+
+class Command(BaseCommand):
+    help = 'Замер удаления встреч и задач на большой таблице календаря'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000,
+                            help='Количество записей в календаре')
+        parser.add_argument('--profiles', type=int, default=1000,
+                            help='Количество владельцев записей календаря')
+        parser.add_argument('--participants', type=int, default=10,
+                            help='Количество участников каждой встречи')
+        parser.add_argument('--repeat', type=int, default=100,
+                            help='Количество удаляемых встреч и задач для каждого способа')
+
+    def handle(self, *args, **options):
+        self.now = timezone.now()
+
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            profiles = self.create_profiles(options['profiles'])
+            self.fill_calendar(profiles, options['rows'])
+
+            legacy_meetings = self.create_meetings(profiles, options['repeat'],
+                                                   options['participants'], linked=False)
+            meetings = self.create_meetings(profiles, options['repeat'],
+                                            options['participants'], linked=True)
+            legacy_tasks = self.create_tasks(profiles, options['repeat'], linked=False)
+            tasks = self.create_tasks(profiles, options['repeat'], linked=True)
+
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {Calendar._meta.db_table}')
+            self.stdout.write(f'Записей в календаре: {Calendar.objects.count()}')
+
+            self.report('name', 'meeting', measure(lambda: legacy_delete_meeting(next(legacy_meetings)),
+                                                   options['repeat']))
+            self.report('fk', 'meeting', measure(lambda: Meeting.objects.get(id=next(meetings)).delete(),
+                                                 options['repeat']))
+            self.report('name', 'task', measure(lambda: legacy_delete_task(next(legacy_tasks)),
+                                                options['repeat']))
+            self.report('fk', 'task', measure(lambda: Task.objects.get(id=next(tasks)).delete(),
+                                              options['repeat']))
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_profiles(count: int) -> list[Profile]:
+        users = User.objects.bulk_create(User(username=f'benchmark_cleanup_{i}', password='!')
+                                         for i in range(count))
+        return Profile.objects.bulk_create(Profile(user=user) for user in users)
+
+    def fill_calendar(self, profiles: list[Profile], rows: int) -> None:
+        # Прочие дела владельцев, по одному часу в прошлом
+        entries = (Calendar(name=f'Дело {i}', owner=profiles[i % len(profiles)],
+                            start_at=self.now - datetime.timedelta(hours=i // len(profiles) + 1),
+                            end_at=self.now - datetime.timedelta(hours=i // len(profiles)))
+                   for i in range(rows))
+        for chunk in itertools.batched(entries, CHUNK_SIZE):
+            Calendar.objects.bulk_create(chunk)
+
+    def create_meetings(self, profiles: list[Profile], count: int, participants: int,
+                        linked: bool) -> iter:
+        meetings = Meeting.objects.bulk_create(
+            Meeting(organizer=profiles[i % len(profiles)],
+                    start_at=self.now + datetime.timedelta(hours=i),
+                    end_at=self.now + datetime.timedelta(hours=i, minutes=30))
+            for i in range(count))
+        entries = []
+        for meeting in meetings:
+            staff = [profiles[(meeting.organizer_id + i) % len(profiles)] for i in range(1, participants)]
+            meeting.participants.add(*staff)
+            for owner in (meeting.organizer, *staff):
+                entries.append(Calendar(name=f'Встреча {meeting.id}', owner=owner,
+                                        kind=CalendarKinds.MEETING if linked else CalendarKinds.OTHER,
+                                        meeting=meeting if linked else None,
+                                        start_at=meeting.start_at, end_at=meeting.end_at))
+        Calendar.objects.bulk_create(entries)
+        return iter([i.id for i in meetings])
+
+    def create_tasks(self, profiles: list[Profile], count: int, linked: bool) -> iter:
+        tasks = Task.objects.bulk_create(
+            Task(name=f'Benchmark {linked} {i}', assigned_by=profiles[0],
+                 assigned_to=profiles[i % len(profiles)],
+                 deadline=self.now + datetime.timedelta(days=1))
+            for i in range(count))
+        Calendar.objects.bulk_create(
+            Calendar(name=f'Задача {task.id}', owner=task.assigned_to,
+                     kind=CalendarKinds.TASK if linked else CalendarKinds.OTHER,
+                     task=task if linked else None,
+                     start_at=task.created_at, end_at=task.deadline)
+            for task in tasks)
+        return iter([i.id for i in tasks])
+
+    def report(self, method: str, target: str, result: dict) -> None:
+        self.stdout.write(f'  {method:<5} delete {target:<8} '
+                          f'median={result['median']}ms p95={result['p95']}ms')
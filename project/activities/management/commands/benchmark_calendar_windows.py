@@ -0,0 +1,85 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from activities.constants import CalendarPeriods
+from activities.models import Calendar
+from activities.utils import Service
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Замер просмотра календаря за период для профиля с многолетней историей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=5,
+                            help='Глубина истории календаря в годах')
+        parser.add_argument('--per-day', type=int, default=8,
+                            help='Количество записей в календаре в день')
+        parser.add_argument('--profiles', type=int, default=20,
+                            help='Количество профилей с такой же историей')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество повторов замера')
+
+    def handle(self, *args, **options):
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        first_day = today - datetime.timedelta(days=365 * options['years'])
+
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            profiles = [self.create_profile(f'benchmark_calendar_{i}') for i in range(options['profiles'])]
+            for profile in profiles:
+                Calendar.objects.bulk_create(self.entries(profile, first_day, today, options['per_day']),
+                                             batch_size=5000)
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {Calendar._meta.db_table}')
+
+            profile = profiles[0]
+            self.stdout.write(f'Записей в календаре профиля: {Calendar.objects.filter(owner=profile).count()}')
+
+            legacy = {
+                CalendarPeriods.DAILY: lambda: Calendar.objects.filter(owner=profile,
+                                                                       start_at__date=today.date()),
+                CalendarPeriods.MONTHLY: lambda: Calendar.objects.filter(owner=profile,
+                                                                         start_at__month=today.month),
+            }
+            past = today.replace(year=today.year - options['years'] // 2, day=1)
+            windows = {
+                CalendarPeriods.DAILY: Service.calendar_window(CalendarPeriods.DAILY),
+                CalendarPeriods.WEEKLY: Service.calendar_window(CalendarPeriods.WEEKLY),
+                CalendarPeriods.MONTHLY: Service.calendar_window(CalendarPeriods.MONTHLY),
+                f'{CalendarPeriods.CUSTOM} (past)': (past, past + datetime.timedelta(days=30)),
+            }
+
+            for period, (start, end) in windows.items():
+                if period in legacy:
+                    self.report(f'{period} legacy', legacy[period],
+                                measure(lambda: list(legacy[period]()), options['repeat']))
+                self.report(f'{period} range', lambda: Service.calendar_entries(profile, start, end),
+                            measure(lambda: list(Service.calendar_entries(profile, start, end)),
+                                    options['repeat']))
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_profile(username: str) -> Profile:
+        user = User.objects.create_user(username=username, password='benchmark')
+        return Profile.objects.create(user=user)
+
+    @staticmethod
+    def entries(profile: Profile, first_day: datetime, last_day: datetime, per_day: int):
+        day = first_day
+        while day <= last_day:
+            for slot in range(per_day):
+                start_at = day + datetime.timedelta(hours=9, minutes=60 * slot)
+                yield Calendar(name='Другое', owner=profile, start_at=start_at,
+                               end_at=start_at + datetime.timedelta(minutes=30))
+            day += datetime.timedelta(days=1)
+
+    def report(self, target: str, query, result: dict) -> None:
+        self.stdout.write(f'{target:<22} rows={len(list(query())):<6} '
+                          f'median={result['median']}ms p95={result['p95']}ms')
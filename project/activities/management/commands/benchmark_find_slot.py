@@ -0,0 +1,87 @@
+import datetime
+import random
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Profile
+from activities.constants import CalendarKinds
+from activities.models import Calendar, Meeting
+from activities.utils import Service
+from activities.views import MeetingViewSet
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Замер поиска общего свободного времени для встречи'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participants', type=int, default=50,
+                            help='Количество участников встречи')
+        parser.add_argument('--days', type=int, default=30,
+                            help='Период заполнения календарей в днях')
+        parser.add_argument('--per-day', type=int, default=4,
+                            help='Количество встреч у участника в день')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество повторов замера')
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        window_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        window_end = window_start + datetime.timedelta(days=options['days'])
+
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            profiles = [self.create_profile(f'benchmark_slot_{i}', is_staff=i == 0)
+                        for i in range(options['participants'])]
+            Calendar.objects.bulk_create(
+                self.entries(profiles, window_start, options['days'], options['per_day']),
+                batch_size=5000)
+
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {Calendar._meta.db_table}')
+
+            ids = [i.id for i in profiles]
+            duration = datetime.timedelta(minutes=60)
+            granularity = datetime.timedelta(minutes=15)
+            result = measure(lambda: Service.find_free_slots(ids, window_start, window_end,
+                                                             duration, granularity, 5),
+                             options['repeat'])
+            self.report('Service.find_free_slots', result)
+
+            view = MeetingViewSet.as_view({'get': 'find_slot'})
+            query = {'participants': ids, 'start_at': window_start.isoformat(),
+                     'end_at': window_end.isoformat(), 'duration': 60}
+
+            def call():
+                request = APIRequestFactory().get('/', query)
+                force_authenticate(request, user=profiles[0].user)
+                view(request)
+
+            self.report('MeetingViewSet.find_slot', measure(call, options['repeat']))
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_profile(username: str, is_staff: bool) -> Profile:
+        user = User.objects.create_user(username=username, password='benchmark', is_staff=is_staff)
+        return Profile.objects.create(user=user, is_administrator=is_staff)
+
+    @staticmethod
+    def entries(profiles: list[Profile], start: datetime, days: int, per_day: int):
+        # Встречи в рабочее время (9:00-18:00) со случайным началом по получасовой сетке
+        for profile in profiles:
+            meeting = Meeting.objects.create(organizer=profile, start_at=start, end_at=start)
+            for day in range(days):
+                for slot in random.sample(range(18), per_day):
+                    start_at = start + datetime.timedelta(days=day, hours=9, minutes=30 * slot)
+                    yield Calendar(name=f'Встреча {profile.id}-{day}-{slot}', owner=profile,
+                                   kind=CalendarKinds.MEETING, meeting=meeting,
+                                   start_at=start_at,
+                                   end_at=start_at + datetime.timedelta(minutes=30))
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<28} median={result['median']}ms p95={result['p95']}ms')
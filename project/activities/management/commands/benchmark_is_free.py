@@ -0,0 +1,125 @@
+import datetime
+import itertools
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Profile
+from activities.constants import CalendarKinds
+from activities.models import Calendar, Meeting
+from activities.utils import Service
+from activities.views import MeetingViewSet
+from core.benchmark import measure
+
+
+# Прежняя реализация проверки занятости (перебор всего календаря в Python)
+def legacy_is_free(person: Profile, start_time: datetime, end_time: datetime) -> bool:
+    person_calendars = person.calendars
+    if person_calendars.exists():
+        for i in person_calendars.values():
+            if (i['name'].startswith('Встреча')
+                    and (i['end_at'] >= start_time >= i['start_at']
+                         or i['end_at'] >= end_time >= i['start_at'])):
+                return False
+
+    return True
+
+
+class Command(BaseCommand):
+    help = 'Сравнение проверки занятости календаря: перебор в Python и запрос по индексу'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000],
+                            help='Количество записей в календаре профиля')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество повторов каждого замера')
+
+    def handle(self, *args, **options):
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            organizer = self.create_profile('benchmark_organizer', is_staff=True)
+            participant = self.create_profile('benchmark_participant', is_staff=False)
+            self.slots = itertools.count()
+            filled = 0
+
+            for size in options['sizes']:
+                self.fill_calendar((organizer, participant), filled, size)
+                filled = size
+                self.analyze()
+                self.stdout.write(f'Записей в календаре: {size}')
+
+                for title, implementation in (('loop', legacy_is_free), ('query', Service.is_free)):
+                    with mock.patch.object(Service, 'is_free', staticmethod(implementation)):
+                        start, end = self.next_slot()
+                        self.report(title, 'is_free',
+                                    measure(lambda: Service.is_free(organizer, start, end),
+                                            options['repeat']))
+
+                # Создание встречи и добавление участников проверяют занятость ограничением БД при вставке
+                self.report('insert', 'MeetingViewSet.create',
+                            self.bench_create(organizer, options['repeat']))
+                self.report('insert', 'MeetingViewSet.add_participant',
+                            self.bench_add_participant(organizer, participant, options['repeat']))
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_profile(username: str, is_staff: bool) -> Profile:
+        user = User.objects.create_user(username=username, password='benchmark', is_staff=is_staff)
+        return Profile.objects.create(user=user, is_administrator=is_staff)
+
+    @staticmethod
+    def fill_calendar(profiles: tuple, start: int, stop: int) -> None:
+        # Прошедшие встречи, не пересекающиеся с проверяемыми интервалами
+        base = timezone.now() - datetime.timedelta(days=1)
+        for profile in profiles:
+            meeting = Meeting.objects.create(organizer=profile, start_at=base, end_at=base)
+            Calendar.objects.bulk_create(
+                (Calendar(name=f'Встреча {i}', owner=profile,
+                          kind=CalendarKinds.MEETING, meeting=meeting,
+                          start_at=base - datetime.timedelta(hours=i + 1),
+                          end_at=base - datetime.timedelta(hours=i, minutes=30))
+                 for i in range(start, stop)),
+                batch_size=5000)
+
+    @staticmethod
+    def analyze() -> None:
+        # Актуальная статистика планировщика, как после autovacuum на рабочей базе
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {Calendar._meta.db_table}')
+
+    def next_slot(self) -> tuple[datetime, datetime]:
+        start = timezone.now() + datetime.timedelta(days=1, hours=next(self.slots))
+        return start, start + datetime.timedelta(minutes=30)
+
+    def bench_create(self, organizer: Profile, repeat: int) -> dict:
+        view = MeetingViewSet.as_view({'post': 'create'})
+
+        def call():
+            start, end = self.next_slot()
+            request = APIRequestFactory().post('/', {'start_at': start, 'end_at': end}, format='json')
+            force_authenticate(request, user=organizer.user)
+            view(request)
+
+        return measure(call, repeat)
+
+    def bench_add_participant(self, organizer: Profile, participant: Profile, repeat: int) -> dict:
+        view = MeetingViewSet.as_view({'post': 'add_participant'})
+        meetings = iter([Meeting.objects.create(organizer=organizer, start_at=start, end_at=end)
+                         for start, end in (self.next_slot() for _ in range(repeat))])
+
+        def call():
+            request = APIRequestFactory().post('/', {'name': participant.user.username}, format='json')
+            force_authenticate(request, user=organizer.user)
+            view(request, pk=next(meetings).id)
+
+        return measure(call, repeat)
+
+    def report(self, implementation: str, target: str, result: dict) -> None:
+        self.stdout.write(f'  {implementation:<6} {target:<32} '
+                          f'median={result['median']}ms p95={result['p95']}ms')
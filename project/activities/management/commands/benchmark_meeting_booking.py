@@ -0,0 +1,123 @@
+import datetime
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Profile
+from activities.constants import CalendarKinds
+from activities.models import Calendar, Meeting
+from activities.views import MeetingViewSet
+from core.benchmark import summarize
+
+
+class Command(BaseCommand):
+    help = 'Нагрузочная проверка бронирования встреч из нескольких потоков: пропускная способность и двойные брони'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Количество потоков (отдельных соединений с БД)')
+        parser.add_argument('--slots', type=int, default=200,
+                            help='Количество бронируемых интервалов времени на поток')
+
+    def handle(self, *args, **options):
+        # Потоки работают в отдельных соединениях, поэтому данные фиксируются и удаляются явно
+        threads, slots = options['threads'], options['slots']
+        profiles = [self.create_profile(f'benchmark_meeting_booking_{i}', is_staff=i < threads)
+                    for i in range(threads + 1)]
+        organizers, participant = profiles[:threads], profiles[threads]
+        self.start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+        try:
+            # Каждый поток бронирует время своего организатора - конфликтов нет
+            self.report('create, own calendars', self.run(
+                threads, slots, lambda thread, slot: self.create(organizers[thread], slot)))
+            # Все потоки бронируют одни и те же интервалы одного организатора
+            self.report('create, same calendar', self.run(
+                threads, slots, lambda thread, slot: self.create(organizers[0], slots + slot)))
+
+            # Все потоки добавляют одного участника к встречам в одно и то же время
+            meetings = Meeting.objects.bulk_create(
+                Meeting(organizer=organizers[thread], start_at=self.slot(2 * slots + slot)[0],
+                        end_at=self.slot(2 * slots + slot)[1])
+                for slot in range(slots) for thread in range(threads))
+            self.report('add participant, same calendar', self.run(
+                threads, slots, lambda thread, slot: self.add_participant(
+                    organizers[thread], meetings[slot * threads + thread], participant)))
+
+            self.stdout.write(f'double bookings: {self.double_bookings(profiles)}')
+        finally:
+            Meeting.objects.filter(organizer__in=profiles).delete()
+            User.objects.filter(id__in=[i.user_id for i in profiles]).delete()
+
+    @staticmethod
+    def create_profile(username: str, is_staff: bool) -> Profile:
+        user = User.objects.create_user(username=username, password='benchmark', is_staff=is_staff)
+        return Profile.objects.create(user=user, is_administrator=is_staff)
+
+    def slot(self, number: int) -> tuple[datetime.datetime, datetime.datetime]:
+        start = self.start + datetime.timedelta(minutes=30 * number)
+        return start, start + datetime.timedelta(minutes=30)
+
+    # Метод для одновременного запуска бронирований из потоков (slots бронирований на поток)
+    @staticmethod
+    def run(threads: int, slots: int, book) -> dict:
+        barrier = threading.Barrier(threads + 1)
+        lock = threading.Lock()
+        timings, statuses = [], Counter()
+
+        def worker(thread: int):
+            try:
+                barrier.wait()
+                for slot in range(slots):
+                    started = time.perf_counter()
+                    result = book(thread, slot)
+                    with lock:
+                        timings.append((time.perf_counter() - started) * 1000)
+                        statuses[result] += 1
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(worker, i) for i in range(threads)]
+            barrier.wait()
+            started = time.perf_counter()
+            for future in futures:
+                future.result()
+            duration = time.perf_counter() - started
+
+        return {'rps': round(len(timings) / duration, 1), 'statuses': dict(statuses), **summarize(timings)}
+
+    def create(self, organizer: Profile, slot: int) -> str:
+        start_at, end_at = self.slot(slot)
+        request = APIRequestFactory().post('/', {'start_at': start_at, 'end_at': end_at}, format='json',
+                                           HTTP_HOST='localhost')
+        force_authenticate(request, user=organizer.user)
+        return str(MeetingViewSet.as_view({'post': 'create'})(request).status_code)
+
+    @staticmethod
+    def add_participant(organizer: Profile, meeting: Meeting, participant: Profile) -> str:
+        view = MeetingViewSet.as_view({'post': 'add_participant'}, **MeetingViewSet.add_participant.kwargs)
+        request = APIRequestFactory().post('/', {'name': participant.user.username}, format='json',
+                                           HTTP_HOST='localhost')
+        force_authenticate(request, user=organizer.user)
+        return view(request, pk=meeting.id).data['data'][0]['status']
+
+    # Метод для подсчета пересекающихся встреч в календарях профилей
+    @staticmethod
+    def double_bookings(profiles: list[Profile]) -> int:
+        meetings = Calendar.objects.filter(owner__in=profiles, kind=CalendarKinds.MEETING)
+        return meetings.filter(Exists(meetings.filter(owner_id=OuterRef('owner_id'),
+                                                      start_at__lt=OuterRef('end_at'),
+                                                      end_at__gt=OuterRef('start_at'))
+                                      .exclude(id=OuterRef('id')))).count()
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<32} rps={result['rps']} median={result['median']}ms '
+                          f'p95={result['p95']}ms {result['statuses']}')
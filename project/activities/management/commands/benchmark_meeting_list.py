@@ -0,0 +1,85 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Profile
+from activities.models import Meeting
+from activities.serializers import MeetingSerializer
+from activities.views import MeetingViewSet
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Замер получения списка встреч: без загрузки связей, с select_related/prefetch_related и фильтрами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meetings', type=int, default=100000,
+                            help='Количество встреч')
+        parser.add_argument('--profiles', type=int, default=200,
+                            help='Количество сотрудников')
+        parser.add_argument('--participants', type=int, default=3,
+                            help='Количество участников встречи')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Количество повторов замера')
+
+    def handle(self, *args, **options):
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            profiles = []
+            for i in range(options['profiles']):
+                user = User.objects.create_user(username=f'benchmark_meeting_list_{i}', password='benchmark',
+                                                is_staff=i == 0)
+                profiles.append(Profile.objects.create(user=user, is_administrator=i == 0))
+
+            start = timezone.now().replace(minute=0, second=0, microsecond=0)
+            meetings = Meeting.objects.bulk_create(
+                (Meeting(organizer=profiles[i % len(profiles)],
+                         start_at=start + datetime.timedelta(minutes=30 * i),
+                         end_at=start + datetime.timedelta(minutes=30 * i + 30))
+                 for i in range(options['meetings'])), batch_size=5000)
+            through = Meeting.participants.through
+            through.objects.bulk_create(
+                (through(meeting_id=meeting.id, profile_id=profiles[(i + j + 1) % len(profiles)].id)
+                 for i, meeting in enumerate(meetings) for j in range(options['participants'])),
+                batch_size=10000)
+
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    for model in (User, Profile, Meeting, through):
+                        cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+            self.report('page, lazy relations',
+                        measure(lambda: MeetingSerializer(Meeting.objects.order_by('-id')[:100], many=True).data,
+                                max(options['repeat'] // 5, 1)))
+
+            factory = APIRequestFactory()
+            middle = start + datetime.timedelta(minutes=30 * (options['meetings'] // 2))
+
+            # Права доступа действий (@action) передаются так же, как при маршрутизации
+            def call(action: str, user: User, params: dict):
+                request = factory.get('/', params, HTTP_HOST='localhost')
+                force_authenticate(request, user=user)
+                view = MeetingViewSet.as_view({'get': action}, **getattr(getattr(MeetingViewSet, action), 'kwargs', {}))
+                response = view(request).render()
+                assert response.status_code == 200, response.content
+
+            admin, employee = profiles[0].user, profiles[1].user
+            targets = {
+                'page': ('list', admin, {}),
+                'page, period': ('list', admin, {'from': middle.isoformat(),
+                                                 'to': (middle + datetime.timedelta(days=7)).isoformat()}),
+                'page, organizer': ('list', admin, {'organizer': profiles[1].id}),
+                'page, participant': ('list', admin, {'participant': profiles[1].id}),
+                'my meetings': ('my', employee, {}),
+                'my meetings, period': ('my', employee, {'from': middle.isoformat()}),
+            }
+            for target, (action, user, params) in targets.items():
+                self.report(target, measure(lambda: call(action, user, params), options['repeat']))
+            transaction.set_rollback(True)
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<22} median={result['median']}ms p95={result['p95']}ms')
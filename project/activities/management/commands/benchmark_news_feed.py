@@ -0,0 +1,70 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.authtoken.models import Token
+
+from accounts.models import Profile
+from activities.models import News
+from activities.serializers import NewsSerializer
+from activities.views import NewsFeedView
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Замер отображения ленты новостей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=10000,
+                            help='Количество новостей в ленте')
+        parser.add_argument('--authors', type=int, default=50,
+                            help='Количество авторов новостей')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Количество повторов замера')
+        parser.add_argument('--legacy-repeat', type=int, default=3,
+                            help='Количество повторов замера без select_related')
+
+    def handle(self, *args, **options):
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            authors = []
+            for i in range(options['authors']):
+                user = User.objects.create_user(username=f'benchmark_news_{i}', password='benchmark',
+                                                is_staff=True)
+                authors.append(Profile.objects.create(user=user, is_administrator=True))
+            News.objects.bulk_create(
+                (News(title=f'Новость {i}', content='Содержание новости',
+                      author=authors[i % len(authors)]) for i in range(options['news'])),
+                batch_size=5000)
+
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {News._meta.db_table}')
+
+            self.report('all, lazy author',
+                        measure(lambda: NewsSerializer(News.objects.all(), many=True).data,
+                                options['legacy_repeat']))
+            self.report('all, select_related',
+                        measure(lambda: NewsSerializer(News.objects.select_related('author__user'),
+                                                       many=True).data,
+                                options['repeat']))
+
+            # Токен внутри транзакции не кэшируется, каждый запрос включает его загрузку
+            view = async_to_sync(NewsFeedView.as_view())
+            token = Token.objects.create(user=authors[0].user)
+            responses = []
+
+            def call(headers: dict):
+                request = RequestFactory().get('/', HTTP_HOST='localhost',
+                                               HTTP_AUTHORIZATION=f'Token {token.key}', **headers)
+                responses.append(view(request))
+
+            self.report('feed page', measure(lambda: call({}), options['repeat']))
+            etag = responses[-1]['ETag']
+            self.report('feed 304', measure(lambda: call({'HTTP_IF_NONE_MATCH': etag}),
+                                            options['repeat']))
+            transaction.set_rollback(True)
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<22} median={result['median']}ms p95={result['p95']}ms')
@@ -0,0 +1,111 @@
+import datetime
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.models import Profile
+from activities.models import Calendar, News
+from core.benchmark import run_load
+
+# Команды запуска и окружение серверов для сравнения (asgi - как в docker-entrypoint.sh)
+SERVERS = {
+    'runserver': (lambda port, workers: [sys.executable, 'manage.py', 'runserver', '--noreload',
+                                         f'127.0.0.1:{port}'], {}),
+    'asgi': (lambda port, workers: [sys.executable, '-m', 'gunicorn', 'core.asgi:application',
+                                    '--config', 'core/gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+                                    '--workers', str(workers)],
+             {'DEBUG': 'False', 'ALLOWED_HOSTS': 'localhost', 'GUNICORN_ACCESS_LOG': ''}),
+}
+TARGETS = {
+    'calendar': '/api/v1/activities/calendar/?period=weekly',
+    'feed': '/api/v1/activities/news/feed/',
+}
+
+
+class Command(BaseCommand):
+    help = 'Нагрузочное сравнение runserver и production ASGI (gunicorn + uvicorn) на календаре и ленте новостей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS),
+                            help='Сравниваемые режимы запуска')
+        parser.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1,
+                            help='Количество воркеров gunicorn')
+        parser.add_argument('--concurrency', type=int, default=32,
+                            help='Количество параллельных клиентов')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Количество запросов к каждому адресу')
+        parser.add_argument('--calendar', type=int, default=50,
+                            help='Количество записей календаря за неделю')
+        parser.add_argument('--news', type=int, default=1000,
+                            help='Количество новостей в ленте')
+
+    def handle(self, *args, **options):
+        # Серверы работают в отдельных процессах, поэтому данные фиксируются и удаляются явно
+        user = User.objects.create_user(username='benchmark_serving', password='benchmark')
+        try:
+            profile = Profile.objects.create(user=user)
+            token = Token.objects.create(user=user)
+            start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+            Calendar.objects.bulk_create(
+                Calendar(name=f'Дело {i}', owner=profile,
+                         start_at=start + datetime.timedelta(minutes=30 * i),
+                         end_at=start + datetime.timedelta(minutes=30 * i + 15))
+                for i in range(options['calendar']))
+            News.objects.bulk_create(
+                (News(title=f'Новость {i}', content='Содержание новости', author=profile)
+                 for i in range(options['news'])), batch_size=5000)
+
+            headers = {'Authorization': f'Token {token.key}', 'Host': 'localhost'}
+            for server in options['servers']:
+                port = self.free_port()
+                command, env = SERVERS[server]
+                process = subprocess.Popen(command(port, options['workers']), cwd=settings.BASE_DIR,
+                                           env={**os.environ, **env},
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                try:
+                    self.wait(port, process)
+                    for target, path in TARGETS.items():
+                        url = f'http://127.0.0.1:{port}{path}'
+                        # Прогрев соединений, кэша токенов и воркеров
+                        run_load(url, headers, options['concurrency'], options['concurrency'] * 4)
+                        self.report(server, target, run_load(url, headers, options['concurrency'],
+                                                             options['requests']))
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+        finally:
+            News.objects.filter(author__user=user).delete()
+            user.delete()
+
+    # Метод для получения свободного порта
+    @staticmethod
+    def free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    # Метод для ожидания запуска сервера
+    @staticmethod
+    def wait(port: int, process: subprocess.Popen, timeout: float = 30) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Сервер завершился с кодом {process.returncode}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError('Сервер не запустился')
+
+    def report(self, server: str, target: str, result: dict) -> None:
+        self.stdout.write(f'{server:<10} {target:<9} rps={result['rps']} median={result['median']}ms '
+                          f'p99={result['p99']}ms errors={result['errors']}')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from activities.utils import Service
+
+
+class Command(BaseCommand):
+    help = 'Пересчет квартальных итогов оценок исполнителей по истории оценок задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', type=int, action='append', dest='profiles',
+                            help='ID профиля для пересчета (по умолчанию все профили)')
+
+    def handle(self, *args, **options):
+        created = Service.rebuild_rollups(options['profiles'])
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано квартальных итогов: {created}'))
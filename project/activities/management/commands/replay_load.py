@@ -0,0 +1,193 @@
+import datetime
+import json
+import uuid
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import Profile
+from activities.constants import TaskStatuses
+from activities.models import Meeting, Task
+from core.benchmark import run_scenario
+
+# Смесь операций по умолчанию (доля запросов каждой операции)
+MIX = {
+    'get-token': 5,
+    'calendar': 40,
+    'task-create': 10,
+    'task-update-status': 15,
+    'get-marks': 20,
+    'add-participant': 10,
+}
+# Количество задач и встреч на сотрудника, загружаемых для сценария
+SAMPLE_SIZE = 50
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный прогон запущенного сервера смесью типичных запросов по данным seed_data. '
+            'Пропускная способность и перцентили задержек по операциям сохраняются в JSON-файл')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help='Адрес запущенного сервера (работающего с той же БД)')
+        parser.add_argument('--host', default='localhost',
+                            help='Заголовок Host запросов (должен входить в ALLOWED_HOSTS)')
+        parser.add_argument('--concurrency', type=int, default=16,
+                            help='Количество параллельных клиентов')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Общее количество запросов')
+        parser.add_argument('--warmup', type=int, default=200,
+                            help='Количество запросов прогрева (не учитываются в результате)')
+        parser.add_argument('--mix', nargs='+', default=None, metavar='OPERATION=WEIGHT',
+                            help=f'Доли операций ({', '.join(f'{k}={v}' for k, v in MIX.items())})')
+        parser.add_argument('--prefix', default='seed',
+                            help='Префикс пользователей, созданных seed_data')
+        parser.add_argument('--password', default='seed1234',
+                            help='Пароль пользователей, созданных seed_data')
+        parser.add_argument('--random-seed', type=int, default=0,
+                            help='Начальное значение генератора случайных чисел клиентов')
+        parser.add_argument('--output', default=None,
+                            help='Путь к файлу результатов (по умолчанию load-<дата и время>.json)')
+        parser.add_argument('--baseline', default=None,
+                            help='Файл результатов предыдущего прогона для сравнения')
+
+    def handle(self, *args, **options):
+        mix = self.parse_mix(options['mix'])
+        baseline = self.read_baseline(options['baseline'])
+        data = self.load_data(options['prefix'])
+        scenario = self.scenario(data, mix, options['password'], options['host'])
+        url = options['url'].rstrip('/')
+
+        self.stdout.write(f'Сотрудников: {len(data['employees'])}, администраторов: {len(data['admins'])}, '
+                          f'смесь: {mix}')
+        if options['warmup']:
+            run_scenario(url, scenario, options['concurrency'], options['warmup'], options['random_seed'] + 1)
+        started_at = timezone.now()
+        result = run_scenario(url, scenario, options['concurrency'], options['requests'], options['random_seed'])
+
+        report = {
+            'started_at': started_at.isoformat(),
+            'url': url,
+            'concurrency': options['concurrency'],
+            'requests': options['requests'],
+            'mix': mix,
+            'data': {'employees': len(data['employees']), 'admins': len(data['admins'])},
+            'result': result,
+        }
+        path = Path(options['output'] or f'load-{started_at:%Y%m%d-%H%M%S}.json')
+        path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+        self.report('total', result, (baseline or {}).get('result'))
+        for operation, values in result['operations'].items():
+            self.report(operation, values, (baseline or {}).get('result', {}).get('operations', {}).get(operation))
+        self.stdout.write(self.style.SUCCESS(f'Результаты сохранены в {path}'))
+
+    # Метод для разбора долей операций вида operation=weight
+    @staticmethod
+    def parse_mix(values: list[str] | None) -> dict[str, int]:
+        if not values:
+            return dict(MIX)
+        mix = {}
+        for value in values:
+            operation, _, weight = value.partition('=')
+            if operation not in MIX or not weight.isdigit():
+                raise CommandError(f'Некорректная доля операции {value}. '
+                                   f'Доступные операции: {', '.join(MIX)}')
+            mix[operation] = int(weight)
+        if not any(mix.values()):
+            raise CommandError('Сумма долей операций должна быть больше нуля')
+        return mix
+
+    @staticmethod
+    def read_baseline(path: str | None) -> dict | None:
+        if path is None:
+            return None
+        try:
+            return json.loads(Path(path).read_text(encoding='utf-8'))
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Ошибка чтения файла результатов. Детали ошибки: {error}.')
+
+    # Метод для загрузки данных сценария: токены сотрудников и администраторов, задачи и встречи
+    @staticmethod
+    def load_data(prefix: str) -> dict:
+        profiles = list(Profile.objects
+                        .filter(user__username__startswith=f'{prefix}_', user__auth_token__isnull=False)
+                        .values('id', 'team_id', 'is_administrator',
+                                username=F('user__username'), token=F('user__auth_token__key')))
+        admins = {i['team_id']: i for i in profiles if i['is_administrator']}
+        employees = [i for i in profiles if not i['is_administrator'] and i['team_id'] in admins]
+        if not employees:
+            raise CommandError(f'Нет данных для нагрузки, выполните seed_data --prefix {prefix}')
+
+        tasks, meetings = {}, {}
+        for task_id, profile_id in (Task.objects.filter(assigned_to_id__in=[i['id'] for i in employees])
+                                    .order_by('-id').values_list('id', 'assigned_to_id').iterator()):
+            if len(tasks.setdefault(profile_id, [])) < SAMPLE_SIZE:
+                tasks[profile_id].append(task_id)
+        for meeting_id, team_id in (Meeting.objects.filter(organizer_id__in=[i['id'] for i in admins.values()],
+                                                           start_at__gt=timezone.now())
+                                    .order_by('start_at').values_list('id', 'organizer__team_id').iterator()):
+            if len(meetings.setdefault(team_id, [])) < SAMPLE_SIZE:
+                meetings[team_id].append(meeting_id)
+
+        for employee in employees:
+            employee['tasks'] = tasks.get(employee['id'], [])
+            employee['admin'] = admins[employee['team_id']]
+            employee['meetings'] = meetings.get(employee['team_id'], [])
+        return {'employees': employees, 'admins': list(admins.values())}
+
+    # Метод для построения сценария: каждый запрос выполняется от имени случайного сотрудника
+    # (операции руководителя - от имени администратора его компании)
+    @staticmethod
+    def scenario(data: dict, mix: dict[str, int], password: str, host: str):
+        operations, weights = list(mix), list(mix.values())
+        statuses = [TaskStatuses.PENDING, TaskStatuses.DEFERRED, TaskStatuses.FINISHED]
+
+        def auth(profile: dict) -> dict:
+            return {'Authorization': f'Token {profile['token']}', 'Host': host}
+
+        def request(rng):
+            operation = rng.choices(operations, weights)[0]
+            employee = rng.choice(data['employees'])
+            admin = employee['admin']
+            if operation == 'get-token':
+                user = rng.choice((employee, admin))
+                return (operation, 'POST', '/api/v1/accounts/get-token/', {'Host': host},
+                        {'username': user['username'], 'password': password})
+            if operation == 'task-create':
+                deadline = timezone.now() + datetime.timedelta(days=rng.randint(1, 30))
+                return (operation, 'POST', '/api/v1/activities/task/', auth(admin),
+                        {'name': f'load {uuid.UUID(int=rng.getrandbits(128)).hex}',
+                         'assigned_to': employee['id'], 'deadline': deadline.isoformat()})
+            if operation == 'task-update-status' and employee['tasks']:
+                return (operation, 'POST', f'/api/v1/activities/task/{rng.choice(employee['tasks'])}/update-status/',
+                        auth(employee), {'status': rng.choice(statuses), 'comment': 'load'})
+            if operation == 'get-marks':
+                return operation, 'GET', '/api/v1/activities/task/get-marks/?options=quarter', auth(employee), None
+            if operation == 'add-participant' and employee['meetings']:
+                return (operation, 'POST', f'/api/v1/activities/meeting/{rng.choice(employee['meetings'])}'
+                                           f'/add-participant/', auth(admin), {'name': employee['username']})
+            return 'calendar', 'GET', '/api/v1/activities/calendar/?period=weekly', auth(employee), None
+
+        return request
+
+    # Метод для вывода результатов операции с изменением относительно предыдущего прогона
+    def report(self, operation: str, result: dict, baseline: dict | None) -> None:
+        line = (f'{operation:<20} rps={result['rps']:<8} median={result['median']}ms '
+                f'p95={result['p95']}ms p99={result['p99']}ms')
+        if 'statuses' in result:
+            line += f' statuses={result['statuses']}'
+        else:
+            line += f' errors={result['errors']}'
+        if baseline:
+            line += ' | ' + ' '.join(f'{key} {self.change(baseline[key], result[key])}'
+                                     for key in ('rps', 'median', 'p95', 'p99'))
+        self.stdout.write(line)
+
+    @staticmethod
+    def change(before: float, after: float) -> str:
+        if not before:
+            return 'n/a'
+        return f'{(after - before) / before * 100:+.1f}%'
@@ -0,0 +1,193 @@
+import datetime
+import itertools
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts.constants import Position
+from accounts.models import Profile
+from activities.constants import CalendarKinds, TaskStatuses
+from activities.models import Calendar, Meeting, Task, TaskEstimation, TaskStatus
+from activities.utils import Service
+from companies.cache import read_cache
+from companies.models import Company, Structure
+
+# Доля статусов seed-задач (оценки выставляются выполненным задачам)
+STATUS_WEIGHTS = {TaskStatuses.PENDING: 5, TaskStatuses.DEFERRED: 1, TaskStatuses.FINISHED: 4}
+
+
+class Command(BaseCommand):
+    help = ('Заполнение БД данными для нагрузочного тестирования: компании и структуры, сотрудники, '
+            'задачи со статусами и оценками, встречи с участниками и записи календаря')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=10,
+                            help='Количество компаний (у каждой своя организационная структура)')
+        parser.add_argument('--profiles', type=int, default=1000,
+                            help='Количество сотрудников (первый сотрудник компании - администратор)')
+        parser.add_argument('--tasks', type=int, default=20000,
+                            help='Количество задач')
+        parser.add_argument('--meetings', type=int, default=2000,
+                            help='Количество встреч')
+        parser.add_argument('--participants', type=int, default=5,
+                            help='Количество участников встречи')
+        parser.add_argument('--calendar', type=int, default=20000,
+                            help='Количество прочих записей календаря')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Количество строк в одном bulk_create (одна транзакция на порцию)')
+        parser.add_argument('--prefix', default='seed',
+                            help='Префикс имен создаваемых пользователей, компаний и структур')
+        parser.add_argument('--password', default='seed1234',
+                            help='Пароль всех создаваемых пользователей')
+        parser.add_argument('--random-seed', type=int, default=0,
+                            help='Начальное значение генератора случайных чисел')
+        parser.add_argument('--clear', action='store_true',
+                            help='Удалить ранее созданные данные с тем же префиксом и завершить работу')
+
+    def handle(self, *args, **options):
+        self.chunk_size = max(options['chunk_size'], 1)
+        self.random = random.Random(options['random_seed'])
+        prefix = options['prefix']
+
+        self.clear(prefix)
+        if options['clear']:
+            self.stdout.write(self.style.SUCCESS(f'Данные с префиксом {prefix} удалены'))
+            return
+
+        companies = max(options['companies'], 1)
+        teams = self.seed_companies(prefix, companies)
+        staff = self.seed_profiles(prefix, teams, max(options['profiles'], companies * 2), options['password'])
+        self.seed_tasks(prefix, staff, options['tasks'])
+        self.seed_meetings(staff, options['meetings'], options['participants'])
+        self.seed_calendar(prefix, staff, options['calendar'])
+        rollups = Service.rebuild_rollups([i for admin, employees in staff.values() for i in (admin, *employees)])
+        # bulk_create не отправляет сигналы моделей, кэш компаний и структур сбрасывается явно
+        read_cache.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: компаний {len(teams)}, сотрудников {sum(len(i[1]) + 1 for i in staff.values())}, '
+            f'задач {options['tasks']}, встреч {options['meetings']}, прочих записей календаря '
+            f'{options['calendar']}, квартальных итогов оценок {rollups}. '
+            f'Пароль пользователей: {options['password']}'))
+
+    # Метод для удаления данных предыдущего заполнения (задачи, встречи и календари удаляются каскадно)
+    @staticmethod
+    def clear(prefix: str) -> None:
+        with transaction.atomic():
+            User.objects.filter(username__startswith=f'{prefix}_').delete()
+            companies = Company.objects.filter(name__startswith=f'{prefix} ')
+            structures = list(companies.values_list('structure_id', flat=True))
+            companies.delete()
+            Structure.objects.filter(id__in=structures).delete()
+
+    # Метод для сохранения объектов порциями: объекты создаются генератором по мере сохранения
+    def bulk_create(self, model, objects) -> list:
+        created = []
+        for chunk in itertools.batched(objects, self.chunk_size):
+            with transaction.atomic():
+                created += model.objects.bulk_create(chunk)
+        return created
+
+    def seed_companies(self, prefix: str, count: int) -> list[int]:
+        structures = self.bulk_create(Structure, (Structure(name=f'{prefix} структура {i}') for i in range(count)))
+        companies = self.bulk_create(Company, (Company(name=f'{prefix} компания {i}', structure=structure)
+                                               for i, structure in enumerate(structures)))
+        return [i.id for i in companies]
+
+    # Метод для создания пользователей, токенов и профилей.
+    # Пароль хешируется один раз: хеш одинаковый для всех пользователей заполнения.
+    # Результат - {компания: (ID администратора, [ID сотрудников])}
+    def seed_profiles(self, prefix: str, teams: list[int], count: int, password: str) -> dict[int, tuple]:
+        password = make_password(password)
+        members = [(teams[i % len(teams)], i < len(teams)) for i in range(count)]
+        users = self.bulk_create(User, (User(username=f'{prefix}_{team}_{i}', password=password, is_staff=is_admin)
+                                        for i, (team, is_admin) in enumerate(members)))
+        self.bulk_create(Token, (Token(key=Token.generate_key(), user=user) for user in users))
+        profiles = self.bulk_create(Profile, (Profile(user=user, team_id=team, is_administrator=is_admin,
+                                                      position=Position.MANAGER if is_admin else Position.EMPLOYEE)
+                                              for user, (team, is_admin) in zip(users, members)))
+
+        staff = {team: (None, []) for team in teams}
+        for profile in profiles:
+            if profile.is_administrator:
+                staff[profile.team_id] = (profile.id, staff[profile.team_id][1])
+            else:
+                staff[profile.team_id][1].append(profile.id)
+        return staff
+
+    # Метод для создания задач от администраторов компаний сотрудникам со статусами,
+    # оценками выполненных задач и записями календаря исполнителей
+    def seed_tasks(self, prefix: str, staff: dict[int, tuple], count: int) -> None:
+        now = timezone.now()
+        teams = list(staff.values())
+        statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+
+        def tasks():
+            for i in range(count):
+                admin, employees = teams[i % len(teams)]
+                yield Task(name=f'{prefix} задача {i}', assigned_by_id=admin,
+                           assigned_to_id=self.random.choice(employees),
+                           deadline=now + datetime.timedelta(hours=self.random.randint(1, 24 * 30)))
+
+        for chunk in itertools.batched(tasks(), self.chunk_size):
+            with transaction.atomic():
+                created = Task.objects.bulk_create(chunk)
+                states = self.random.choices(statuses, weights, k=len(created))
+                TaskStatus.objects.bulk_create(TaskStatus(task=task, status=state)
+                                               for task, state in zip(created, states))
+                TaskEstimation.objects.bulk_create(TaskEstimation(task=task,
+                                                                  deadline_meeting=self.random.randint(1, 10),
+                                                                  completeness=self.random.randint(1, 10),
+                                                                  quality=self.random.randint(1, 10))
+                                                   for task, state in zip(created, states)
+                                                   if state == TaskStatuses.FINISHED)
+                Calendar.objects.bulk_create(Calendar(name=f'Задача {task.id}', kind=CalendarKinds.TASK,
+                                                      task=task, owner_id=task.assigned_to_id,
+                                                      start_at=now, end_at=task.deadline)
+                                             for task in created)
+
+    # Метод для создания встреч администраторов компаний с участниками и записями календаря.
+    # Встречи компании идут последовательно по часу, поэтому участники не заняты дважды
+    def seed_meetings(self, staff: dict[int, tuple], count: int, participants: int) -> None:
+        start = timezone.now().replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1)
+        teams = list(staff.values())
+        through = Meeting.participants.through
+
+        for chunk in itertools.batched(range(count), self.chunk_size):
+            meetings, members = [], []
+            for i in chunk:
+                admin, employees = teams[i % len(teams)]
+                start_at = start + datetime.timedelta(hours=i // len(teams))
+                meetings.append(Meeting(organizer_id=admin, start_at=start_at,
+                                        end_at=start_at + datetime.timedelta(
+                                            minutes=self.random.choice((30, 45, 60)))))
+                members.append(self.random.sample(employees, min(participants, len(employees))))
+
+            with transaction.atomic():
+                meetings = Meeting.objects.bulk_create(meetings)
+                through.objects.bulk_create(through(meeting_id=meeting.id, profile_id=profile)
+                                            for meeting, profiles in zip(meetings, members) for profile in profiles)
+                Calendar.objects.bulk_create(Calendar(name=f'Встреча {meeting.id}', kind=CalendarKinds.MEETING,
+                                                      meeting=meeting, owner_id=owner,
+                                                      start_at=meeting.start_at, end_at=meeting.end_at)
+                                             for meeting, profiles in zip(meetings, members)
+                                             for owner in (meeting.organizer_id, *profiles))
+
+    # Метод для создания прочих записей календаря в пределах двух недель от текущего момента
+    def seed_calendar(self, prefix: str, staff: dict[int, tuple], count: int) -> None:
+        now = timezone.now().replace(second=0, microsecond=0)
+        profiles = [i for admin, employees in staff.values() for i in (admin, *employees)]
+
+        def entries():
+            for i in range(count):
+                start_at = now + datetime.timedelta(minutes=15 * self.random.randint(-24 * 4 * 14, 24 * 4 * 14))
+                yield Calendar(name=f'{prefix} дело {i}', kind=CalendarKinds.OTHER,
+                               owner_id=self.random.choice(profiles), start_at=start_at,
+                               end_at=start_at + datetime.timedelta(minutes=15 * self.random.randint(1, 8)))
+
+        self.bulk_create(Calendar, entries())
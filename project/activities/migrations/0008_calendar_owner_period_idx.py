@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_profile_position'),
+        ('activities', '0007_taskestimation_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calendar',
+            index=models.Index(fields=['owner', 'end_at', 'start_at'], name='calendar_owner_period_idx'),
+        ),
+    ]
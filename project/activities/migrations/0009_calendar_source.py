@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_profile_position'),
+        ('activities', '0008_calendar_owner_period_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendar',
+            name='kind',
+            field=models.CharField(choices=[('MEETING', 'Встреча'), ('TASK', 'Задача'), ('OTHER', 'Другое')], default='OTHER', max_length=16, verbose_name='Тип дела'),
+        ),
+        migrations.AddField(
+            model_name='calendar',
+            name='meeting',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='calendars', to='activities.meeting', verbose_name='Встреча'),
+        ),
+        migrations.AddField(
+            model_name='calendar',
+            name='task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='calendars', to='activities.task', verbose_name='Задача'),
+        ),
+    ]
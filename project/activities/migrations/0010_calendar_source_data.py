@@ -0,0 +1,44 @@
+import itertools
+
+from django.db import migrations
+
+CHUNK_SIZE = 5000
+
+# Тип дела, поле связи, модель источника и префикс названия записи календаря
+SOURCES = (('MEETING', 'meeting', 'Meeting', 'Встреча '),
+           ('TASK', 'task', 'Task', 'Задача '))
+
+
+def link_calendar_sources(apps, schema_editor):
+    """
+    Заполнение типа и связи записей календаря по названию вида "Встреча {id}"/"Задача {id}"
+    """
+    Calendar = apps.get_model('activities', 'Calendar')
+
+    for kind, field, model_name, prefix in SOURCES:
+        source = apps.get_model('activities', model_name)
+        rows = (Calendar.objects.filter(name__startswith=prefix)
+                .values_list('id', 'name')
+                .iterator(chunk_size=CHUNK_SIZE))
+
+        for chunk in itertools.batched(rows, CHUNK_SIZE):
+            links = {row_id: int(name.removeprefix(prefix)) for row_id, name in chunk
+                     if name.removeprefix(prefix).isdigit()}
+            existing = set(source.objects.filter(pk__in=set(links.values()))
+                           .values_list('pk', flat=True))
+            # Записи удаленных ранее встреч/задач остаются с типом "Другое"
+            Calendar.objects.bulk_update(
+                [Calendar(id=row_id, kind=kind, **{f'{field}_id': source_id})
+                 for row_id, source_id in links.items() if source_id in existing],
+                fields=('kind', field))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0009_calendar_source'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_calendar_sources, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0010_calendar_source_data'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='calendar',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('kind', 'MEETING'), ('meeting__isnull', False), ('task__isnull', True)), models.Q(('kind', 'TASK'), ('meeting__isnull', True), ('task__isnull', False)), models.Q(('kind', 'OTHER'), ('meeting__isnull', True), ('task__isnull', True)), _connector='OR'), name='Calendar source constraint'),
+        ),
+    ]
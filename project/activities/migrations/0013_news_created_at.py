@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_username_upper_idx'),
+        ('activities', '0012_task_deadline_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Дата создания новости'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['-created_at', '-id'], name='news_created_at_idx'),
+        ),
+    ]
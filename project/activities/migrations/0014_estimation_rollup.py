@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:33
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_username_upper_idx'),
+        ('activities', '0013_news_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstimationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('quarter', models.PositiveSmallIntegerField(validators=[django.core.validators.MaxValueValidator(4), django.core.validators.MinValueValidator(1)], verbose_name='Квартал')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('deadline_meeting_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок соблюдения сроков')),
+                ('completeness_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок полноты выполнения')),
+                ('quality_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок качества выполнения')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='estimation_rollups', to='accounts.profile', verbose_name='Исполнитель задач')),
+            ],
+            options={
+                'verbose_name': 'Квартальные итоги оценок',
+                'verbose_name_plural': 'Квартальные итоги оценок',
+                'constraints': [models.UniqueConstraint(fields=('profile', 'year', 'quarter'), name='Unique estimation rollup constraint')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractYear, ExtractQuarter
+
+
+def build_rollups(apps, schema_editor):
+    """
+    Заполнение квартальных итогов по уже выставленным оценкам
+    """
+    TaskEstimation = apps.get_model('activities', 'TaskEstimation')
+    EstimationRollup = apps.get_model('activities', 'EstimationRollup')
+
+    rows = (TaskEstimation.objects
+            .values(profile_id=F('task__assigned_to_id'),
+                    year=ExtractYear('created_at'),
+                    quarter=ExtractQuarter('created_at'))
+            .annotate(count=Count('id'),
+                      deadline_meeting_sum=Sum('deadline_meeting'),
+                      completeness_sum=Sum('completeness'),
+                      quality_sum=Sum('quality'))
+            .order_by())
+    EstimationRollup.objects.bulk_create((EstimationRollup(**i) for i in rows), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0014_estimation_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0015_estimation_rollup_data'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskestimation',
+            index=models.Index(fields=['created_at'], name='estimation_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_username_upper_idx'),
+        ('activities', '0016_estimation_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['start_at', 'id'], name='meeting_start_at_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:27
+
+import activities.models
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_username_upper_idx'),
+        ('activities', '0017_meeting_start_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendar',
+            name='period',
+            field=models.GeneratedField(db_persist=True, expression=activities.models.TsTzRange('start_at', 'end_at', django.contrib.postgres.fields.ranges.RangeBoundary()), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField(), verbose_name='Период дела'),
+        ),
+    ]
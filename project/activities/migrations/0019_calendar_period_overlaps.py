@@ -0,0 +1,75 @@
+import itertools
+import os
+
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+CHUNK_SIZE = 5000
+
+# Переменная окружения, разрешающая удаление двойных бронирований при миграции
+RESOLVE_ENV = 'CALENDAR_RESOLVE_OVERLAPS'
+
+
+def find_overlapping_meetings(Calendar) -> list[tuple]:
+    """
+    Записи встреч, пересекающиеся с более ранними записями того же владельца.
+    У владельца остаются записи, созданные раньше: (id, владелец, встреча, начало, окончание)
+    """
+    meetings = Calendar.objects.filter(kind='MEETING')
+    overlapping = (meetings
+                   .filter(Exists(meetings.filter(owner_id=OuterRef('owner_id'),
+                                                  start_at__lt=OuterRef('end_at'),
+                                                  end_at__gt=OuterRef('start_at'))
+                                  .exclude(id=OuterRef('id'))))
+                   .order_by('owner_id', 'id')
+                   .values_list('id', 'owner_id', 'meeting_id', 'start_at', 'end_at'))
+
+    conflicts = []
+    for _, rows in itertools.groupby(overlapping.iterator(chunk_size=CHUNK_SIZE), key=lambda row: row[1]):
+        kept = []
+        for row in rows:
+            if any(row[3] < end_at and row[4] > start_at for start_at, end_at in kept):
+                conflicts.append(row)
+            else:
+                kept.append((row[3], row[4]))
+    return conflicts
+
+
+def remove_overlapping_meetings(apps, schema_editor):
+    """
+    Проверка двойных бронирований перед созданием ограничения на пересечение встреч.
+    По умолчанию миграция прерывается со списком конфликтующих записей календаря.
+    При CALENDAR_RESOLVE_OVERLAPS=true более поздние записи и участие в этих встречах удаляются,
+    каждая удаленная запись выводится
+    """
+    Calendar = apps.get_model('activities', 'Calendar')
+    Meeting = apps.get_model('activities', 'Meeting')
+    conflicts = find_overlapping_meetings(Calendar)
+    if not conflicts:
+        return
+
+    listing = '\n'.join(f'  calendar id={row_id} owner={owner} meeting={meeting} {start_at} - {end_at}'
+                        for row_id, owner, meeting, start_at, end_at in conflicts)
+    if os.getenv(RESOLVE_ENV, 'False').lower() not in ('1', 'true', 'yes'):
+        raise RuntimeError(f'Найдено пересекающихся встреч в календарях: {len(conflicts)}.\n{listing}\n'
+                           f'Устраните пересечения или запустите миграцию с {RESOLVE_ENV}=true '
+                           f'для удаления перечисленных записей и участия в этих встречах.')
+
+    print(f'\n  Удаление пересекающихся встреч из календарей ({len(conflicts)}):\n{listing}')
+    through = Meeting.participants.through
+    for chunk in itertools.batched(conflicts, CHUNK_SIZE):
+        Calendar.objects.filter(id__in=[row[0] for row in chunk]).delete()
+        for _, owner, meeting, _, _ in chunk:
+            if through.objects.filter(meeting_id=meeting, profile_id=owner).delete()[0]:
+                print(f'  участник {owner} удален из встречи {meeting}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0018_calendar_period'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_overlapping_meetings, migrations.RunPython.noop),
+    ]
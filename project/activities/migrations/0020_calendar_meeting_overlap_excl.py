@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:27
+
+import activities.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0019_calendar_period_overlaps'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='calendar',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('kind', 'MEETING')), expressions=((activities.models.Int8Range('owner', 'owner', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_upper=True)), '='), ('period', '&&')), name='calendar_meeting_overlap_excl'),
+        ),
+    ]
@@ -1,8 +1,13 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import BigIntegerRangeField, DateTimeRangeField, RangeBoundary, RangeOperators
 from django.db import models
 from django.core.validators import MaxValueValidator, MinValueValidator
 
 from accounts.models import Profile
-from .constants import TaskStatuses
+from .constants import TaskStatuses, CalendarKinds
+
+# Ограничение, нарушение которого означает занятость владельца календаря в это время
+BUSY_CONSTRAINT = 'calendar_meeting_overlap_excl'
 
 
 class News(models.Model):
@@ -13,6 +18,7 @@ class News(models.Model):
     content = models.TextField(verbose_name='Содержание новости')
     author = models.ForeignKey(Profile, on_delete=models.CASCADE,
                                verbose_name='Автор новости')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания новости')
 
     def __str__(self) -> str:
         return f'Новость {self.title}'
@@ -20,6 +26,7 @@ class News(models.Model):
     class Meta:
         verbose_name = 'Новость'
         verbose_name_plural = 'Новости'
+        indexes = (models.Index(fields=('-created_at', '-id'), name='news_created_at_idx'),)
 
 
 class Task(models.Model):
@@ -44,6 +51,7 @@ class Task(models.Model):
         verbose_name_plural = 'Задачи'
         constraints = (models.UniqueConstraint(fields=('name', 'assigned_to'),
                                                name='Unique task constraint'),)
+        indexes = (models.Index(fields=('deadline', 'id'), name='task_deadline_idx'),)
 
 
 class TaskStatus(models.Model):
@@ -90,6 +98,36 @@ class TaskEstimation(models.Model):
     class Meta:
         verbose_name = 'Оценка задачи'
         verbose_name_plural = 'Оценки задач'
+        indexes = (models.Index(fields=('created_at',), name='estimation_created_at_idx'),)
+
+
+class EstimationRollup(models.Model):
+    """
+    Таблица квартальных итогов оценок исполнителя (суммы и количество оценок)
+    """
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE,
+                                related_name='estimation_rollups',
+                                verbose_name='Исполнитель задач')
+    year = models.PositiveSmallIntegerField(verbose_name='Год')
+    quarter = models.PositiveSmallIntegerField(verbose_name='Квартал',
+                                               validators=(MaxValueValidator(4),
+                                                           MinValueValidator(1)))
+    count = models.PositiveIntegerField(default=0, verbose_name='Количество оценок')
+    deadline_meeting_sum = models.PositiveIntegerField(default=0,
+                                                       verbose_name='Сумма оценок соблюдения сроков')
+    completeness_sum = models.PositiveIntegerField(default=0,
+                                                   verbose_name='Сумма оценок полноты выполнения')
+    quality_sum = models.PositiveIntegerField(default=0,
+                                              verbose_name='Сумма оценок качества выполнения')
+
+    def __str__(self) -> str:
+        return f'Итоги оценок {self.profile} за {self.quarter} квартал {self.year}'
+
+    class Meta:
+        verbose_name = 'Квартальные итоги оценок'
+        verbose_name_plural = 'Квартальные итоги оценок'
+        constraints = (models.UniqueConstraint(fields=('profile', 'year', 'quarter'),
+                                               name='Unique estimation rollup constraint'),)
 
 
 class Meeting(models.Model):
@@ -111,6 +149,23 @@ class Meeting(models.Model):
     class Meta:
         verbose_name = 'Встреча'
         verbose_name_plural = 'Встречи'
+        indexes = (models.Index(fields=('start_at', 'id'), name='meeting_start_at_idx'),)
+
+
+class TsTzRange(models.Func):
+    """
+    Период времени [начало, конец) с часовым поясом (тип tstzrange PostgreSQL)
+    """
+    function = 'TSTZRANGE'
+    output_field = DateTimeRangeField()
+
+
+class Int8Range(models.Func):
+    """
+    Диапазон целых чисел (тип int8range PostgreSQL)
+    """
+    function = 'INT8RANGE'
+    output_field = BigIntegerRangeField()
 
 
 class Calendar(models.Model):
@@ -118,11 +173,20 @@ class Calendar(models.Model):
     Таблица зарезервированных периодов времени для исполнителей и их руководителей
     """
     name = models.CharField(max_length=64, verbose_name='Название дела')
+    kind = models.CharField(max_length=16, choices=CalendarKinds.choices,
+                            default=CalendarKinds.OTHER, verbose_name='Тип дела')
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, null=True, blank=True,
+                                related_name='calendars', verbose_name='Встреча')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True,
+                             related_name='calendars', verbose_name='Задача')
     owner = models.ForeignKey(Profile, on_delete=models.CASCADE,
                               related_name='calendars',
                               verbose_name='Владелец зарезервированного времени')
     start_at = models.DateTimeField(verbose_name='Время начала дела')
     end_at = models.DateTimeField(verbose_name='Время окончания дела')
+    period = models.GeneratedField(expression=TsTzRange('start_at', 'end_at', RangeBoundary()),
+                                   output_field=DateTimeRangeField(), db_persist=True,
+                                   verbose_name='Период дела')
 
     def __str__(self) -> str:
         return f'Запланированное дело - {self.name}'
@@ -131,4 +195,25 @@ class Calendar(models.Model):
         verbose_name = 'Зарезервированное время для дел'
         verbose_name_plural = 'Зарезервированное время для дел'
         constraints = (models.UniqueConstraint(fields=('name', 'owner', 'start_at', 'end_at'),
-                                               name='Unique calendar constraint'),)
+                                               name='Unique calendar constraint'),
+                       models.CheckConstraint(condition=(models.Q(kind=CalendarKinds.MEETING,
+                                                                  meeting__isnull=False,
+                                                                  task__isnull=True)
+                                                         | models.Q(kind=CalendarKinds.TASK,
+                                                                    meeting__isnull=True,
+                                                                    task__isnull=False)
+                                                         | models.Q(kind=CalendarKinds.OTHER,
+                                                                    meeting__isnull=True,
+                                                                    task__isnull=True)),
+                                              name='Calendar source constraint'),
+                       # Встречи одного владельца не пересекаются: проверка выполняется БД при вставке,
+                       # поэтому одновременные бронирования не могут занять одно и то же время.
+                       # Владелец сравнивается как диапазон [owner, owner] - GiST-индексу не нужно btree_gist
+                       ExclusionConstraint(expressions=((Int8Range('owner', 'owner',
+                                                                   RangeBoundary(inclusive_upper=True)),
+                                                         RangeOperators.EQUAL),
+                                                        ('period', RangeOperators.OVERLAPS)),
+                                           condition=models.Q(kind=CalendarKinds.MEETING),
+                                           name=BUSY_CONSTRAINT),)
+        indexes = (models.Index(fields=('owner', 'end_at', 'start_at'),
+                                name='calendar_owner_period_idx'),)
@@ -0,0 +1,16 @@
+from rest_framework.renderers import BaseRenderer
+
+
+class ICSRenderer(BaseRenderer):
+    """
+    Рендерер для запросов с Accept: text/calendar.
+    Календарь отдается потоком в обход рендереров, через рендерер проходят только сообщения об ошибках
+    """
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            data = data.get('message', data.get('detail', ''))
+        return str(data).encode(self.charset)
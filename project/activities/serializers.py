@@ -3,6 +3,7 @@ import datetime
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from activities.constants import ParticipantStatuses, CalendarPeriods, BulkTaskStatuses
 from activities.models import News, Task, TaskStatus, TaskEstimation, Meeting, Calendar
 
 
@@ -12,9 +13,10 @@ class NewsSerializer(serializers.ModelSerializer):
     """
     id = serializers.IntegerField(read_only=True)
     author_name = serializers.CharField(source='author.user.username', read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
-        fields = ['id', 'title', 'content', 'author_name']
+        fields = ['id', 'title', 'content', 'author_name', 'created_at']
         model = News
 
         extra_kwargs = {
@@ -44,6 +46,37 @@ class TaskSerializer(serializers.ModelSerializer):
         }
 
 
+class BulkTaskItemSerializer(serializers.Serializer):
+    """
+    Сериализатор задачи в пакетном создании (без запросов к БД при валидации)
+    """
+    name = serializers.CharField(max_length=128)
+    assigned_to = serializers.IntegerField(min_value=1)
+    deadline = serializers.DateTimeField()
+
+
+class BulkTaskSerializer(serializers.Serializer):
+    """
+    Сериализатор для пакетного создания задач
+    """
+    tasks = BulkTaskItemSerializer(many=True, allow_empty=False, max_length=1000)
+
+
+class BulkTaskResultSerializer(serializers.Serializer):
+    """
+    Сериализатор результата создания задачи в пакете
+    """
+    index = serializers.IntegerField()
+    id = serializers.IntegerField(allow_null=True)
+    name = serializers.CharField()
+    assigned_to = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=BulkTaskStatuses.choices)
+    detail = serializers.SerializerMethodField()
+
+    def get_detail(self, obj) -> str:
+        return BulkTaskStatuses(obj['status']).label
+
+
 class TaskStatusSerializer(serializers.ModelSerializer):
     """
     Сериализатор для модели TaskStatus
@@ -99,14 +132,139 @@ class CalendarSerializer(serializers.ModelSerializer):
     id = serializers.IntegerField(read_only=True)
 
     class Meta:
-        fields = ['id', 'name', 'start_at', 'end_at', ]
+        fields = ['id', 'name', 'kind', 'start_at', 'end_at', ]
         model = Calendar
 
         extra_kwargs = {
-            'name': {'default': 'Название календаря'}
+            'name': {'default': 'Название календаря'},
+            'kind': {'read_only': True},
         }
 
 
+class CalendarPeriodSerializer(serializers.Serializer):
+    """
+    Сериализатор для параметров периода календаря.
+    Без period используется период from-to (если указан) или текущий день
+    """
+    MAX_PERIOD = datetime.timedelta(days=366)
+
+    period = serializers.ChoiceField(choices=CalendarPeriods.choices, required=False)
+
+    # Имена параметров from/to совпадают с ключевыми словами Python
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField(required=False)
+        fields['to'] = serializers.DateTimeField(required=False)
+        return fields
+
+    def validate(self, data):
+        if 'period' not in data:
+            data['period'] = CalendarPeriods.CUSTOM if 'from' in data else CalendarPeriods.DAILY
+        if data['period'] == CalendarPeriods.CUSTOM:
+            if 'from' not in data or 'to' not in data:
+                raise ValidationError('Custom period requires both from and to...')
+            if data['from'] >= data['to']:
+                raise ValidationError('Period beginning must be earlier than end of it...')
+            if data['to'] - data['from'] > self.MAX_PERIOD:
+                raise ValidationError('Period must not be longer than a year...')
+        return data
+
+
+class MeetingFilterSerializer(serializers.Serializer):
+    """
+    Сериализатор для параметров фильтрации списка встреч.
+    from-to - период начала встречи [from, to)
+    """
+    organizer = serializers.IntegerField(required=False)
+    participant = serializers.IntegerField(required=False)
+
+    # Имена параметров from/to совпадают с ключевыми словами Python
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField(required=False)
+        fields['to'] = serializers.DateTimeField(required=False)
+        return fields
+
+    def validate(self, data):
+        if 'from' in data and 'to' in data and data['from'] >= data['to']:
+            raise ValidationError('Period beginning must be earlier than end of it...')
+        return data
+
+
+class FindSlotSerializer(serializers.Serializer):
+    """
+    Сериализатор параметров поиска свободного времени для встречи
+    """
+    participants = serializers.ListField(child=serializers.IntegerField(), default=list)
+    start_at = serializers.DateTimeField()
+    end_at = serializers.DateTimeField()
+    duration = serializers.IntegerField(min_value=1)
+    granularity = serializers.IntegerField(min_value=1, default=15)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=5)
+
+    def validate(self, data):
+        if data['start_at'].timestamp() >= data['end_at'].timestamp():
+            raise ValidationError('Search window beginning must be earlier than end of it...')
+        return data
+
+
+class SlotSerializer(serializers.Serializer):
+    """
+    Сериализатор свободного интервала для встречи
+    """
+    start_at = serializers.DateTimeField()
+    end_at = serializers.DateTimeField()
+
+
+class ParticipantResultSerializer(serializers.Serializer):
+    """
+    Сериализатор результата добавления/удаления участника встречи
+    """
+    name = serializers.CharField()
+    status = serializers.ChoiceField(choices=ParticipantStatuses.choices)
+    detail = serializers.SerializerMethodField()
+
+    def get_detail(self, obj) -> str:
+        return ParticipantStatuses(obj['status']).label
+
+
+class QuarterSerializer(serializers.Serializer):
+    """
+    Сериализатор для параметров выбора квартала (по умолчанию текущий)
+    """
+    year = serializers.IntegerField(required=False, min_value=2000, max_value=2100)
+    quarter = serializers.IntegerField(required=False, min_value=1, max_value=4)
+
+
+class MarksQuerySerializer(QuarterSerializer):
+    """
+    Сериализатор для параметров выбора квартала или произвольного периода [start_at, end_at)
+    """
+    start_at = serializers.DateTimeField(required=False)
+    end_at = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if ('start_at' in data) != ('end_at' in data):
+            raise ValidationError('Period requires both start_at and end_at...')
+        if 'start_at' in data and data['start_at'] >= data['end_at']:
+            raise ValidationError('Period beginning must be earlier than end of it...')
+        return data
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    """
+    Сериализатор строки рейтинга сотрудников компании
+    """
+    rank = serializers.IntegerField()
+    profile_id = serializers.IntegerField()
+    name = serializers.CharField()
+    tasks = serializers.IntegerField()
+    deadline_meeting = serializers.FloatField(source='deadline_meeting_avg')
+    completeness = serializers.FloatField(source='completeness_avg')
+    quality = serializers.FloatField(source='quality_avg')
+    average = serializers.FloatField()
+
+
 class SuccessResponseWithStatus(serializers.Serializer):
     message = serializers.CharField(default='Операция прошла удачно')
     data = TaskStatusSerializer()
@@ -126,6 +284,27 @@ class SuccessResponseWithMeeting(serializers.Serializer):
     message = serializers.CharField(default='Операция прошла удачно')
     data = MeetingSerializer()
 
+
+class SuccessResponseWithSlots(serializers.Serializer):
+    message = serializers.CharField(default='Операция прошла удачно')
+    data = SlotSerializer(many=True)
+
+
+class SuccessResponseWithParticipants(serializers.Serializer):
+    message = serializers.CharField(default='Операция прошла удачно')
+    data = ParticipantResultSerializer(many=True)
+
+
 class SuccessResponseWithMarks(serializers.Serializer):
     message = serializers.CharField(default='Операция прошла удачно')
-    data = TaskEstimationSerializer()
\ No newline at end of file
+    data = TaskEstimationSerializer()
+
+
+class SuccessResponseWithLeaderboard(serializers.Serializer):
+    message = serializers.CharField(default='Операция прошла удачно')
+    data = LeaderboardSerializer(many=True)
+
+
+class SuccessResponseWithBulkTasks(serializers.Serializer):
+    message = serializers.CharField(default='Операция прошла удачно')
+    data = BulkTaskResultSerializer(many=True)
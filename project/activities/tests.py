@@ -1,9 +1,30 @@
+import datetime
+import io
 import json
+import os
+import subprocess
+import tempfile
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import skipUnless
 
-from django.test import TestCase, Client
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.utils import timezone
+from drf_spectacular.generators import SchemaGenerator
 
 from accounts.models import Profile
-from activities.constants import TestActivityData
+from activities.constants import TestActivityData, CalendarKinds
+from activities.models import Calendar, EstimationRollup, Meeting, Task, TaskStatus
+from activities.utils import Service
+from companies.models import Company, Structure
+from core.metrics import HISTOGRAMS, Histogram, MetricsSnapshot, MetricsStore, registry
 
 
 class TestActivities(TestCase):
@@ -46,7 +67,51 @@ class TestActivities(TestCase):
         response = self.client.get(path=f'{self.ACTIVITIES_URL}news/',
                                    headers={'Authorization': f'Token {self.profile_6.data['token']}'})
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    # Получение ленты новостей и повторный запрос без изменений
+    def test_news_feed_not_modified(self):
+        self.test_create_news_1()
+        self.test_create_news_2()
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}news/feed/',
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['title'] for i in response.json()['results']],
+                         [self.data.news_2['title'], self.data.news_1['title']])
+
+        with self.assertNumQueries(2):
+            cached = self.client.get(path=f'{self.ACTIVITIES_URL}news/feed/',
+                                     headers={'Authorization': f'Token {self.profile_7.data['token']}',
+                                              'If-None-Match': response['ETag']})
+        self.assertEqual(cached.status_code, 304)
+
+        self.test_create_news_1()
+        changed = self.client.get(path=f'{self.ACTIVITIES_URL}news/feed/',
+                                  headers={'Authorization': f'Token {self.profile_7.data['token']}',
+                                           'If-None-Match': response['ETag']})
+        self.assertEqual(changed.status_code, 200)
+
+    # Лента новостей с неверным курсором
+    def test_news_feed_invalid_cursor(self):
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}news/feed/', data={'cursor': 'invalid'},
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.status_code, 404)
+
+    # Асинхронные ленту новостей и календарь описывает схема OpenAPI
+    def test_async_views_schema(self):
+        paths = SchemaGenerator().get_schema(request=None, public=True)['paths']
+        self.assertEqual(paths[f'{self.ACTIVITIES_URL}news/feed/']['get']['tags'], ['News'])
+        self.assertEqual(paths[f'{self.ACTIVITIES_URL}calendar/']['get']['tags'], ['Calendar'])
+
+    # Количество запросов к БД при получении ленты не зависит от числа новостей
+    def test_news_feed_num_queries(self):
+        for _ in range(10):
+            self.test_create_news_1()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(path=f'{self.ACTIVITIES_URL}news/feed/',
+                                       headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(len(response.json()['results']), 10)
 
     # Успешное создание встречи 1
     def test_create_meeting_1(self):
@@ -79,7 +144,65 @@ class TestActivities(TestCase):
                                    headers={'Authorization': f'Token {self.profile_6.data['token']}'})
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    # Создание встреч организатора profile_6 по часу начиная с start (каждая вторая - с участником profile_7)
+    def create_meetings(self, count: int, start: datetime.datetime) -> list[Meeting]:
+        organizer = Profile.objects.get(id=self.profile_6.data['profile']['id'])
+        meetings = Meeting.objects.bulk_create(Meeting(organizer=organizer,
+                                                       start_at=start + datetime.timedelta(hours=i),
+                                                       end_at=start + datetime.timedelta(hours=i, minutes=30))
+                                               for i in range(count))
+        Meeting.participants.through.objects.bulk_create(
+            Meeting.participants.through(meeting_id=meeting.id, profile_id=self.profile_7.data['profile']['id'])
+            for meeting in meetings[::2])
+        return meetings
+
+    # Список встреч без дополнительных запросов на организатора и участников каждой встречи
+    def test_meeting_list_queries(self):
+        start = timezone.make_aware(datetime.datetime(2025, 3, 3, 9))
+        self.create_meetings(20, start)
+
+        # Аутентификация, встречи с организаторами, участники
+        with self.assertNumQueries(3):
+            response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/',
+                                       headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[0]['organizer_name'], self.data.user_1['username'])
+        self.assertEqual(results[0]['participants'], [self.profile_7.data['profile']['id']])
+        self.assertEqual(results[1]['participants'], [])
+        self.assertEqual([i['start_at'] for i in results], sorted(i['start_at'] for i in results))
+
+    # Фильтрация списка встреч по периоду начала и участнику
+    def test_meeting_list_filters(self):
+        start = timezone.make_aware(datetime.datetime(2025, 3, 3, 9))
+        meetings = self.create_meetings(10, start)
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/',
+                                   data={'from': (start + datetime.timedelta(hours=2)).isoformat(),
+                                         'to': (start + datetime.timedelta(hours=6)).isoformat(),
+                                         'participant': self.profile_7.data['profile']['id']},
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['id'] for i in response.json()['results']], [meetings[2].id, meetings[4].id])
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/',
+                                   data={'from': start.isoformat(), 'to': start.isoformat()},
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+
+    # Свои встречи сотрудника без прав администратора
+    def test_my_meetings(self):
+        meetings = self.create_meetings(6, timezone.make_aware(datetime.datetime(2025, 3, 3, 9)))
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/my/',
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['id'] for i in response.json()['results']], [i.id for i in meetings[::2]])
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/',
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.status_code, 403)
 
     # Удаление встречи
     def test_delete_meeting(self):
@@ -89,6 +212,146 @@ class TestActivities(TestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    # Занятость при встрече, полностью содержащей запрашиваемый интервал
+    def test_is_free_inner_meeting(self):
+        self.test_create_meeting_1()
+        profile = Profile.objects.get(user__username=self.data.user_1['username'])
+        start = timezone.make_aware(datetime.datetime(2025, 2, 10, 17, 0))
+        end = timezone.make_aware(datetime.datetime(2025, 2, 10, 19, 0))
+
+        self.assertFalse(Service.is_free(profile, start, end))
+
+    # Свободное время сразу после окончания встречи
+    def test_is_free_adjacent_meeting(self):
+        self.test_create_meeting_1()
+        profile = Profile.objects.get(user__username=self.data.user_1['username'])
+        start = timezone.make_aware(datetime.datetime(2025, 2, 10, 18, 30))
+        end = timezone.make_aware(datetime.datetime(2025, 2, 10, 19, 0))
+
+        self.assertTrue(Service.is_free(profile, start, end))
+
+    # Поиск общего свободного времени для встречи
+    def test_find_slot(self):
+        self.test_create_meeting_1()
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/find-slot/',
+                                   data={**self.data.find_slot, 'participants': [self.profile_7.data['profile']['id']]},
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['start_at'] for i in response.data['data']],
+                         ['2025-02-10T17:00:00+03:00', '2025-02-10T18:30:00+03:00'])
+
+    # Поиск свободного времени только среди существующих сотрудников команды организатора
+    def test_find_slot_foreign_participants(self):
+        company = Company.objects.create(name='Slots', structure=Structure.objects.create(name='Slots'))
+        Profile.objects.filter(id=self.profile_6.data['profile']['id']).update(team=company)
+        alien = self.profile_7.data['profile']['id']
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}meeting/find-slot/',
+                                   data={**self.data.find_slot, 'participants': [alien, 0]},
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['data'], [0, alien])
+
+    # Календарь без указания периода (текущий день)
+    def test_calendar_default_period(self):
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+
+    # Календарь без токена и с неверным режимом периода
+    def test_calendar_errors(self):
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/', data={'period': 'yearly'},
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+
+    # Календарь за период from-to содержит пересекающиеся с ним записи
+    def test_calendar_custom_period(self):
+        self.test_create_meeting_1()
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/',
+                                   data=self.data.calendar_overlap,
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['message']), 1)
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/',
+                                   data=self.data.calendar_adjacent,
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.json()['message'], [])
+
+    # Календарь за месяц не содержит записей того же месяца прошлых лет
+    def test_calendar_monthly_period(self):
+        profile = Profile.objects.get(user__username=self.data.user_1['username'])
+        now = timezone.localtime()
+        for start_at in (now, now.replace(year=now.year - 1, day=min(now.day, 28))):
+            Calendar.objects.create(name='Другое', owner=profile, start_at=start_at,
+                                    end_at=start_at + datetime.timedelta(minutes=1))
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/',
+                                   data=self.data.calendar_monthly,
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['message']), 1)
+
+    # Экспорт календаря в формате iCalendar и повторный запрос без изменений
+    def test_calendar_export(self):
+        self.test_create_meeting_1()
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/export/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}',
+                                            'Accept': 'text/calendar'})
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('DTSTART:20250210T150000Z\r\n', content)
+        self.assertEqual(content.count('BEGIN:VEVENT'), 1)
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/export/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}',
+                                            'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    # Под ASGI календарь отдается частями без сборки всего файла в памяти
+    async def test_calendar_export_asgi_streaming(self):
+        await sync_to_async(self.test_create_meeting_1)()
+        response = await self.async_client.get(path=f'{self.ACTIVITIES_URL}calendar/export/',
+                                               headers={'Authorization': f'Token {self.profile_6.data['token']}',
+                                                        'Accept': 'text/calendar'})
+        self.assertEqual(response.status_code, 200)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            parts = [i.decode() async for i in response]
+        self.assertTrue(parts[0].startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(parts[1].count('BEGIN:VEVENT'), 1)
+        self.assertEqual(parts[-1], 'END:VCALENDAR\r\n')
+
+    # Экспорт календарей компании администратором
+    def test_company_calendar_export(self):
+        self.test_create_meeting_1()
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/company-export/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+
+        company = Company.objects.create(name='Calendar', structure=Structure.objects.create(name='Linear'))
+        Profile.objects.update(team=company)
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}calendar/company-export/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content).decode().count('BEGIN:VEVENT'), 1)
+
+    # Удаление записей календаря вместе со встречей
+    def test_delete_meeting_calendar(self):
+        meeting = self.test_create_meeting_1()
+        self.assertEqual(Calendar.objects.filter(meeting_id=meeting['data']['id'],
+                                                 kind=CalendarKinds.MEETING).count(), 1)
+
+        response = self.client.delete(path=f'{self.ACTIVITIES_URL}meeting/{meeting['data']['id']}/',
+                                      headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Calendar.objects.filter(meeting_id=meeting['data']['id']).exists())
+
     # Добавление участника встречи
     def test_add_participant(self):
         meeting = self.test_create_meeting_1()
@@ -99,6 +362,77 @@ class TestActivities(TestCase):
             headers={'Authorization': f'Token {self.profile_6.data['token']}'})
         self.assertEqual(response.status_code, 200)
 
+    # Добавление нескольких участников встречи одним запросом
+    def test_add_participants(self):
+        meeting = self.test_create_meeting_1()
+
+        response = self.client.post(
+            path=f'{self.ACTIVITIES_URL}meeting/{meeting['data']['id']}/add-participant/',
+            data=self.data.participants,
+            content_type='application/json',
+            headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['status'] for i in response.data['data']], ['ADDED', 'NOT_FOUND'])
+
+    # Удаление нескольких участников встречи одним запросом
+    def test_delete_participants(self):
+        meeting = self.test_create_meeting_1()
+        self.client.post(
+            path=f'{self.ACTIVITIES_URL}meeting/{meeting['data']['id']}/add-participant/',
+            data=self.data.participants,
+            content_type='application/json',
+            headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+
+        response = self.client.delete(
+            path=f'{self.ACTIVITIES_URL}meeting/{meeting['data']['id']}/delete-participant/',
+            data=self.data.participants,
+            content_type='application/json',
+            headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['status'] for i in response.data['data']], ['REMOVED', 'NOT_FOUND'])
+
+    # Создание встречи, пересекающейся с другой встречей организатора
+    def test_create_meeting_busy(self):
+        self.test_create_meeting_1()
+        response = self.client.post(path=f'{self.ACTIVITIES_URL}meeting/',
+                                    data=self.data.meeting_overlap,
+                                    headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], 'В это время Вы не сможете провести встречу.')
+        self.assertEqual(Meeting.objects.count(), 1)
+
+    # Добавление участника, занятого на другой встрече в это время
+    def test_add_participant_busy(self):
+        first = self.test_create_meeting_1()
+        self.client.post(path=f'{self.ACTIVITIES_URL}meeting/{first['data']['id']}/add-participant/',
+                         data={'name': 'Second'},
+                         headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        second = Meeting.objects.create(organizer_id=self.profile_6.data['profile']['id'],
+                                        start_at=timezone.make_aware(datetime.datetime(2025, 2, 10, 18, 15)),
+                                        end_at=timezone.make_aware(datetime.datetime(2025, 2, 10, 19, 0)))
+
+        response = self.client.post(
+            path=f'{self.ACTIVITIES_URL}meeting/{second.id}/add-participant/',
+            data=self.data.participants,
+            content_type='application/json',
+            headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([i['status'] for i in response.data['data']], ['BUSY', 'NOT_FOUND'])
+        self.assertFalse(second.participants.exists())
+
+    # Пересечение встреч владельца запрещено ограничением БД, задачи могут пересекаться со встречами
+    def test_calendar_meeting_overlap_constraint(self):
+        meeting = Meeting.objects.get(id=self.test_create_meeting_1()['data']['id'])
+        entry = Service.meeting_calendar(meeting, meeting.organizer)
+        entry.name = 'Повтор'
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            entry.save()
+
+        task = Task.objects.create(name='Overlap', assigned_by=meeting.organizer, assigned_to=meeting.organizer,
+                                   deadline=meeting.end_at)
+        Calendar.objects.create(name='Задача', kind=CalendarKinds.TASK, task=task, owner=meeting.organizer,
+                                start_at=meeting.start_at, end_at=meeting.end_at)
+
     # Успешное создание задачи 1
     def test_create_task_1(self):
         response = self.client.post(path=f'{self.ACTIVITIES_URL}task/',
@@ -107,6 +441,56 @@ class TestActivities(TestCase):
         self.assertEqual(response.status_code, 201)
         return response.data
 
+    # Количество запросов к БД при создании задачи
+    def test_create_task_num_queries(self):
+        with self.assertNumQueries(6):
+            response = self.client.post(path=f'{self.ACTIVITIES_URL}task/',
+                                        data=self.data.task_1,
+                                        headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 201)
+
+    # Пакетное создание задач с результатом по каждой задаче
+    def test_bulk_create_tasks(self):
+        self.test_create_task_1()
+        response = self.client.post(path=f'{self.ACTIVITIES_URL}task/bulk-create/',
+                                    data=self.data.bulk_tasks,
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([i['status'] for i in response.data['data']],
+                         ['CREATED', 'DUPLICATE', 'NOT_FOUND', 'PAST_DEADLINE', 'EXISTS'])
+        task = Task.objects.get(id=response.data['data'][0]['id'])
+        self.assertEqual(TaskStatus.objects.get(task=task).status, 'PENDING')
+        self.assertEqual(task.calendars.get().owner_id, task.assigned_to_id)
+
+    # Пакетное создание задач без единой корректной задачи
+    def test_bulk_create_tasks_fail(self):
+        response = self.client.post(path=f'{self.ACTIVITIES_URL}task/bulk-create/',
+                                    data={'tasks': self.data.bulk_tasks['tasks'][2:4]},
+                                    content_type='application/json',
+                                    headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Task.objects.exists())
+
+    # Количество запросов к БД при пакетном создании задач не зависит от размера пакета
+    def test_bulk_create_tasks_num_queries(self):
+        tasks = [{**self.data.task_1, 'name': f'Sprint task {i}'} for i in range(200)]
+        with self.assertNumQueries(8):
+            response = self.client.post(path=f'{self.ACTIVITIES_URL}task/bulk-create/',
+                                        data={'tasks': tasks},
+                                        content_type='application/json',
+                                        headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(TaskStatus.objects.count(), 200)
+
+    # Количество запросов к БД при создании встречи (встреча и запись календаря - одной транзакцией)
+    def test_create_meeting_num_queries(self):
+        with self.assertNumQueries(6):
+            response = self.client.post(path=f'{self.ACTIVITIES_URL}meeting/',
+                                        data=self.data.meeting_1,
+                                        headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 201)
+
     # Успешное создание задачи 2
     def test_create_task_2(self):
         response = self.client.post(path=f'{self.ACTIVITIES_URL}task/',
@@ -115,6 +499,20 @@ class TestActivities(TestCase):
         self.assertEqual(response.status_code, 201)
         return response.data
 
+    # Постраничное получение списка задач по сроку выполнения
+    def test_get_tasks_paginated(self):
+        self.test_create_task_1()
+        self.test_create_task_2()
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}task/', data=self.data.page,
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([i['name'] for i in response.data['results']], ['Task 1'])
+
+        response = self.client.get(path=response.data['next'],
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual([i['name'] for i in response.data['results']], ['Task 2'])
+        self.assertIsNone(response.data['next'])
+
     # Успешное обновление задачи
     def test_update_task(self):
         task = self.test_create_task_1()
@@ -132,6 +530,7 @@ class TestActivities(TestCase):
         response = self.client.delete(path=f'{self.ACTIVITIES_URL}task/{task['data']['id']}/',
                                       headers={'Authorization': f'Token {self.profile_6.data['token']}'})
         self.assertEqual(response.status_code, 200)
+        self.assertFalse(Calendar.objects.filter(task_id=task['data']['id']).exists())
 
     # Обновление статуса задачи
     def test_update_task_status(self):
@@ -163,6 +562,157 @@ class TestActivities(TestCase):
         )
         self.assertEqual(response.status_code, 201)
 
+    # Средние оценки за квартал по квартальным итогам исполнителя
+    def test_get_quarter_marks(self):
+        for task, mark in ((self.test_create_task_1(), self.data.task_mark_1),
+                           (self.test_create_task_2(), self.data.task_mark_2)):
+            self.client.post(path=f'{self.ACTIVITIES_URL}task/{task['data']['id']}/estimate-task/',
+                             data=mark,
+                             headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(EstimationRollup.objects.get().count, 2)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(path=f'{self.ACTIVITIES_URL}task/get-marks/',
+                                       data={'options': 'quarter'},
+                                       headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], {'Соответствие дедлайн': 5.5,
+                                                 'Завершение задачи': 8.5,
+                                                 'Качество выполнения': 3.5})
+
+    # Метрики обработчиков: длительность, количество и время SQL-запросов
+    @override_settings(METRICS={'ENABLED': True, 'SERVER_TIMING': False, 'TOKEN': 'secret'})
+    def test_metrics_by_view(self):
+        registry.clear()
+        self.client.get(path=f'{self.ACTIVITIES_URL}task/get-marks/', data={'options': 'quarter'},
+                        headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.client.get(path=f'{self.ACTIVITIES_URL}news/feed/',
+                        headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+
+        response = self.client.get(path='/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn('django_view_db_queries_sum{view="TaskViewSet.get_marks",method="GET"} 2', content)
+        self.assertIn('django_view_db_queries_sum{view="NewsFeedView",method="GET"} 3', content)
+        self.assertIn('django_view_duration_seconds_count{view="TaskViewSet.get_marks",method="GET"} 1', content)
+        self.assertNotIn('view="metrics"', content)
+
+    # Заголовок Server-Timing и доступ к метрикам по токену
+    @override_settings(METRICS={'ENABLED': True, 'SERVER_TIMING': True, 'TOKEN': 'secret'})
+    def test_metrics_server_timing(self):
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}task/get-marks/', data={'options': 'quarter'},
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertRegex(response['Server-Timing'], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="2 queries"$')
+
+        self.assertEqual(self.client.get(path='/metrics').status_code, 401)
+        response = self.client.get(path='/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+
+    # Без токена метрики доступны только при DEBUG
+    @override_settings(METRICS={'ENABLED': True, 'SERVER_TIMING': False, 'TOKEN': None})
+    def test_metrics_without_token(self):
+        self.assertEqual(self.client.get(path='/metrics').status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(path='/metrics').status_code, 200)
+
+    # Метрики объединяются по всем воркерам, метрики завершившихся воркеров сохраняются
+    def test_metrics_workers_aggregated(self):
+        registry.clear()
+        finished = subprocess.Popen(['true'])
+        finished.wait()
+        histogram = Histogram(HISTOGRAMS['django_view_db_queries'][1])
+        histogram.observe(4)
+        worker = MetricsSnapshot({('django_view_db_queries', (('view', 'Other'), ('method', 'GET'))): histogram},
+                                 {'companies': (3, 1)}, workers=1)
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(METRICS={'ENABLED': True, 'SERVER_TIMING': False, 'TOKEN': 'secret',
+                                           'DIR': directory, 'FLUSH_INTERVAL': 1}):
+            MetricsStore.write(Path(directory, f'{os.getppid()}.json'), worker)
+            MetricsStore.write(Path(directory, f'{finished.pid}.json'), worker)
+            self.client.get(path=f'{self.ACTIVITIES_URL}task/get-marks/', data={'options': 'quarter'},
+                            headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+
+            for _ in range(2):
+                content = self.client.get(path='/metrics', headers={'Authorization': 'Bearer secret'}).content.decode()
+                self.assertIn('django_view_db_queries_sum{view="Other",method="GET"} 8', content)
+                self.assertIn('django_view_db_queries_count{view="TaskViewSet.get_marks",method="GET"} 1', content)
+                self.assertIn('django_read_cache_requests_total{cache="companies",result="hit"} 6', content)
+                self.assertIn('django_metrics_workers 2\n', content)
+            self.assertFalse(Path(directory, f'{finished.pid}.json').exists())
+
+    # Средние оценки за произвольный период
+    def test_get_period_marks(self):
+        task = self.test_create_task_1()
+        self.client.post(path=f'{self.ACTIVITIES_URL}task/{task['data']['id']}/estimate-task/',
+                         data=self.data.task_mark_1,
+                         headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}task/get-marks/',
+                                   data=self.data.marks_period,
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['Завершение задачи'], 7.0)
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}task/get-marks/',
+                                   data=self.data.marks_old_period,
+                                   headers={'Authorization': f'Token {self.profile_7.data['token']}'})
+        self.assertEqual(response.data['data']['Завершение задачи'], 0.0)
+
+    # Границы квартала с переходом через год
+    def test_quarter_range(self):
+        start, end = Service.quarter_range(2025, 4)
+        self.assertEqual((start.date(), end.date()), (datetime.date(2025, 10, 1), datetime.date(2026, 1, 1)))
+        self.assertEqual(Service.quarter_of(end), (2026, 1))
+
+    # Выборка оценок за квартал использует индекс по дате, а не EXTRACT по месяцу
+    @skipUnless(connection.vendor == 'postgresql', 'EXPLAIN проверяется только для PostgreSQL')
+    def test_estimations_range_uses_index(self):
+        query = Service.estimations_in_range(*Service.quarter_range(2025, 1))
+        self.assertNotIn('EXTRACT', str(query.query))
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        self.assertIn('estimation_created_at_idx', query.explain())
+
+    # Пересчет квартальных итогов после удаления оцененной задачи
+    def test_rollup_after_task_delete(self):
+        task = self.test_create_task_1()
+        self.client.post(path=f'{self.ACTIVITIES_URL}task/{task['data']['id']}/estimate-task/',
+                         data=self.data.task_mark_1,
+                         headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.client.delete(path=f'{self.ACTIVITIES_URL}task/{task['data']['id']}/',
+                           headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+
+        self.assertFalse(EstimationRollup.objects.exists())
+
+    # Рейтинг сотрудников компании и его обновление после новой оценки
+    def test_leaderboard(self):
+        caches['leaderboard'].clear()
+        company = Company.objects.create(name='Leaderboard', structure=Structure.objects.create(name='Linear'))
+        Profile.objects.update(team=company)
+        task_1, task_2 = self.test_create_task_1(), self.test_create_task_2()
+        self.client.post(path=f'{self.ACTIVITIES_URL}task/{task_1['data']['id']}/estimate-task/',
+                         data=self.data.task_mark_1,
+                         headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}task/leaderboard/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual([(i['rank'], i['name'], i['tasks'], i['average']) for i in response.data['data']],
+                         [(1, self.data.user_2['username'], 1, 4.0)])
+
+        # Повторный запрос обслуживается из кэша (только запрос аутентификации)
+        with self.assertNumQueries(1):
+            self.client.get(path=f'{self.ACTIVITIES_URL}task/leaderboard/',
+                            headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+
+        self.client.post(path=f'{self.ACTIVITIES_URL}task/{task_2['data']['id']}/estimate-task/',
+                         data=self.data.task_mark_2,
+                         headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        response = self.client.get(path=f'{self.ACTIVITIES_URL}task/leaderboard/',
+                                   headers={'Authorization': f'Token {self.profile_6.data['token']}'})
+        self.assertEqual([(i['tasks'], i['average']) for i in response.data['data']], [(2, 5.83)])
+
     # Получение своих оценок
     def test_get_marks(self):
         response = self.client.get(
@@ -170,3 +720,79 @@ class TestActivities(TestCase):
             headers={'Authorization': f'Token {self.profile_6.data['token']}'},
         )
         self.assertEqual(response.status_code, 200)
+
+    # Заполнение БД данными для нагрузочного тестирования и их удаление
+    def test_seed_data(self):
+        call_command('seed_data', companies=2, profiles=10, tasks=40, meetings=6, participants=3,
+                     calendar=20, chunk_size=7, stdout=io.StringIO())
+        seeded = Profile.objects.filter(user__username__startswith='seed_')
+        self.assertEqual(seeded.count(), 10)
+        self.assertEqual(seeded.filter(is_administrator=True).count(), 2)
+        self.assertEqual(Task.objects.filter(assigned_to__in=seeded).count(), 40)
+        self.assertEqual(TaskStatus.objects.filter(task__assigned_to__in=seeded).count(), 40)
+        self.assertEqual(Calendar.objects.filter(owner__in=seeded, kind=CalendarKinds.MEETING).count(), 6 * 4)
+        self.assertEqual(Calendar.objects.filter(owner__in=seeded, kind=CalendarKinds.OTHER).count(), 20)
+        self.assertFalse(Task.objects.filter(assigned_to__in=seeded)
+                         .exclude(assigned_by__team_id=F('assigned_to__team_id')).exists())
+
+        call_command('seed_data', clear=True, stdout=io.StringIO())
+        self.assertFalse(seeded.exists())
+        self.assertFalse(Company.objects.filter(name__startswith='seed ').exists())
+
+
+class TestMeetingBooking(TransactionTestCase):
+    """
+    Одновременное бронирование времени встреч из нескольких потоков (отдельные соединения с БД)
+    """
+    THREADS = 8
+
+    def setUp(self):
+        self.ACTIVITIES_URL = '/api/v1/activities/'
+        self.data = TestActivityData()
+        self.organizer = Client().post(path='/api/v1/accounts/', data=self.data.user_1).data
+        Client().post(path='/api/v1/accounts/', data=self.data.user_2)
+
+    # Запуск запросов из потоков одновременно (после готовности всех потоков)
+    def run_concurrently(self, requests: list) -> list:
+        barrier = threading.Barrier(len(requests))
+
+        def call(request):
+            try:
+                barrier.wait()
+                return request(Client(headers={'Authorization': f'Token {self.organizer['token']}'}))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            return list(executor.map(call, requests))
+
+    # Одновременное создание встреч в одно время: создается только одна встреча
+    def test_concurrent_create_meeting(self):
+        responses = self.run_concurrently([
+            lambda client: client.post(path=f'{self.ACTIVITIES_URL}meeting/', data=self.data.meeting_1)
+            for _ in range(self.THREADS)])
+
+        self.assertEqual(sorted(i.status_code for i in responses), [201] + [400] * (self.THREADS - 1))
+        self.assertEqual({i.data['message'] for i in responses if i.status_code == 400},
+                         {'В это время Вы не сможете провести встречу.'})
+        self.assertEqual(Meeting.objects.count(), 1)
+        self.assertEqual(Calendar.objects.filter(kind=CalendarKinds.MEETING).count(), 1)
+
+    # Одновременное добавление участника к встречам в одно время: участник занят только на одной
+    def test_concurrent_add_participant(self):
+        start = timezone.make_aware(datetime.datetime(2025, 2, 10, 18, 0))
+        meetings = Meeting.objects.bulk_create(Meeting(organizer_id=self.organizer['profile']['id'],
+                                                       start_at=start,
+                                                       end_at=start + datetime.timedelta(minutes=30 + i))
+                                               for i in range(self.THREADS))
+        responses = self.run_concurrently([
+            lambda client, meeting=meeting: client.post(
+                path=f'{self.ACTIVITIES_URL}meeting/{meeting.id}/add-participant/',
+                data={'name': self.data.user_2['username']})
+            for meeting in meetings])
+
+        self.assertEqual(sorted(i.status_code for i in responses), [200] + [400] * (self.THREADS - 1))
+        self.assertEqual(sorted(i.data['data'][0]['status'] for i in responses),
+                         ['ADDED'] + ['BUSY'] * (self.THREADS - 1))
+        self.assertEqual(Meeting.participants.through.objects.count(), 1)
+        self.assertEqual(Calendar.objects.filter(kind=CalendarKinds.MEETING).count(), 1)
@@ -1,6 +1,8 @@
+from django.urls import path
 from rest_framework import routers
 
-from activities.views import NewsViewSet, MeetingViewSet, CalendarViewSet, TaskViewSet
+from activities.views import NewsViewSet, MeetingViewSet, CalendarViewSet, TaskViewSet, NewsFeedView, \
+    CalendarListView
 
 router = routers.DefaultRouter()
 router.register('news', NewsViewSet)
@@ -8,4 +10,9 @@ router.register('meeting', MeetingViewSet)
 router.register('calendar', CalendarViewSet)
 router.register('task', TaskViewSet)
 
-urlpatterns = router.urls
+# Асинхронные обработчики указываются до маршрутов router (news/<pk>/ совпадает с news/feed/)
+urlpatterns = [
+    path('news/feed/', NewsFeedView.as_view()),
+    path('calendar/', CalendarListView.as_view()),
+    *router.urls,
+]
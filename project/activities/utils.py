@@ -1,9 +1,20 @@
 import datetime
+import hashlib
+import itertools
+import time
 
-from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, Max, Sum, F, QuerySet, Window
+from django.db.models.functions import ExtractYear, ExtractQuarter, Rank, Round
+from django.utils import timezone
 
 from accounts.models import Profile
-from activities.models import Meeting, Calendar, Task
+from activities.constants import ParticipantStatuses, CalendarKinds, CalendarPeriods, BulkTaskStatuses, \
+    TaskStatuses
+from activities.models import Meeting, Calendar, Task, TaskStatus, News, TaskEstimation, EstimationRollup, \
+    BUSY_CONSTRAINT
 
 
 class BusyException(Exception):
@@ -19,61 +30,495 @@ class Service:
     Утилиты для проверки корректности запросов и ответов
     """
 
-    # Метод для проверки календаря на свободное время
+    # Метод для проверки календаря на свободное время.
+    # Пересечение интервалов со встречами проверяется одним запросом по индексу (owner, end_at, start_at)
     @staticmethod
-    def is_free(user: User, start_time: datetime, end_time: datetime) -> bool:
-        person = Profile.objects.filter(user=user, user__is_active=True).first()
-        person_calendars = person.calendars
-        if person_calendars.exists():
-            for i in person_calendars.values():
-                if (i['name'].startswith('Встреча')
-                        and (i['end_at'] >= start_time >= i['start_at']
-                             or i['end_at'] >= end_time >= i['start_at'])):
-                    return False
+    def is_free(person: Profile, start_time: datetime, end_time: datetime) -> bool:
+        return not Calendar.objects.filter(owner=person,
+                                           kind=CalendarKinds.MEETING,
+                                           start_at__lt=end_time,
+                                           end_at__gt=start_time).exists()
 
-        return True
+    # Метод для получения границ периода календаря [начало, конец) в текущем часовом поясе
+    @staticmethod
+    def calendar_window(period: str, start: datetime.datetime | None = None,
+                        end: datetime.datetime | None = None) -> tuple[datetime.datetime, datetime.datetime]:
+        if period == CalendarPeriods.CUSTOM:
+            return start, end
+
+        today = timezone.localdate()
+        if period == CalendarPeriods.WEEKLY:
+            first = today - datetime.timedelta(days=today.weekday())
+            last = first + datetime.timedelta(days=7)
+        elif period == CalendarPeriods.MONTHLY:
+            first = today.replace(day=1)
+            last = (first + datetime.timedelta(days=31)).replace(day=1)
+        else:
+            first, last = today, today + datetime.timedelta(days=1)
+        return (timezone.make_aware(datetime.datetime.combine(first, datetime.time.min)),
+                timezone.make_aware(datetime.datetime.combine(last, datetime.time.min)))
+
+    # Метод для получения записей календаря, пересекающихся с периодом (индекс calendar_owner_period_idx)
+    @staticmethod
+    def calendar_entries(person: Profile, start: datetime.datetime, end: datetime.datetime) -> QuerySet:
+        return (Calendar.objects
+                .filter(owner=person, start_at__lt=end, end_at__gt=start)
+                .order_by('start_at', 'id'))
+
+    # Метод для получения записей календаря профиля текущего пользователя (для экспорта)
+    @staticmethod
+    def profile_calendar(request) -> QuerySet:
+        return Calendar.objects.filter(owner=request.user.profile)
+
+    # Метод для получения записей календарей сотрудников компании текущего пользователя (для экспорта)
+    @staticmethod
+    def company_calendar(request) -> QuerySet:
+        team_id = request.user.profile.team_id
+        if team_id is None:
+            return Calendar.objects.none()
+        return Calendar.objects.filter(owner__team_id=team_id)
+
+    # Метод для вычисления ETag календаря. Записи календаря не изменяются, а пересоздаются,
+    # поэтому количества записей и последнего ID достаточно для определения изменений
+    @staticmethod
+    def calendar_etag(entries: QuerySet, scope: str) -> str:
+        state = entries.aggregate(total=Count('id'), last_id=Max('id'))
+        return hashlib.md5(f'{scope}:{state['total']}:{state['last_id']}'.encode()).hexdigest()
+
+    # Метод для вычисления ETag экспорта календаря профиля
+    @staticmethod
+    def profile_calendar_etag(request, *args, **kwargs) -> str:
+        return Service.calendar_etag(Service.profile_calendar(request),
+                                     f'profile-{request.user.profile.id}')
+
+    # Метод для вычисления ETag экспорта календарей компании
+    @staticmethod
+    def company_calendar_etag(request, *args, **kwargs) -> str:
+        return Service.calendar_etag(Service.company_calendar(request),
+                                     f'company-{request.user.profile.team_id}')
+
+    # Метод для экранирования текста в формате iCalendar (RFC 5545)
+    @staticmethod
+    def ics_escape(value: str) -> str:
+        return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+    # Метод для переноса строк iCalendar длиннее 75 байт
+    @staticmethod
+    def ics_fold(line: str) -> str:
+        encoded = line.encode()
+        if len(encoded) <= 75:
+            return f'{line}\r\n'
+        parts, current = [], ''
+        for char in line:
+            if len((current + char).encode()) > (75 if not parts else 74):
+                parts.append(current)
+                current = ''
+            current += char
+        parts.append(current)
+        return '\r\n '.join(parts) + '\r\n'
+
+    # Метод для потоковой генерации iCalendar по записям календаря порциями из БД
+    @staticmethod
+    def ics_stream(entries: QuerySet, title: str, chunk_size: int = 500):
+        def timestamp(moment: datetime.datetime) -> str:
+            return moment.astimezone(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+        stamp = timestamp(timezone.now())
+        yield ''.join(Service.ics_fold(i) for i in (
+            'BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Business Management App//Calendar//RU',
+            'CALSCALE:GREGORIAN', 'METHOD:PUBLISH', f'X-WR-CALNAME:{Service.ics_escape(title)}'))
+
+        rows = (entries.order_by('id')
+                .values_list('id', 'name', 'kind', 'start_at', 'end_at', 'owner__user__username')
+                .iterator(chunk_size=chunk_size))
+        for batch in itertools.batched(rows, chunk_size):
+            yield ''.join(
+                ''.join(Service.ics_fold(i) for i in (
+                    'BEGIN:VEVENT',
+                    f'UID:calendar-{entry_id}@business-management-app',
+                    f'DTSTAMP:{stamp}',
+                    f'DTSTART:{timestamp(start_at)}',
+                    f'DTEND:{timestamp(end_at)}',
+                    f'SUMMARY:{Service.ics_escape(name)}',
+                    f'CATEGORIES:{kind}',
+                    f'ORGANIZER;CN={Service.ics_escape(username)}:noreply@business-management-app',
+                    'END:VEVENT'))
+                for entry_id, name, kind, start_at, end_at, username in batch)
+        yield 'END:VCALENDAR\r\n'
+
+    # Метод для поиска общих свободных интервалов для встречи.
+    # Занятые интервалы всех участников загружаются одним запросом и обходятся
+    # по возрастанию начала (sweep-line), граница занятости сдвигается по сетке granularity
+    @staticmethod
+    def find_free_slots(profiles: list[int], window_start: datetime, window_end: datetime,
+                        duration: datetime.timedelta, granularity: datetime.timedelta,
+                        limit: int) -> list[tuple[datetime, datetime]]:
+        busy = (Calendar.objects.filter(owner_id__in=profiles,
+                                        kind=CalendarKinds.MEETING,
+                                        start_at__lt=window_end,
+                                        end_at__gt=window_start)
+                .order_by('start_at')
+                .values_list('start_at', 'end_at'))
+
+        slots = []
+        candidate = window_start
+        # Потоковое чтение интервалов: обход прекращается после нахождения limit вариантов
+        for start_at, end_at in itertools.chain(busy.iterator(chunk_size=500),
+                                                ((window_end, window_end),)):
+            # Свободные варианты до начала очередного занятого интервала
+            while candidate + duration <= min(start_at, window_end) and len(slots) < limit:
+                slots.append((candidate, candidate + duration))
+                candidate += granularity
+
+            if len(slots) >= limit:
+                break
+
+            # Следующий вариант - после окончания занятого интервала с выравниванием вверх по сетке
+            if end_at > candidate:
+                candidate = window_start - (window_start - end_at) // granularity * granularity
+
+        return slots
+
+    # Получение списка имен участников из запроса (names - список или name - одно имя)
+    @staticmethod
+    def get_participant_names(data: dict) -> list[str]:
+        if hasattr(data, 'getlist'):
+            names = data.getlist('names') or data.getlist('name')
+        else:
+            names = data.get('names') or [data['name']]
+        if isinstance(names, str):
+            names = [names]
+        if not names or not all(isinstance(i, str) for i in names):
+            raise ValueError('Participant names must be a list of strings')
+        return list(dict.fromkeys(names))
+
+    # Метод для проверки, что ошибка записи вызвана пересечением встреч владельца календаря
+    @staticmethod
+    def is_busy_error(error: IntegrityError) -> bool:
+        return getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None) == BUSY_CONSTRAINT
+
+    # Метод для получения записи о занятом встречей периоде времени в календаре владельца
+    @staticmethod
+    def meeting_calendar(meeting: Meeting, owner: Profile) -> Calendar:
+        return Calendar(name=f'Встреча {meeting.id}',
+                        kind=CalendarKinds.MEETING,
+                        meeting=meeting,
+                        owner=owner,
+                        start_at=meeting.start_at,
+                        end_at=meeting.end_at)
+
+    # Метод для бронирования времени встречи в календарях владельцев.
+    # Занятость проверяет ограничение БД при вставке: записи вставляются одним запросом,
+    # а при пересечении со встречами - по одной, чтобы отклонить только занятых владельцев.
+    # Владельцы упорядочены по ID, чтобы одновременные бронирования ожидали друг друга без взаимных блокировок
+    @staticmethod
+    def book_calendars(meeting: Meeting, owners: list[Profile]) -> list[Profile]:
+        owners = sorted(owners, key=lambda i: i.id)
+        try:
+            with transaction.atomic():
+                Calendar.objects.bulk_create(Service.meeting_calendar(meeting, i) for i in owners)
+            return owners
+        except IntegrityError as error:
+            if not Service.is_busy_error(error):
+                raise
+
+        booked = []
+        for owner in owners:
+            try:
+                with transaction.atomic():
+                    Service.meeting_calendar(meeting, owner).save()
+                booked.append(owner)
+            except IntegrityError as error:
+                if not Service.is_busy_error(error):
+                    raise
+        return booked
+
+    # Метод для создания встречи с записью в календаре организатора одной транзакцией.
+    # Пересечение с другими встречами организатора отменяет создание встречи
+    @staticmethod
+    def create_meeting(organizer: Profile, data: dict) -> Meeting:
+        try:
+            with transaction.atomic():
+                meeting = Meeting.objects.create(organizer=organizer, **data)
+                Service.meeting_calendar(meeting, organizer).save()
+        except IntegrityError as error:
+            if not Service.is_busy_error(error):
+                raise
+            raise BusyException('Time spot is busy issue') from error
+        return meeting
+
+    # Метод для добавления участников встречи.
+    # Принадлежность к команде проверяется для всех участников сразу,
+    # занятость - ограничением БД при добавлении записей в календари одной транзакцией
+    @staticmethod
+    def add_participants(meeting: Meeting, organizer: Profile, names: list[str]) -> dict[str, str]:
+        profiles = {i.user.username: i for i in (Profile.objects
+                                                 .filter(user__username__in=names, user__is_active=True)
+                                                 .select_related('user'))}
+        joined = set(meeting.participants.filter(id__in=[i.id for i in profiles.values()])
+                     .values_list('id', flat=True))
+
+        results = {}
+        for name in names:
+            participant = profiles.get(name)
+            if participant is None:
+                results[name] = ParticipantStatuses.NOT_FOUND
+            elif participant.team_id != organizer.team_id:
+                results[name] = ParticipantStatuses.ALIEN
+            elif participant.id in joined:
+                results[name] = ParticipantStatuses.ALREADY_PARTICIPANT
+            else:
+                results[name] = ParticipantStatuses.ADDED
+
+        with transaction.atomic():
+            booked = Service.book_calendars(meeting, [profiles[name] for name, result in results.items()
+                                                      if result == ParticipantStatuses.ADDED])
+            meeting.participants.add(*booked)
 
-    # Метод для очистки календаря при отмене собраний
+        booked = {i.id for i in booked}
+        for name, result in results.items():
+            if result == ParticipantStatuses.ADDED and profiles[name].id not in booked:
+                results[name] = ParticipantStatuses.BUSY
+
+        return results
+
+    # Метод для проверки участников встречи одним запросом.
+    # Возвращает ID профилей, которые не найдены или не состоят в команде организатора
     @staticmethod
-    def clear_calendar(meeting_id: int) -> None:
-        participants = Profile.objects.filter(participated_meetings=meeting_id)
-        organizer = Meeting.objects.get(id=meeting_id).organizer
-        staff = [i.id for i in participants]
-        staff.append(organizer.id)
-        calendars = Calendar.objects.filter(owner_id__in=staff, name=f'Встреча {meeting_id}')
-        calendars.delete()
+    def foreign_participants(organizer: Profile, profile_ids: list[int]) -> list[int]:
+        members = set(Profile.objects
+                      .filter(id__in=profile_ids, team_id=organizer.team_id, user__is_active=True)
+                      .values_list('id', flat=True))
+        return sorted(set(profile_ids) - members)
+
+    # Метод для удаления участников встречи с очисткой их календарей
+    @staticmethod
+    def remove_participants(meeting: Meeting, names: list[str]) -> dict[str, str]:
+        profiles = {i.user.username: i for i in (Profile.objects
+                                                 .filter(user__username__in=names, user__is_active=True)
+                                                 .select_related('user'))}
+        joined = set(meeting.participants.filter(id__in=[i.id for i in profiles.values()])
+                     .values_list('id', flat=True))
+
+        results = {}
+        for name in names:
+            participant = profiles.get(name)
+            if participant is None:
+                results[name] = ParticipantStatuses.NOT_FOUND
+            elif participant.id not in joined:
+                results[name] = ParticipantStatuses.NOT_PARTICIPANT
+            else:
+                results[name] = ParticipantStatuses.REMOVED
+
+        removed = [profiles[name] for name, result in results.items() if result == ParticipantStatuses.REMOVED]
+        with transaction.atomic():
+            meeting.participants.remove(*removed)
+            # Удаление записей о занятом периоде времени из календарей участников
+            Calendar.objects.filter(meeting=meeting, owner__in=removed).delete()
+
+        return results
+
+    # Метод для пакетного создания задач.
+    # Исполнители и существующие задачи проверяются для всего пакета сразу,
+    # задачи, записи календаря и статусы создаются одной транзакцией
+    @staticmethod
+    def create_tasks(assignor: Profile, items: list[dict]) -> list[dict]:
+        executors = dict(Profile.objects
+                         .filter(id__in={i['assigned_to'] for i in items}, user__is_active=True)
+                         .values_list('id', 'team_id'))
+        existing = set(Task.objects
+                       .filter(assigned_to_id__in=executors.keys(), name__in={i['name'] for i in items})
+                       .values_list('name', 'assigned_to_id'))
+        now = timezone.now()
+
+        results, tasks, seen = [], [], set()
+        for index, item in enumerate(items):
+            key = (item['name'], item['assigned_to'])
+            if item['assigned_to'] not in executors:
+                result = BulkTaskStatuses.NOT_FOUND
+            elif executors[item['assigned_to']] != assignor.team_id:
+                result = BulkTaskStatuses.ALIEN
+            elif key in seen:
+                result = BulkTaskStatuses.DUPLICATE
+            elif key in existing:
+                result = BulkTaskStatuses.EXISTS
+            elif item['deadline'] <= now:
+                result = BulkTaskStatuses.PAST_DEADLINE
+            else:
+                result = BulkTaskStatuses.CREATED
+                seen.add(key)
+                tasks.append(Task(name=item['name'], assigned_by=assignor,
+                                  assigned_to_id=item['assigned_to'], deadline=item['deadline']))
+            results.append({'index': index, 'id': None, 'name': item['name'],
+                            'assigned_to': item['assigned_to'], 'status': result})
+
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(tasks)
+            # Добавление записей о времени выполнения задач в календари исполнителей
+            Calendar.objects.bulk_create(Calendar(name=f'Задача {task.id}',
+                                                  kind=CalendarKinds.TASK,
+                                                  task=task,
+                                                  owner_id=task.assigned_to_id,
+                                                  start_at=task.created_at,
+                                                  end_at=task.deadline) for task in tasks)
+            TaskStatus.objects.bulk_create(TaskStatus(task=task, status=TaskStatuses.PENDING) for task in tasks)
+
+        created = iter(tasks)
+        for result in results:
+            if result['status'] == BulkTaskStatuses.CREATED:
+                result['id'] = next(created).id
+        return results
 
     # Метод для проверки сотрудника на принадлежность к компании организатора
     @staticmethod
-    def is_same_team(organizer: User, staff: User) -> bool:
-        organizer = Profile.objects.filter(user=organizer, user__is_active=True).first()
-        staff = Profile.objects.filter(user=staff, user__is_active=True).first()
-        return organizer.team == staff.team
+    def is_same_team(organizer: Profile, staff: Profile) -> bool:
+        return organizer.team_id == staff.team_id
 
     # Метод для проверки сотрудника на принадлежность к выполнению задачи
     @staticmethod
-    def is_task_executor(task_id: int, user: User) -> bool:
-        executor = Profile.objects.filter(user=user, user__is_active=True).first()
+    def is_task_executor(task_id: int, executor: Profile) -> bool:
         task = Task.objects.get(id=task_id)
-        return task.assigned_to == executor
+        return task.assigned_to_id == executor.id
 
     # Метод для проверки начальника на принадлежность к назначению задачи
     @staticmethod
-    def is_task_assignor(task_id: int, user: User) -> bool:
-        assignor = Profile.objects.filter(user=user, user__is_active=True).first()
+    def is_task_assignor(task_id: int, assignor: Profile) -> bool:
         task = Task.objects.get(id=task_id)
-        return task.assigned_by == assignor
-
-    # Метод для определения текущего квартала
-    @staticmethod
-    def determine_quarter() -> tuple[int, int]:
-        this_month = datetime.date.today().month
-        if 1 <= this_month <= 3:
-            quarter = (1, 3)
-        elif 4 <= this_month <= 6:
-            quarter = (4, 6)
-        elif 7 <= this_month <= 9:
-            quarter = (7, 9)
-        else:
-            quarter = (10, 12)
-        return quarter
+        return task.assigned_by_id == assignor.id
+
+    # Метод для определения года и квартала даты (в текущем часовом поясе)
+    @staticmethod
+    def quarter_of(moment: datetime.datetime) -> tuple[int, int]:
+        moment = timezone.localtime(moment)
+        return moment.year, (moment.month - 1) // 3 + 1
+
+    # Метод для получения границ квартала [начало, конец) в текущем часовом поясе
+    @staticmethod
+    def quarter_range(year: int, quarter: int) -> tuple[datetime.datetime, datetime.datetime]:
+        start = datetime.datetime(year, 3 * (quarter - 1) + 1, 1)
+        end = datetime.datetime(year + quarter // 4, 3 * quarter % 12 + 1, 1)
+        return timezone.make_aware(start), timezone.make_aware(end)
+
+    # Метод для получения оценок, выставленных в интервале [начало, конец) (индекс estimation_created_at_idx)
+    @staticmethod
+    def estimations_in_range(start: datetime.datetime, end: datetime.datetime) -> QuerySet:
+        return TaskEstimation.objects.filter(created_at__gte=start, created_at__lt=end)
+
+    # Метод для получения средних оценок исполнителя за произвольный период
+    @staticmethod
+    def average_marks_in_period(person: Profile, start: datetime.datetime,
+                                end: datetime.datetime) -> dict[str, float]:
+        result = (Service.estimations_in_range(start, end)
+                  .filter(task__assigned_to=person)
+                  .aggregate(deadline_meeting=Round(Avg('deadline_meeting', default=0), 2),
+                             completeness=Round(Avg('completeness', default=0), 2),
+                             quality=Round(Avg('quality', default=0), 2)))
+        return {key: float(value) for key, value in result.items()}
+
+    # Метод для учета новой оценки в квартальных итогах исполнителя
+    @staticmethod
+    def add_estimation_to_rollup(estimation: TaskEstimation) -> None:
+        profile_id, team_id = (Task.objects.values_list('assigned_to_id', 'assigned_to__team_id')
+                               .get(id=estimation.task_id))
+        Service.invalidate_leaderboards([team_id])
+        year, quarter = Service.quarter_of(estimation.created_at)
+        rollup, _ = EstimationRollup.objects.get_or_create(profile_id=profile_id, year=year,
+                                                           quarter=quarter)
+        EstimationRollup.objects.filter(id=rollup.id).update(
+            count=F('count') + 1,
+            deadline_meeting_sum=F('deadline_meeting_sum') + estimation.deadline_meeting,
+            completeness_sum=F('completeness_sum') + estimation.completeness,
+            quality_sum=F('quality_sum') + estimation.quality,
+        )
+
+    # Метод для пересчета квартальных итогов по истории оценок (всех или указанных профилей)
+    @staticmethod
+    def rebuild_rollups(profile_ids: list[int] | None = None) -> int:
+        estimations = TaskEstimation.objects.all()
+        rollups = EstimationRollup.objects.all()
+        if profile_ids is not None:
+            estimations = estimations.filter(task__assigned_to_id__in=profile_ids)
+            rollups = rollups.filter(profile_id__in=profile_ids)
+
+        rows = (estimations
+                .values(profile_id=F('task__assigned_to_id'),
+                        year=ExtractYear('created_at'),
+                        quarter=ExtractQuarter('created_at'))
+                .annotate(count=Count('id'),
+                          deadline_meeting_sum=Sum('deadline_meeting'),
+                          completeness_sum=Sum('completeness'),
+                          quality_sum=Sum('quality'))
+                .order_by())
+        with transaction.atomic():
+            rollups.delete()
+            created = EstimationRollup.objects.bulk_create((EstimationRollup(**i) for i in rows),
+                                                           batch_size=1000)
+        if profile_ids is not None:
+            Service.invalidate_leaderboards(Profile.objects.filter(id__in=profile_ids)
+                                            .values_list('team_id', flat=True))
+        return len(created)
+
+    # Метод для получения рейтинга сотрудников компании за квартал одним групповым запросом.
+    # Результат кэшируется по (компания, год, квартал) до новой оценки в компании
+    # в общем для воркеров кэше leaderboard
+    @staticmethod
+    def get_leaderboard(company_id: int, year: int, quarter: int) -> list[dict]:
+        cache = caches['leaderboard']
+        version = cache.get_or_set(f'leaderboard-version:{company_id}', time.time_ns, None)
+        key = f'leaderboard:{company_id}:{version}:{year}:{quarter}'
+        leaderboard = cache.get(key)
+        if leaderboard is not None:
+            return leaderboard
+
+        start, end = Service.quarter_range(year, quarter)
+        average = (Avg('deadline_meeting') + Avg('completeness') + Avg('quality')) / 3
+        leaderboard = list(
+            Service.estimations_in_range(start, end)
+            .filter(task__assigned_to__team_id=company_id)
+            .values(profile_id=F('task__assigned_to_id'), name=F('task__assigned_to__user__username'))
+            .annotate(tasks=Count('id'),
+                      deadline_meeting_avg=Round(Avg('deadline_meeting'), 2),
+                      completeness_avg=Round(Avg('completeness'), 2),
+                      quality_avg=Round(Avg('quality'), 2),
+                      average=Round(average, 2),
+                      rank=Window(Rank(), order_by=average.desc()))
+            .order_by('rank', 'name')
+        )
+        cache.set(key, leaderboard, settings.LEADERBOARD_CACHE_TTL)
+        return leaderboard
+
+    # Метод для сброса кэша рейтингов компаний (сразу и после фиксации транзакции)
+    @staticmethod
+    def invalidate_leaderboards(company_ids) -> None:
+        keys = [f'leaderboard-version:{i}' for i in set(company_ids) if i is not None]
+
+        def bump():
+            caches['leaderboard'].set_many({key: time.time_ns() for key in keys}, None)
+
+        if keys:
+            bump()
+            transaction.on_commit(bump)
+
+    # Метод для получения средних оценок по квартальным итогам
+    @staticmethod
+    def average_marks(rollups: QuerySet) -> dict[str, float]:
+        result = rollups.aggregate(count=Sum('count'),
+                                   deadline_meeting=Sum('deadline_meeting_sum'),
+                                   completeness=Sum('completeness_sum'),
+                                   quality=Sum('quality_sum'))
+        count = result.pop('count')
+        return {key: round(value / count, 2) if count else 0 for key, value in result.items()}
+
+    # Метод для получения состояния ленты новостей одним агрегирующим запросом
+    @staticmethod
+    async def news_feed_state() -> dict:
+        return await News.objects.aaggregate(last_id=Max('id'),
+                                             last_created_at=Max('created_at'),
+                                             total=Count('id'))
+
+    # Метод для вычисления ETag ленты новостей с учетом параметров страницы
+    @staticmethod
+    def news_feed_etag(state: dict, path: str) -> str:
+        value = f'{state['last_id']}:{state['last_created_at']}:{state['total']}:{path}'
+        return hashlib.md5(value.encode()).hexdigest()
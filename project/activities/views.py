@@ -1,25 +1,43 @@
 import datetime
 from http import HTTPMethod
 
-from django.contrib.auth.models import User
+from asgiref.sync import sync_to_async
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Avg
-from django.db.models.functions import Round
+from django.db import transaction
+from django.db.models import Prefetch, Q, QuerySet
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter, OpenApiResponse
-from rest_framework import viewsets, status
+from rest_framework import generics, mixins, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from accounts.models import Profile
 from accounts.serializers import Error400Response, Error404Response, SuccessResponse
-from activities.models import News, Meeting, Calendar, Task, TaskStatus, TaskEstimation
+from activities.constants import ParticipantStatuses, CalendarKinds, CalendarPeriods, BulkTaskStatuses
+from activities.models import News, Meeting, Calendar, Task, TaskStatus, TaskEstimation, EstimationRollup
+from activities.renderers import ICSRenderer
 from activities.serializers import NewsSerializer, MeetingSerializer, CalendarSerializer, TaskSerializer, \
     TaskStatusSerializer, TaskEstimationSerializer, SuccessResponseWithStatus, SuccessResponseWithMark, \
-    SuccessResponseWithNews, SuccessResponseWithMeeting, SuccessResponseWithMarks
+    SuccessResponseWithNews, SuccessResponseWithMeeting, SuccessResponseWithMarks, FindSlotSerializer, \
+    SlotSerializer, SuccessResponseWithSlots, ParticipantResultSerializer, SuccessResponseWithParticipants, \
+    QuarterSerializer, LeaderboardSerializer, SuccessResponseWithLeaderboard, MarksQuerySerializer, \
+    CalendarPeriodSerializer, BulkTaskSerializer, BulkTaskResultSerializer, SuccessResponseWithBulkTasks, \
+    MeetingFilterSerializer
 from activities.utils import Service, BusyException, AlienException
+from core.pagination import NewestCursorPagination, DeadlineCursorPagination, FeedCursorPagination, \
+    MeetingCursorPagination
+from core.responses import ChunkedStreamingHttpResponse
+from core.views import AsyncAPIView
 
 
 @extend_schema(tags=['News'])
@@ -29,7 +47,8 @@ class NewsViewSet(viewsets.ModelViewSet, ):
     Доступно только администраторам.
     """
     serializer_class = NewsSerializer
-    queryset = News.objects.all()
+    queryset = News.objects.select_related('author__user')
+    pagination_class = NewestCursorPagination
     permission_classes = [IsAdminUser, ]
     # Разрешенные методы класса
     http_method_names = ['head', 'options', 'get', 'post', ]
@@ -72,8 +91,7 @@ class NewsViewSet(viewsets.ModelViewSet, ):
             serializer = self.serializer_class(data=request.data)
             serializer.is_valid(raise_exception=True)
             news = News(**serializer.validated_data)
-            news.author = Profile.objects.filter(user=request.user,
-                                                 user__is_active=True).first()
+            news.author = request.user.profile
             news.save()
             result = self.serializer_class(news, many=False)
 
@@ -87,6 +105,114 @@ class NewsViewSet(viewsets.ModelViewSet, ):
                             status=status.HTTP_400_BAD_REQUEST, )
 
 
+@extend_schema(tags=['News'])
+class NewsFeedSchemaView(generics.ListAPIView):
+    """
+    Описание асинхронной ленты новостей (NewsFeedView) для схемы OpenAPI
+    """
+    serializer_class = NewsSerializer
+    queryset = News.objects.none()
+    pagination_class = FeedCursorPagination
+
+    # Получение ленты новостей с поддержкой условных запросов (ETag/Last-Modified)
+    @extend_schema(summary='Получение ленты новостей',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=NewsSerializer(many=True),
+                           description='Успешное получение ленты новостей'
+                       ),
+                       status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+                           description='Лента не изменилась с последнего запроса'
+                       ),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='If-None-Match',
+                           location=OpenApiParameter.HEADER,
+                           description='ETag из предыдущего ответа',
+                           required=False,
+                           type=str
+                       ),
+                       OpenApiParameter(
+                           name='If-Modified-Since',
+                           location=OpenApiParameter.HEADER,
+                           description='Last-Modified из предыдущего ответа',
+                           required=False,
+                           type=str
+                       ),
+                   ],
+                   )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class NewsFeedView(AsyncAPIView):
+    """
+    Асинхронная лента новостей с курсорной пагинацией по дате создания.
+    Поддерживает условные запросы (ETag/Last-Modified): при неизменной ленте
+    ответ 304 формируется одним агрегирующим запросом
+    """
+    schema_view = NewsFeedSchemaView
+
+    async def get(self, request, *args, **kwargs) -> HttpResponse:
+        state = await Service.news_feed_state()
+        etag = quote_etag(Service.news_feed_etag(state, request.get_full_path()))
+        last_modified = state['last_created_at'] and int(state['last_created_at'].timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            paginator = FeedCursorPagination()
+            # Пагинатор DRF синхронный, запрос страницы выполняется так же, как в async ORM Django
+            page = await sync_to_async(paginator.paginate_queryset)(News.objects.select_related('author__user'),
+                                                                    Request(request))
+            response = self.render(paginator.get_paginated_response(NewsSerializer(page, many=True).data).data)
+
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+# Параметры фильтрации списка встреч
+MEETING_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name='from',
+        location=OpenApiParameter.QUERY,
+        description='Начало периода времени начала встречи (включительно)',
+        required=False,
+        type=datetime.datetime
+    ),
+    OpenApiParameter(
+        name='to',
+        location=OpenApiParameter.QUERY,
+        description='Конец периода времени начала встречи (не включительно)',
+        required=False,
+        type=datetime.datetime
+    ),
+    OpenApiParameter(
+        name='organizer',
+        location=OpenApiParameter.QUERY,
+        description='ID профиля организатора',
+        required=False,
+        type=int
+    ),
+    OpenApiParameter(
+        name='participant',
+        location=OpenApiParameter.QUERY,
+        description='ID профиля участника',
+        required=False,
+        type=int
+    ),
+    OpenApiParameter(
+        name='page_size',
+        location=OpenApiParameter.QUERY,
+        description='Количество встреч на странице',
+        required=False,
+        type=int
+    ),
+]
+
+
 @extend_schema(tags=['Meeting'])
 class MeetingViewSet(viewsets.ModelViewSet, Service):
     """
@@ -94,7 +220,10 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
     Доступно только администраторам.
     """
     serializer_class = MeetingSerializer
-    queryset = Meeting.objects.all()
+    # Организатор загружается вместе со встречей, участники - одним запросом на страницу
+    queryset = Meeting.objects.select_related('organizer__user').prefetch_related(
+        Prefetch('participants', queryset=Profile.objects.only('id')))
+    pagination_class = MeetingCursorPagination
     permission_classes = [IsAdminUser, ]
     # Разрешенные методы класса
     http_method_names = ['head', 'options', 'get', 'post', 'delete']
@@ -114,10 +243,52 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
     def retrieve(self, request: Request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
-    # Метод для получения списка встреч.
-    @extend_schema(summary='Получение списка встреч', )
+    # Метод для получения списка встреч по времени начала с фильтрами по периоду, организатору и участнику.
+    @extend_schema(summary='Получение списка встреч',
+                   parameters=MEETING_FILTER_PARAMETERS,
+                   )
     def list(self, request: Request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.list_meetings(request, self.get_queryset())
+
+    # Встречи текущего сотрудника (организатор или участник) без прав администратора
+    @extend_schema(summary='Получение списка своих встреч',
+                   parameters=[i for i in MEETING_FILTER_PARAMETERS if i.name in ('from', 'to', 'page_size')],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=False, url_path='my',
+            permission_classes=[IsAuthenticated, ])
+    def my(self, request: Request, *args, **kwargs):
+        profile = request.user.profile
+        participated = Meeting.participants.through.objects.filter(profile=profile).values('meeting_id')
+        return self.list_meetings(request, self.get_queryset().filter(Q(organizer=profile)
+                                                                      | Q(id__in=participated)),
+                                  ('from', 'to'))
+
+    # Метод для получения страницы встреч с фильтрами из параметров запроса (allowed - допустимые фильтры)
+    def list_meetings(self, request: Request, query: QuerySet, allowed: tuple | None = None) -> Response:
+        filters = MeetingFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response({'message': f'Некорректные параметры фильтрации.'
+                                        f'Детали ошибки: {filters.errors}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        values = {key: value for key, value in filters.validated_data.items() if allowed is None or key in allowed}
+        page = self.paginate_queryset(self.filter_meetings(query, values))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    # Метод для фильтрации встреч по переданным параметрам
+    @staticmethod
+    def filter_meetings(query: QuerySet, filters: dict) -> QuerySet:
+        if 'from' in filters:
+            query = query.filter(start_at__gte=filters['from'])
+        if 'to' in filters:
+            query = query.filter(start_at__lt=filters['to'])
+        if 'organizer' in filters:
+            query = query.filter(organizer_id=filters['organizer'])
+        # Подзапрос к промежуточной таблице не требует соединения со всеми встречами
+        if 'participant' in filters:
+            query = query.filter(id__in=(Meeting.participants.through.objects
+                                         .filter(profile_id=filters['participant']).values('meeting_id')))
+        return query
 
     # Создание встречи
     @extend_schema(summary='Создание встречи',
@@ -137,21 +308,9 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
             serializer = self.serializer_class(data=request.data)
             serializer.is_valid(raise_exception=True)
 
-            # Проверка на занятость руководителя в указанные даты встречи
-            if not self.is_free(request.user, serializer.validated_data['start_at'],
-                                serializer.validated_data['end_at']):
-                raise BusyException('Time spot is busy issue')
-
-            meeting = Meeting(**serializer.validated_data)
-            meeting.organizer = (Profile.objects.filter(user=request.user, user__is_active=True)
-                                 .first())
-            meeting.save()
-
-            # Добавление записи о занятом периоде времени в календарь
-            Calendar.objects.create(name=f'Встреча {meeting.id}',
-                                    owner=Profile.objects.get(user=request.user),
-                                    start_at=meeting.start_at,
-                                    end_at=meeting.end_at)
+            # Встреча создается вместе с записью в календаре организатора,
+            # пересечение с его встречами отклоняет ограничение БД (BusyException)
+            meeting = self.create_meeting(request.user.profile, serializer.validated_data)
 
             result = self.serializer_class(meeting, many=False)
 
@@ -193,9 +352,9 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
                    )
     def destroy(self, request: Request, *args, **kwargs) -> Response:
         try:
-            # Очистка занятой встречей записи в календаре
-            self.clear_calendar(kwargs.get('pk'))
-            super().destroy(request, *args, **kwargs)
+            # Записи о встрече в календарях участников удаляются каскадно
+            meeting = Meeting.objects.get(id=kwargs.get('pk'))
+            meeting.delete()
 
             return Response({'message': 'Успешная отмена встречи.'},
                             status=status.HTTP_200_OK, )
@@ -212,13 +371,17 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
     @extend_schema(summary='Добавление участников встречи',
                    responses={
                        status.HTTP_200_OK: OpenApiResponse(
-                           response=SuccessResponse,
+                           response=SuccessResponseWithParticipants,
                            description='Успешное добавление участников встречи',
                            examples=[OpenApiExample(
                                name='Participants adding response',
-                               description='Пример ответа после добавления участника встречи',
+                               description='Пример ответа после добавления участников встречи',
                                value={
-                                   'message': 'Успешное добавление участника к встрече'
+                                   'message': 'Добавлено участников к встрече № 1: 1 из 2.',
+                                   'data': [{'name': 'Имя участника 1', 'status': 'ADDED',
+                                             'detail': 'Добавлен к встрече'},
+                                            {'name': 'Имя участника 2', 'status': 'BUSY',
+                                             'detail': 'Занят в это время'}]
                                },
                            )
                            ],
@@ -242,6 +405,13 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
                    examples=[
                        OpenApiExample(
                            name='Participants adding',
+                           description='Пример вводимых имен участников встречи',
+                           value={
+                               'names': ['Имя участника 1', 'Имя участника 2'],
+                           },
+                       ),
+                       OpenApiExample(
+                           name='Participant adding',
                            description='Пример вводимого имени участника встречи',
                            value={
                                'name': 'Имя участника',
@@ -253,43 +423,32 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
             permission_classes=[IsAdminUser, ])
     def add_participant(self, request: Request, *args, **kwargs) -> Response:
         try:
-            user = User.objects.get(username=request.data['name'])
-            participant = Profile.objects.filter(user=user, user__is_active=True).first()
+            names = self.get_participant_names(request.data)
             meeting = Meeting.objects.get(id=kwargs.get('pk'))
 
-            # Проверка на принадлежность к одной команде руководителя и исполнителя
-            if not self.is_same_team(request.user, user):
-                raise AlienException('Not the same company members issue')
+            # Проверка принадлежности к команде и занятости всех участников с добавлением свободных
+            results = self.add_participants(meeting, request.user.profile, names)
+            added = [i for i in results.values() if i == ParticipantStatuses.ADDED]
+            result = ParticipantResultSerializer(
+                [{'name': name, 'status': value} for name, value in results.items()], many=True)
 
-            # Проверка на занятость исполнителя в указанные даты встречи
-            if not self.is_free(user, meeting.start_at, meeting.end_at):
-                raise BusyException('Time spot is busy issue')
-
-            meeting.participants.add(participant)
-            meeting.save()
-
-            # Добавление записи о занятом периоде времени в календарь
-            Calendar.objects.create(name=f'Встреча {meeting.id}',
-                                    owner=participant,
-                                    start_at=meeting.start_at,
-                                    end_at=meeting.end_at)
+            if added:
+                response_status = status.HTTP_200_OK
+            elif all(i == ParticipantStatuses.NOT_FOUND for i in results.values()):
+                response_status = status.HTTP_404_NOT_FOUND
+            else:
+                response_status = status.HTTP_400_BAD_REQUEST
 
-            return Response({'message': f'Успешное добавление участника {participant}'
-                                        f' к встрече № {kwargs.get('pk')}.'
-                             }, status=status.HTTP_200_OK, )
+            return Response({'message': f'Добавлено участников к встрече № {kwargs.get('pk')}: '
+                                        f'{len(added)} из {len(results)}.',
+                             'data': result.data
+                             }, status=response_status, )
 
-        except AlienException:
-            return Response({'message': 'Ошибка добавления участника встречи.'
-                                        'Участник встречи - сотрудник другой компании.'},
-                            status=status.HTTP_400_BAD_REQUEST, )
-        except BusyException:
-            return Response({'message': 'В это время участник будет занят.'},
-                            status=status.HTTP_400_BAD_REQUEST, )
         except ObjectDoesNotExist:
-            return Response({'message': 'Ошибка добавления участника встречи. Неверный ID встречи или имя участника.'},
+            return Response({'message': 'Ошибка добавления участников встречи. Неверный ID встречи.'},
                             status=status.HTTP_404_NOT_FOUND, )
         except Exception as error:
-            return Response({'message': f'Ошибка добавления участника встречи.'
+            return Response({'message': f'Ошибка добавления участников встречи.'
                                         f'Детали ошибки: {error}.'},
                             status=status.HTTP_400_BAD_REQUEST, )
 
@@ -297,7 +456,7 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
     @extend_schema(summary='Удаление участников встречи',
                    responses={
                        status.HTTP_200_OK: OpenApiResponse(
-                           response=SuccessResponse,
+                           response=SuccessResponseWithParticipants,
                            description='Успешное удаление участников встречи',
                        ),
                        status.HTTP_404_NOT_FOUND: OpenApiResponse(
@@ -319,6 +478,13 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
                    examples=[
                        OpenApiExample(
                            name='Participants deletion',
+                           description='Пример вводимых имен участников встречи',
+                           value={
+                               'names': ['Имя участника 1', 'Имя участника 2'],
+                           },
+                       ),
+                       OpenApiExample(
+                           name='Participant deletion',
                            description='Пример вводимого имени участника встречи',
                            value={
                                'name': 'Имя участника',
@@ -330,38 +496,126 @@ class MeetingViewSet(viewsets.ModelViewSet, Service):
             permission_classes=[IsAdminUser, ])
     def delete_participant(self, request: Request, *args, **kwargs) -> Response:
         try:
-            user = User.objects.get(username=request.data['name'])
-            participant = Profile.objects.filter(user=user, user__is_active=True).first()
+            names = self.get_participant_names(request.data)
             meeting = Meeting.objects.get(id=kwargs.get('pk'))
 
-            meeting.participants.remove(participant)
-            meeting.save()
-
-            # Удаление записи о занятом периоде времени из календаря
-            calendar = Calendar.objects.get(name=f'Встреча {meeting.id}',
-                                            owner=participant,
-                                            start_at=meeting.start_at,
-                                            end_at=meeting.end_at)
+            results = self.remove_participants(meeting, names)
+            removed = [i for i in results.values() if i == ParticipantStatuses.REMOVED]
+            result = ParticipantResultSerializer(
+                [{'name': name, 'status': value} for name, value in results.items()], many=True)
 
-            calendar.delete()
-
-            return Response({'message': f'Успешное удаление участника {participant}'
-                                        f' из встречи № {kwargs.get('pk')}.'
-                             }, status=status.HTTP_200_OK, )
+            return Response({'message': f'Удалено участников из встречи № {kwargs.get('pk')}: '
+                                        f'{len(removed)} из {len(results)}.',
+                             'data': result.data
+                             }, status=status.HTTP_200_OK if removed else status.HTTP_404_NOT_FOUND, )
 
         except ObjectDoesNotExist:
-            return Response({'message': 'Ошибка удаления участника встречи. Неверный ID встречи или имя участника.'},
+            return Response({'message': 'Ошибка удаления участников встречи. Неверный ID встречи.'},
                             status=status.HTTP_404_NOT_FOUND, )
         except Exception as error:
-            return Response({'message': f'Ошибка добавления участника встречи.'
+            return Response({'message': f'Ошибка удаления участников встречи.'
+                                        f'Детали ошибки: {error}.'},
+                            status=status.HTTP_400_BAD_REQUEST, )
+
+    # Поиск общего свободного времени участников для встречи
+    @extend_schema(summary='Поиск общего свободного времени для встречи',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=SuccessResponseWithSlots,
+                           description='Успешный поиск свободного времени'),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Ошибка поиска свободного времени'),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='participants',
+                           location=OpenApiParameter.QUERY,
+                           description='ID профилей участников встречи из команды организатора '
+                                       '(можно указать несколько раз)',
+                           required=False,
+                           type={'type': 'array', 'items': {'type': 'integer'}},
+                           explode=True,
+                       ),
+                       OpenApiParameter(
+                           name='start_at',
+                           location=OpenApiParameter.QUERY,
+                           description='Начало периода поиска',
+                           required=True,
+                           type=datetime.datetime
+                       ),
+                       OpenApiParameter(
+                           name='end_at',
+                           location=OpenApiParameter.QUERY,
+                           description='Окончание периода поиска',
+                           required=True,
+                           type=datetime.datetime
+                       ),
+                       OpenApiParameter(
+                           name='duration',
+                           location=OpenApiParameter.QUERY,
+                           description='Продолжительность встречи в минутах',
+                           required=True,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='granularity',
+                           location=OpenApiParameter.QUERY,
+                           description='Шаг сетки времени начала встречи в минутах (по умолчанию 15)',
+                           required=False,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='limit',
+                           location=OpenApiParameter.QUERY,
+                           description='Количество вариантов (по умолчанию 5)',
+                           required=False,
+                           type=int
+                       ),
+                   ],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=False, url_path='find-slot',
+            permission_classes=[IsAdminUser, ])
+    def find_slot(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            serializer = FindSlotSerializer(data=request.query_params)
+            serializer.is_valid(raise_exception=True)
+
+            # Занятость можно узнать только у существующих сотрудников команды организатора
+            rejected = self.foreign_participants(request.user.profile, serializer.validated_data['participants'])
+            if rejected:
+                return Response({'message': f'Ошибка поиска свободного времени. '
+                                            f'Участники не найдены или не состоят в команде: {rejected}.',
+                                 'data': rejected},
+                                status=status.HTTP_400_BAD_REQUEST, )
+
+            # Организатор встречи также должен быть свободен
+            participants = {request.user.profile.id, *serializer.validated_data['participants']}
+
+            slots = self.find_free_slots(list(participants),
+                                         serializer.validated_data['start_at'],
+                                         serializer.validated_data['end_at'],
+                                         datetime.timedelta(minutes=serializer.validated_data['duration']),
+                                         datetime.timedelta(minutes=serializer.validated_data['granularity']),
+                                         serializer.validated_data['limit'])
+            result = SlotSerializer([{'start_at': start_at, 'end_at': end_at} for start_at, end_at in slots],
+                                    many=True)
+
+            return Response({'message': 'Свободное время для встречи.',
+                             'data': result.data},
+                            status=status.HTTP_200_OK, )
+
+        except Exception as error:
+            return Response({'message': f'Ошибка поиска свободного времени.'
                                         f'Детали ошибки: {error}.'},
                             status=status.HTTP_400_BAD_REQUEST, )
 
 
 @extend_schema(tags=['Calendar'])
-class CalendarViewSet(viewsets.ModelViewSet):
+class CalendarViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     """
     Класс для операций с календарем.
+    Просмотр календаря за период - асинхронный CalendarListView
     """
 
     serializer_class = CalendarSerializer
@@ -370,11 +624,96 @@ class CalendarViewSet(viewsets.ModelViewSet):
     # Разрешенные методы класса
     http_method_names = ['head', 'options', 'get']
 
-    # Просмотр календаря текущего пользователя за текущий день/ месяц
+    # Экспорт календаря текущего пользователя в формате iCalendar
+    @extend_schema(summary='Экспорт календаря текущего пользователя (ICS)',
+                   responses={
+                       (status.HTTP_200_OK, 'text/calendar'): OpenApiResponse(
+                           response=OpenApiTypes.STR,
+                           description='Календарь в формате iCalendar'
+                       ),
+                       status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+                           description='Календарь не изменился с последнего запроса'
+                       ),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='If-None-Match',
+                           location=OpenApiParameter.HEADER,
+                           description='ETag из предыдущего ответа',
+                           required=False,
+                           type=str
+                       ),
+                   ],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=False, url_path='export',
+            renderer_classes=[JSONRenderer, ICSRenderer])
+    @method_decorator(condition(etag_func=Service.profile_calendar_etag))
+    def export(self, request: Request, *args, **kwargs) -> ChunkedStreamingHttpResponse:
+        return self.ics_response(Service.profile_calendar(request),
+                                 f'Календарь {request.user.username}', 'calendar.ics')
+
+    # Экспорт календарей всех сотрудников компании в формате iCalendar (для администраторов)
+    @extend_schema(summary='Экспорт календарей сотрудников компании (ICS)',
+                   responses={
+                       (status.HTTP_200_OK, 'text/calendar'): OpenApiResponse(
+                           response=OpenApiTypes.STR,
+                           description='Календарь в формате iCalendar'
+                       ),
+                       status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+                           description='Календарь не изменился с последнего запроса'
+                       ),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Профиль не состоит в компании'),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='If-None-Match',
+                           location=OpenApiParameter.HEADER,
+                           description='ETag из предыдущего ответа',
+                           required=False,
+                           type=str
+                       ),
+                   ],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=False, url_path='company-export',
+            permission_classes=[IsAdminUser], renderer_classes=[JSONRenderer, ICSRenderer])
+    @method_decorator(condition(etag_func=Service.company_calendar_etag))
+    def company_export(self, request: Request, *args, **kwargs) -> ChunkedStreamingHttpResponse | Response:
+        if request.user.profile.team_id is None:
+            return Response({'message': 'Ошибка экспорта календаря. Профиль не состоит в компании.'},
+                            status=status.HTTP_400_BAD_REQUEST, )
+        return self.ics_response(Service.company_calendar(request),
+                                 f'Календарь {request.user.profile.team.name}', 'company-calendar.ics')
+
+    # Метод для потоковой отдачи календаря без загрузки всех записей в память
+    @staticmethod
+    def ics_response(entries: QuerySet, title: str, filename: str) -> ChunkedStreamingHttpResponse:
+        response = ChunkedStreamingHttpResponse(Service.ics_stream(entries, title),
+                                                content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    # Отключение метода для ViewSet.
+    @extend_schema(summary='Метод недоступен!')
+    def retrieve(self, request, *args, **kwargs):
+        return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@extend_schema(tags=['Calendar'])
+class CalendarListSchemaView(generics.GenericAPIView):
+    """
+    Описание асинхронного просмотра календаря (CalendarListView) для схемы OpenAPI
+    """
+    serializer_class = CalendarSerializer
+    queryset = Calendar.objects.none()
+
+    # Просмотр календаря текущего пользователя за текущий день/неделю/месяц или период from-to
     @extend_schema(summary='Просмотр календаря текущего пользователя',
+                   operation_id='v1_activities_calendar_list',
                    responses={
                        status.HTTP_200_OK: OpenApiResponse(
-                           response=CalendarSerializer,
+                           response=CalendarSerializer(many=True),
                            description='Успешное получение календаря'
                        ),
                        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
@@ -386,34 +725,53 @@ class CalendarViewSet(viewsets.ModelViewSet):
                            name='period',
                            location=OpenApiParameter.QUERY,
                            description='Параметр для определения периода календаря'
-                                       ' (daily - для ежедневного/monthly - для ежемесячного)',
-                           required=True,
-                           type=str
+                                       ' (daily - для ежедневного/weekly - для еженедельного/'
+                                       'monthly - для ежемесячного/custom - за период from-to)',
+                           required=False,
+                           type=str,
+                           enum=CalendarPeriods.values
+                       ),
+                       OpenApiParameter(
+                           name='from',
+                           location=OpenApiParameter.QUERY,
+                           description='Начало периода (включительно)',
+                           required=False,
+                           type=datetime.datetime
+                       ),
+                       OpenApiParameter(
+                           name='to',
+                           location=OpenApiParameter.QUERY,
+                           description='Конец периода (не включительно)',
+                           required=False,
+                           type=datetime.datetime
                        ),
                    ],
                    )
-    def list(self, request: Request, *args, **kwargs) -> Response:
-        profile = Profile.objects.filter(user=request.user, user__is_active=True).first()
-        today = datetime.date.today()
-
-        # Выбор отображения записей календаря в зависимости от указанного в query params периода
-        if request.query_params['period'] == 'daily':
-            calendar = Calendar.objects.filter(owner=profile, start_at__date=today)
-        elif request.query_params['period'] == 'monthly':
-            calendar = Calendar.objects.filter(owner=profile, start_at__month=today.month)
-        else:
-            return Response({'message': 'Ошибка получения календаря. Возможно неверно указан режим (daily/monthly).'},
-                            status=status.HTTP_400_BAD_REQUEST, )
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
-        serializer = self.serializer_class(calendar, many=True)
 
-        return Response({'message': serializer.data},
-                        status=status.HTTP_200_OK)
+class CalendarListView(AsyncAPIView):
+    """
+    Асинхронный просмотр календаря текущего пользователя
+    за текущий день/неделю/месяц (period) или период from-to
+    """
+    schema_view = CalendarListSchemaView
 
-    # Отключение метода для ViewSet.
-    @extend_schema(summary='Метод недоступен!')
-    def retrieve(self, request, *args, **kwargs):
-        return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    async def get(self, request, *args, **kwargs) -> HttpResponse:
+        params = CalendarPeriodSerializer(data=request.GET)
+        if not params.is_valid():
+            return self.render({'message': f'Ошибка получения календаря. Возможно неверно указан режим '
+                                           f'(daily/weekly/monthly/custom).Детали ошибки: {params.errors}.'},
+                               status=status.HTTP_400_BAD_REQUEST)
+
+        # Записи календаря, пересекающиеся с выбранным периодом
+        start, end = Service.calendar_window(params.validated_data['period'],
+                                             params.validated_data.get('from'),
+                                             params.validated_data.get('to'))
+        calendar = [i async for i in Service.calendar_entries(request.user.profile, start, end)]
+
+        return self.render({'message': CalendarSerializer(calendar, many=True).data})
 
 
 @extend_schema(tags=['Task'])
@@ -423,6 +781,7 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
     """
     serializer_class = TaskSerializer
     queryset = Task.objects.all()
+    pagination_class = DeadlineCursorPagination
     permission_classes = [IsAdminUser, ]
     # Разрешенные методы класса
     http_method_names = ['head', 'options', 'get', 'post', 'put', 'delete']
@@ -488,24 +847,25 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
                    )
     def create(self, request: Request, *args, **kwargs) -> Response:
         try:
-            executor = User.objects.get(profile__id=request.data['assigned_to'])
             created_at = timezone.now()
             serializer = self.serializer_class(data=request.data)
             serializer.is_valid(raise_exception=True)
+            executor = serializer.validated_data['assigned_to']
 
             # Проверка на принадлежность к одной команде руководителя и исполнителя
-            if not self.is_same_team(request.user, executor):
+            if not self.is_same_team(request.user.profile, executor):
                 raise AlienException('Not the same company members issue')
 
             task = Task(**serializer.validated_data)
-            task.assigned_by = Profile.objects.filter(user=request.user,
-                                                      user__is_active=True).first()
+            task.assigned_by = request.user.profile
             task.save()
             result = TaskSerializer(task)
 
             # Добавление записи в календарь о времени выполнения задачи
             Calendar.objects.create(name=f'Задача {result.data['id']}',
-                                    owner=Profile.objects.get(user=executor),
+                                    kind=CalendarKinds.TASK,
+                                    task=task,
+                                    owner=executor,
                                     start_at=created_at,
                                     end_at=serializer.validated_data['deadline'])
 
@@ -527,6 +887,66 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
                                         f'Детали ошибки: {error}.'},
                             status=status.HTTP_400_BAD_REQUEST, )
 
+    # Пакетное создание задач администратором для сотрудников с присвоением статуса "Выполняется".
+    # Заполнение календарей сотрудников. Ошибочные задачи пропускаются с указанием причины
+    @extend_schema(summary='Пакетное создание задач администратором для сотрудников',
+                   request=BulkTaskSerializer,
+                   responses={
+                       status.HTTP_201_CREATED: OpenApiResponse(
+                           response=SuccessResponseWithBulkTasks,
+                           description='Создана хотя бы одна задача',
+                           examples=[OpenApiExample(
+                               'Bulk task creation response',
+                               value={
+                                   'message': 'Создано задач: 1 из 2.',
+                                   'data': [{'index': 0, 'id': 1, 'name': 'Название задачи 1',
+                                             'assigned_to': 2, 'status': 'CREATED',
+                                             'detail': 'Задача создана'},
+                                            {'index': 1, 'id': None, 'name': 'Название задачи 2',
+                                             'assigned_to': 3, 'status': 'ALIEN',
+                                             'detail': 'Исполнитель - сотрудник другой компании'}]
+                               },
+                           )],
+                       ),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Ошибка создания задач'),
+                   },
+                   examples=[
+                       OpenApiExample(
+                           'Bulk task creation example',
+                           description='Пример вводимых данных задач',
+                           value={
+                               'tasks': [{'name': 'Название задачи 1',
+                                          'assigned_to': 'ID исполнителя',
+                                          'deadline': '2025-02-14T17:00:00'},
+                                         {'name': 'Название задачи 2',
+                                          'assigned_to': 'ID исполнителя',
+                                          'deadline': '2025-02-15T17:00:00'}]
+                           },
+                       ),
+                   ]
+                   )
+    @action(methods=[HTTPMethod.POST, ], detail=False, url_path='bulk-create')
+    def bulk_create(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            serializer = BulkTaskSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+
+            # Проверка исполнителей всех задач с созданием корректных задач одной транзакцией
+            results = self.create_tasks(request.user.profile, serializer.validated_data['tasks'])
+            created = [i for i in results if i['status'] == BulkTaskStatuses.CREATED]
+            result = BulkTaskResultSerializer(results, many=True)
+
+            return Response({'message': f'Создано задач: {len(created)} из {len(results)}.',
+                             'data': result.data},
+                            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST, )
+
+        except Exception as error:
+            return Response({'message': f'Ошибка пакетного создания задач.'
+                                        f'Детали ошибки: {error}.'},
+                            status=status.HTTP_400_BAD_REQUEST, )
+
     # Обновление задачи администратором.
     @extend_schema(summary='Обновление задачи администратором',
                    request=TaskSerializer,
@@ -570,23 +990,29 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
             serializer.is_valid(raise_exception=True)
 
             # Проверка на принадлежность к одной команде руководителя и исполнителя
-            if not self.is_same_team(request.user,
-                                     User.objects.get(profile__id=request.data['assigned_to'])):
+            if not self.is_same_team(request.user.profile, serializer.validated_data['assigned_to']):
                 raise AlienException('Not the same company members issue')
 
             # Удаление записи из календаря о времени выполнения задачи для предыдущего исполнителя
-            calendar = Calendar.objects.get(name=f'Задача {kwargs.get('pk')}')
-            calendar.delete()
+            Calendar.objects.filter(task=task).delete()
 
+            previous_executor = task.assigned_to_id
             task.assigned_to = serializer.validated_data['assigned_to']
             task.name = serializer.validated_data['name']
             task.deadline = serializer.validated_data['deadline']
-            task.save()
+            with transaction.atomic():
+                task.save()
+                # Оценка задачи переходит в квартальные итоги нового исполнителя
+                if (previous_executor != task.assigned_to_id
+                        and TaskEstimation.objects.filter(task=task).exists()):
+                    self.rebuild_rollups([previous_executor, task.assigned_to_id])
 
             result = TaskSerializer(task)
 
             # Добавление записи в календарь о новой задаче
             Calendar.objects.create(name=f'Задача {kwargs.get('pk')}',
+                                    kind=CalendarKinds.TASK,
+                                    task=task,
                                     owner=task.assigned_to,
                                     start_at=task.created_at,
                                     end_at=task.deadline, )
@@ -630,11 +1056,14 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
                    )
     def destroy(self, request: Request, *args, **kwargs) -> Response:
         try:
+            # Запись о задаче в календаре исполнителя удаляется каскадно
             task = Task.objects.get(id=kwargs.get('pk'))
-            calendar = Calendar.objects.get(name=f'Задача {kwargs.get('pk')}',
-                                            owner=task.assigned_to)
-            task.delete()
-            calendar.delete()
+            with transaction.atomic():
+                estimated = TaskEstimation.objects.filter(task=task).exists()
+                task.delete()
+                # Удаленная оценка исключается из квартальных итогов исполнителя
+                if estimated:
+                    self.rebuild_rollups([task.assigned_to_id])
 
             return Response({'message': 'Успешное удаление задачи.'},
                             status=status.HTTP_200_OK, )
@@ -683,13 +1112,12 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
     def update_status(self, request: Request, *args, **kwargs) -> Response:
         try:
             # Поверка на принадлежность задачи исполнителю
-            if not self.is_task_executor(kwargs.get('pk'),
-                                         User.objects.get(username=request.user)):
+            if not self.is_task_executor(kwargs.get('pk'), request.user.profile):
                 raise AlienException('Not correct executor issue')
 
             serializer = TaskStatusSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            task_status = TaskStatus.objects.get(task=Task.objects.get(pk=kwargs.get('pk')))
+            task_status = TaskStatus.objects.get(task_id=kwargs.get('pk'))
             task_status.status = serializer.validated_data['status']
             task_status.comment = serializer.validated_data['comment']
             task_status.save()
@@ -741,15 +1169,18 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
     def estimate_task(self, request: Request, *args, **kwargs) -> Response:
         try:
             # Поверка на принадлежность задачи профилю, присвоившую ее
-            if not self.is_task_assignor(kwargs.get('pk'),
-                                         User.objects.get(username=request.user)):
+            if not self.is_task_assignor(kwargs.get('pk'), request.user.profile):
                 raise AlienException('Not correct assignor issue')
 
             serializer = TaskEstimationSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             task_estimation = TaskEstimation(**serializer.data)
-            task_estimation.task = Task.objects.get(id=kwargs.get('pk'))
-            task_estimation.save()
+            task_estimation.task_id = kwargs.get('pk')
+
+            # Оценка и квартальные итоги исполнителя сохраняются вместе
+            with transaction.atomic():
+                task_estimation.save()
+                self.add_estimation_to_rollup(task_estimation)
 
             result = TaskEstimationSerializer(task_estimation)
             return Response({'message': 'Успешная оценка задачи.',
@@ -769,7 +1200,7 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
                                         f'Детали ошибки: {error}.'},
                             status=status.HTTP_400_BAD_REQUEST, )
 
-    # Получение своих оценок (всех/средние-квартальных/в рамках компании).
+    # Получение своих оценок (всех/средние-квартальных/за период/в рамках компании).
     @extend_schema(summary='Получение своих оценок',
                    responses={
                        status.HTTP_200_OK: OpenApiResponse(
@@ -785,57 +1216,88 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
                            name='options',
                            location=OpenApiParameter.QUERY,
                            description='Параметр для определения вывода статистики'
-                                       ' (quarter - для квартальной/company - в рамках компании',
+                                       ' (quarter - для квартальной/period - за период/'
+                                       'company - в рамках компании',
                            required=False,
                            type=str
                        ),
+                       OpenApiParameter(
+                           name='year',
+                           location=OpenApiParameter.QUERY,
+                           description='Год для квартальной статистики (по умолчанию текущий)',
+                           required=False,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='quarter',
+                           location=OpenApiParameter.QUERY,
+                           description='Квартал 1-4 для квартальной статистики (по умолчанию текущий)',
+                           required=False,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='start_at',
+                           location=OpenApiParameter.QUERY,
+                           description='Начало периода (включительно) для options=period',
+                           required=False,
+                           type=datetime.datetime
+                       ),
+                       OpenApiParameter(
+                           name='end_at',
+                           location=OpenApiParameter.QUERY,
+                           description='Конец периода (не включительно) для options=period',
+                           required=False,
+                           type=datetime.datetime
+                       ),
                    ],
                    )
     @action([HTTPMethod.GET, ], detail=False, url_path='get-marks',
             permission_classes=[IsAuthenticated])
     def get_marks(self, request: Request, *args, **kwargs) -> Response:
         try:
-            quarter = self.determine_quarter()
-            tasks = Task.objects.filter(assigned_to=Profile.objects.get(user=request.user))
+            params = MarksQuerySerializer(data=request.query_params)
+            params.is_valid(raise_exception=True)
+            rollups = EstimationRollup.objects.filter(profile=request.user.profile)
 
             # Проверка передаваемых параметров квартальный отчет/в рамках компании
             if request.query_params.get('options') == 'quarter':
-                tasks = tasks.filter(taskestimation__created_at__month__gte=quarter[0],
-                                     taskestimation__created_at__month__lte=quarter[1], )
-                result = tasks.aggregate(
-                    average_deadline_meeting=Round(Avg('taskestimation__deadline_meeting',
-                                                       default=0), 2),
-                    average_completeness=Round(Avg('taskestimation__completeness',
-                                                   default=0), 2),
-                    average_quality=Round(Avg('taskestimation__quality',
-                                              default=0), 2)
-                )
-
-                return Response({'message': 'Средние оценки исполнителя за текущий квартал',
-                                 'data': {'Соответствие дедлайн': result['average_deadline_meeting'],
-                                          'Завершение задачи': result['average_completeness'],
-                                          'Качество выполнения': result['average_quality']}},
+                year, quarter = self.quarter_of(timezone.now())
+                year = params.validated_data.get('year', year)
+                quarter = params.validated_data.get('quarter', quarter)
+                result = self.average_marks(rollups.filter(year=year, quarter=quarter))
+
+                return Response({'message': f'Средние оценки исполнителя за {quarter} квартал {year} года',
+                                 'data': {'Соответствие дедлайн': result['deadline_meeting'],
+                                          'Завершение задачи': result['completeness'],
+                                          'Качество выполнения': result['quality']}},
+                                status=status.HTTP_200_OK)
+
+            # Проверка передаваемых параметров отчет за произвольный период
+            if request.query_params.get('options') == 'period':
+                if 'start_at' not in params.validated_data:
+                    raise ValidationError('Period requires both start_at and end_at...')
+                result = self.average_marks_in_period(request.user.profile,
+                                                      params.validated_data['start_at'],
+                                                      params.validated_data['end_at'])
+
+                return Response({'message': 'Средние оценки исполнителя за период',
+                                 'data': {'Соответствие дедлайн': result['deadline_meeting'],
+                                          'Завершение задачи': result['completeness'],
+                                          'Качество выполнения': result['quality']}},
                                 status=status.HTTP_200_OK)
 
             # Проверка передаваемых параметров квартальный отчет/в рамках компании
             if request.query_params.get('options') == 'company':
-                current_team = Profile.objects.get(user=request.user).team
-                profiles = Profile.objects.filter(team=current_team)
-                tasks = tasks.filter(assigned_to__in=profiles)
-                result = tasks.aggregate(
-                    average_deadline_meeting=Round(Avg('taskestimation__deadline_meeting', default=0), 2),
-                    average_completeness=Round(Avg('taskestimation__completeness', default=0), 2),
-                    average_quality=Round(Avg('taskestimation__quality', default=0), 2)
-                )
+                result = self.average_marks(rollups)
 
                 return Response({'message': 'Средние оценки исполнителя в компании',
-                                 'data': {'Соответствие дедлайн': result['average_deadline_meeting'],
-                                          'Завершение задачи': result['average_completeness'],
-                                          'Качество выполнения': result['average_quality']}},
+                                 'data': {'Соответствие дедлайн': result['deadline_meeting'],
+                                          'Завершение задачи': result['completeness'],
+                                          'Качество выполнения': result['quality']}},
                                 status=status.HTTP_200_OK)
             # Все оценки
             else:
-                all_marks = TaskEstimation.objects.filter(task__in=tasks)
+                all_marks = TaskEstimation.objects.filter(task__assigned_to=request.user.profile)
                 result = TaskEstimationSerializer(all_marks, many=True)
 
                 return Response({'message': 'Все оценки пользователя за задачи',
@@ -846,3 +1308,58 @@ class TaskViewSet(viewsets.ModelViewSet, Service):
             return Response({'message': f'Не удалось отобразить список оценок.'
                                         f'Детали ошибки: {error}'},
                             status=status.HTTP_400_BAD_REQUEST, )
+
+    # Рейтинг сотрудников компании по средним оценкам за квартал (для руководителей)
+    @extend_schema(summary='Рейтинг сотрудников компании за квартал',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=SuccessResponseWithLeaderboard,
+                           description='Успешное получение рейтинга'
+                       ),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Ошибка получения данных'),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='year',
+                           location=OpenApiParameter.QUERY,
+                           description='Год (по умолчанию текущий)',
+                           required=False,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='quarter',
+                           location=OpenApiParameter.QUERY,
+                           description='Квартал 1-4 (по умолчанию текущий)',
+                           required=False,
+                           type=int
+                       ),
+                   ],
+                   )
+    @action([HTTPMethod.GET, ], detail=False, url_path='leaderboard',
+            permission_classes=[IsAdminUser])
+    def leaderboard(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            company_id = request.user.profile.team_id
+            if company_id is None:
+                raise AlienException('No company issue')
+
+            serializer = QuarterSerializer(data=request.query_params)
+            serializer.is_valid(raise_exception=True)
+            year, quarter = self.quarter_of(timezone.now())
+            year = serializer.validated_data.get('year', year)
+            quarter = serializer.validated_data.get('quarter', quarter)
+
+            result = LeaderboardSerializer(self.get_leaderboard(company_id, year, quarter), many=True)
+            return Response({'message': f'Рейтинг сотрудников компании за {quarter} квартал {year} года',
+                             'data': result.data},
+                            status=status.HTTP_200_OK)
+
+        except AlienException:
+            return Response({'message': 'Ошибка получения рейтинга. Профиль не состоит в компании.'},
+                            status=status.HTTP_400_BAD_REQUEST, )
+        except Exception as error:
+            return Response({'message': f'Ошибка получения рейтинга.'
+                                        f'Детали ошибки: {error}.'},
+                            status=status.HTTP_400_BAD_REQUEST, )
@@ -1,6 +1,60 @@
+from django import forms
 from django.contrib import admin
+
 from .models import Company, Structure, StructureMember
+from .utils import Hierarchy
 
 admin.site.register(Company)
 admin.site.register(Structure)
-admin.site.register(StructureMember)
+
+
+class StructureMemberForm(forms.ModelForm):
+    """
+    Проверка начальника члена структуры: та же структура и отсутствие циклов подчинения
+    """
+
+    class Meta:
+        model = StructureMember
+        fields = '__all__'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        parent, structure = cleaned_data.get('parent'), cleaned_data.get('structure')
+        if parent is None or structure is None:
+            return cleaned_data
+        if parent.structure_id != structure.id:
+            self.add_error('parent', 'Начальник должен быть членом той же структуры')
+        elif self.instance.pk is not None and Hierarchy.is_subordinate(parent.id, self.instance.pk):
+            self.add_error('parent', 'Начальник не может быть подчиненным члена структуры')
+        return cleaned_data
+
+
+@admin.register(StructureMember)
+class StructureMemberAdmin(admin.ModelAdmin):
+    """
+    Члены структуры создаются, переводятся и удаляются через Hierarchy,
+    поэтому таблица замыкания остается согласованной
+    """
+    form = StructureMemberForm
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            Hierarchy.add_member(obj)
+        elif 'parent' in form.changed_data:
+            Hierarchy.move_member(obj)
+        else:
+            obj.save()
+
+    # Подчиненные удаляемого члена переходят к его начальнику (Hierarchy.remove_member), поэтому
+    # ограничение RESTRICT по parent (единственная ссылка на член структуры) не блокирует удаление
+    def get_deleted_objects(self, objs, request):
+        deleted, model_count, perms_needed, _ = super().get_deleted_objects(objs, request)
+        return deleted, model_count, perms_needed, []
+
+    def delete_model(self, request, obj):
+        Hierarchy.remove_member(obj)
+
+    # Подчиненные удаленных членов переходят к начальнику, поэтому каждый член перечитывается перед удалением
+    def delete_queryset(self, request, queryset):
+        for member_id in list(queryset.values_list('id', flat=True)):
+            Hierarchy.remove_member(StructureMember.objects.get(id=member_id))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CompaniesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'companies'
+
+    # Подключение сброса кэша компаний и структур к сигналам моделей
+    def ready(self):
+        from companies import signals  # noqa: F401
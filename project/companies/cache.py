@@ -0,0 +1,61 @@
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from core.metrics import cache_counters
+
+# Ключ текущей версии данных компаний и структур (общий для всех записей)
+VERSION_KEY = 'companies-version'
+
+
+class ReadCache:
+    """
+    Версионный read-through кэш ответов компаний и организационных структур.
+    Ключи записей содержат текущую версию, изменение данных сдвигает версию,
+    поэтому устаревшие записи не читаются и удаляются кэшем по времени жизни
+    """
+
+    def __init__(self, alias: str, ttl: float, name: str = 'companies'):
+        self.alias = alias
+        self.ttl = ttl
+        self.name = name
+
+    @classmethod
+    def from_settings(cls) -> 'ReadCache':
+        options = getattr(settings, 'COMPANIES_CACHE', {})
+        return cls(alias=options.get('CACHE_ALIAS', 'default'), ttl=options.get('TTL', 3600))
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version(self) -> int:
+        return self.cache.get_or_set(VERSION_KEY, time.time_ns, None)
+
+    # Метод для получения данных из кэша или их загрузки с сохранением.
+    # Данные, прочитанные внутри незафиксированной транзакции, в кэш не попадают
+    def get_or_load(self, key: str, load: Callable):
+        versioned = f'{self.name}:{self.version()}:{key}'
+        value = self.cache.get(versioned)
+        cache_counters.record(self.name, value is not None)
+        if value is not None:
+            return value
+
+        value = load()
+        if not connection.in_atomic_block:
+            self.cache.set(versioned, value, timeout=self.ttl)
+        return value
+
+    # Метод для сброса кэша сдвигом версии (сразу и после фиксации транзакции)
+    def invalidate(self) -> None:
+        def bump():
+            self.cache.set(VERSION_KEY, time.time_ns(), None)
+
+        bump()
+        transaction.on_commit(bump)
+
+
+read_cache = ReadCache.from_settings()
@@ -17,4 +17,11 @@ class TestCompanyData:
         'bosses': 'Главный инженер'
     }
 
-
+    # Иерархия членов структуры: (позиция, индекс начальника в списке)
+    hierarchy = [
+        ('Генеральный директор', None),
+        ('Технический директор', 0),
+        ('Разработчик', 1),
+        ('Руководитель группы', 1),
+        ('Инженер', 3),
+    ]
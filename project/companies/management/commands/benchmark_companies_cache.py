@@ -0,0 +1,84 @@
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from companies.cache import read_cache
+from companies.models import Company, Structure
+from companies.serializers import CompanySerializer
+from companies.views import CompanyViewSet, StructureViewSet
+from core.benchmark import measure
+from core.metrics import cache_counters
+
+
+class Command(BaseCommand):
+    help = 'Замер получения компаний и организационных структур без кэша и с кэшем чтения (память и файлы)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1000,
+                            help='Количество компаний (у каждой своя структура)')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество повторов замера')
+
+    def handle(self, *args, **options):
+        # Кэш заполняется только вне транзакций, поэтому данные фиксируются и удаляются явно
+        user = User.objects.create_user(username='benchmark_companies_cache', password='benchmark',
+                                        is_staff=True)
+        structures = Structure.objects.bulk_create(Structure(name=f'benchmark_companies_cache {i}')
+                                                   for i in range(options['companies']))
+        companies = Company.objects.bulk_create(Company(name=f'benchmark_companies_cache {i}', structure=structure)
+                                                for i, structure in enumerate(structures))
+        alias = read_cache.alias
+        try:
+            self.report('list, lazy structure',
+                        measure(lambda: CompanySerializer(Company.objects.all(), many=True).data,
+                                max(options['repeat'] // 10, 1)))
+            self.report('list, select_related',
+                        measure(lambda: CompanySerializer(Company.objects.select_related('structure'),
+                                                          many=True).data, options['repeat']))
+
+            factory = APIRequestFactory()
+            views = {
+                'company list': (CompanyViewSet.as_view({'get': 'list'}), {}),
+                'company': (CompanyViewSet.as_view({'get': 'retrieve'}), {'pk': companies[0].id}),
+                'structure list': (StructureViewSet.as_view({'get': 'list'}), {}),
+                'structure': (StructureViewSet.as_view({'get': 'retrieve'}), {'pk': structures[0].id}),
+            }
+
+            def call(view, kwargs: dict, invalidate: bool):
+                if invalidate:
+                    read_cache.invalidate()
+                request = factory.get('/', HTTP_HOST='localhost')
+                force_authenticate(request, user=user)
+                view(request, **kwargs).render()
+
+            with tempfile.TemporaryDirectory() as directory:
+                backends = {
+                    'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                               'LOCATION': 'benchmark_companies_cache'},
+                    'file': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                             'LOCATION': directory},
+                }
+                for backend, config in backends.items():
+                    with override_settings(CACHES={**settings.CACHES, 'benchmark': config}):
+                        read_cache.alias = 'benchmark'
+                        cache_counters.clear()
+                        for target, (view, kwargs) in views.items():
+                            self.report(f'{target}, {backend} miss',
+                                        measure(lambda: call(view, kwargs, True), options['repeat']))
+                            self.report(f'{target}, {backend} hit',
+                                        measure(lambda: call(view, kwargs, False), options['repeat']))
+                        read_cache.cache.clear()
+                    self.stdout.write(f'{backend} cache: {cache_counters.stats(read_cache.name)}')
+        finally:
+            read_cache.alias = alias
+            cache_counters.clear()
+            Company.objects.filter(id__in=[i.id for i in companies]).delete()
+            Structure.objects.filter(id__in=[i.id for i in structures]).delete()
+            user.delete()
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<28} median={result['median']}ms p95={result['p95']}ms')
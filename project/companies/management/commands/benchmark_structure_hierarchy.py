@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from companies.models import Structure, StructureMember, StructureMemberPath
+from companies.views import StructureViewSet
+from core.benchmark import measure
+
+
+class Command(BaseCommand):
+    help = 'Замер выборки начальников, подчиненных и поддерева в иерархии членов структуры'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=10000,
+                            help='Количество членов структуры')
+        parser.add_argument('--branching', type=int, default=10,
+                            help='Количество непосредственных подчиненных у начальника')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество повторов замера')
+
+    def handle(self, *args, **options):
+        # Все созданные данные откатываются после замеров
+        with transaction.atomic():
+            user = User.objects.create_user(username='benchmark_structure_hierarchy', password='benchmark',
+                                            is_staff=True)
+            levels = self.create_tree(options['members'], max(options['branching'], 2))
+
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {StructureMemberPath._meta.db_table}')
+
+            factory = APIRequestFactory()
+
+            def call(action: str, pk: int, query: str = ''):
+                request = factory.get(f'/?{query}', HTTP_HOST='localhost')
+                force_authenticate(request, user=user)
+                view = StructureViewSet.as_view({'get': action})
+                view(request, pk=pk).render()
+
+            for level, members in enumerate(levels[:-1]):
+                size = StructureMemberPath.objects.filter(ancestor_id=members[0]).count()
+                self.report(f'subtree, level {level} ({size})',
+                            measure(lambda: call('subtree', members[0]), options['repeat']))
+            self.report('descendants, depth=1',
+                        measure(lambda: call('descendants', levels[0][0], 'depth=1'), options['repeat']))
+            self.report(f'ancestors, level {len(levels) - 1}',
+                        measure(lambda: call('ancestors', levels[-1][0]), options['repeat']))
+            transaction.set_rollback(True)
+
+    # Метод для создания дерева членов структуры по уровням с заполнением таблицы замыкания
+    @staticmethod
+    def create_tree(count: int, branching: int) -> list[list[int]]:
+        structure = Structure.objects.create(name='benchmark_structure_hierarchy')
+        ancestors, levels, parents, created = {}, [], [None], 0
+        while created < count:
+            size = min(len(parents) * branching, count - created) if levels else 1
+            members = StructureMember.objects.bulk_create(
+                StructureMember(structure=structure, position=f'Сотрудник {created + i}', role='Роль',
+                                parent_id=parents[i // branching] if levels else None)
+                for i in range(size))
+            paths = []
+            for member in members:
+                chain = [member.id, *ancestors.get(member.parent_id, ())]
+                ancestors[member.id] = chain
+                paths += [StructureMemberPath(ancestor_id=ancestor, descendant_id=member.id, depth=depth)
+                          for depth, ancestor in enumerate(chain)]
+            StructureMemberPath.objects.bulk_create(paths, batch_size=5000)
+            parents = [i.id for i in members]
+            levels.append(parents)
+            created += size
+        return levels
+
+    def report(self, target: str, result: dict) -> None:
+        self.stdout.write(f'{target:<28} median={result['median']}ms p95={result['p95']}ms')
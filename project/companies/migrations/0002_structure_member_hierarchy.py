@@ -0,0 +1,44 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='structuremember',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='companies.structuremember', verbose_name='Непосредственный начальник'),
+        ),
+        migrations.AlterField(
+            model_name='structuremember',
+            name='bosses',
+            field=models.CharField(max_length=64, null=True, verbose_name='Непосредственные начальники'),
+        ),
+        migrations.AlterField(
+            model_name='structuremember',
+            name='subordinates',
+            field=models.CharField(max_length=64, null=True, verbose_name='Непосредственные подчиненные'),
+        ),
+        migrations.CreateModel(
+            name='StructureMemberPath',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(verbose_name='Уровень подчинения')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_paths', to='companies.structuremember', verbose_name='Начальник')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_paths', to='companies.structuremember', verbose_name='Подчиненный')),
+            ],
+            options={
+                'verbose_name': 'Связь подчинения членов структуры',
+                'verbose_name_plural': 'Связи подчинения членов структуры',
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='member_path_ancestor_idx'), models.Index(fields=['descendant', 'depth'], name='member_path_descendant_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='Unique structure member path constraint')],
+            },
+        ),
+    ]
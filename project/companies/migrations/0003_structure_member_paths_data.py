@@ -0,0 +1,30 @@
+import itertools
+
+from django.db import migrations
+
+CHUNK_SIZE = 5000
+
+
+def create_member_paths(apps, schema_editor):
+    """
+    Заполнение таблицы замыкания для существующих членов структур (связь с самим собой).
+    Прежние связи хранились текстом, поэтому все существующие члены становятся корневыми
+    """
+    StructureMember = apps.get_model('companies', 'StructureMember')
+    StructureMemberPath = apps.get_model('companies', 'StructureMemberPath')
+
+    ids = StructureMember.objects.values_list('id', flat=True).iterator(chunk_size=CHUNK_SIZE)
+    for chunk in itertools.batched(ids, CHUNK_SIZE):
+        StructureMemberPath.objects.bulk_create(
+            StructureMemberPath(ancestor_id=i, descendant_id=i, depth=0) for i in chunk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_structure_member_hierarchy'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_member_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_structure_member_paths_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='structuremember',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='children', to='companies.structuremember', verbose_name='Непосредственный начальник'),
+        ),
+    ]
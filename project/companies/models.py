@@ -26,10 +26,15 @@ class StructureMember(models.Model):
     position = models.CharField(max_length=64,
                                 verbose_name='Позиция в команде')
     role = models.CharField(max_length=64, verbose_name='Роль в команде')
+    # Таблица замыкания обновляется только через Hierarchy, поэтому удаление начальника
+    # с подчиненными в обход Hierarchy.remove_member запрещено (удаление всей структуры допускается)
+    parent = models.ForeignKey('self', on_delete=models.RESTRICT, null=True, blank=True,
+                               related_name='children',
+                               verbose_name='Непосредственный начальник')
     subordinates = models.CharField(max_length=64, null=True,
-                                    verbose_name='Непосредственные начальники')
+                                    verbose_name='Непосредственные подчиненные')
     bosses = models.CharField(max_length=64, null=True,
-                              verbose_name='Непосредственные подчиненные')
+                              verbose_name='Непосредственные начальники')
 
     def __str__(self) -> str:
         return f'Член структуры - {self.position}'
@@ -39,6 +44,32 @@ class StructureMember(models.Model):
         verbose_name_plural = 'Члены организационной структуры'
 
 
+class StructureMemberPath(models.Model):
+    """
+    Таблица замыкания иерархии членов структуры: связь каждого члена со всеми начальниками
+    (включая связь с самим собой, глубина 0). Начальники и подчиненные любой глубины
+    выбираются одним запросом по индексу
+    """
+    ancestor = models.ForeignKey(StructureMember, on_delete=models.CASCADE,
+                                 related_name='descendant_paths',
+                                 verbose_name='Начальник')
+    descendant = models.ForeignKey(StructureMember, on_delete=models.CASCADE,
+                                   related_name='ancestor_paths',
+                                   verbose_name='Подчиненный')
+    depth = models.PositiveIntegerField(verbose_name='Уровень подчинения')
+
+    def __str__(self) -> str:
+        return f'Подчинение {self.descendant_id} члену структуры {self.ancestor_id} ({self.depth})'
+
+    class Meta:
+        verbose_name = 'Связь подчинения членов структуры'
+        verbose_name_plural = 'Связи подчинения членов структуры'
+        constraints = (models.UniqueConstraint(fields=('ancestor', 'descendant'),
+                                               name='Unique structure member path constraint'),)
+        indexes = (models.Index(fields=('ancestor', 'depth'), name='member_path_ancestor_idx'),
+                   models.Index(fields=('descendant', 'depth'), name='member_path_descendant_idx'))
+
+
 class Company(models.Model):
     """
     Таблица созданных компаний (команд)
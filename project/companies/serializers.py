@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from accounts.serializers import ProfileSerializer
 from companies.models import Company, Structure, StructureMember
 
 
@@ -25,10 +26,37 @@ class StructureMemberSerializer(serializers.ModelSerializer):
     structure = serializers.CharField(source='structure.name', read_only=True)
 
     class Meta:
-        fields = ['id', 'structure', 'position', 'role', 'subordinates', 'bosses']
+        fields = ['id', 'structure', 'position', 'role', 'parent', 'subordinates', 'bosses']
         model = StructureMember
 
 
+class HierarchyMemberSerializer(serializers.Serializer):
+    """
+    Сериализатор члена структуры в иерархии подчинения
+    """
+    id = serializers.IntegerField()
+    position = serializers.CharField()
+    role = serializers.CharField()
+    parent = serializers.IntegerField(allow_null=True)
+    depth = serializers.IntegerField(help_text='Уровень подчинения относительно указанного члена структуры')
+
+
+class SubtreeMemberSerializer(HierarchyMemberSerializer):
+    """
+    Сериализатор узла поддерева подчиненных
+    """
+    children = serializers.ListField(child=serializers.DictField(),
+                                     help_text='Непосредственные подчиненные (узлы поддерева)')
+
+
+class HierarchyQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор параметров выборки подчиненных
+    """
+    depth = serializers.IntegerField(min_value=1, required=False,
+                                     help_text='Максимальный уровень подчинения')
+
+
 class CompanySerializer(serializers.ModelSerializer):
     """
     Сериализатор для модели Company
@@ -45,6 +73,62 @@ class CompanySerializer(serializers.ModelSerializer):
         }
 
 
+class StructureCompanySerializer(serializers.ModelSerializer):
+    """
+    Сериализатор компании в составе организационной структуры
+    """
+
+    class Meta:
+        fields = ['id', 'name']
+        model = Company
+
+
+class StructureCompanyWithProfilesSerializer(StructureCompanySerializer):
+    """
+    Сериализатор компании в составе организационной структуры с сотрудниками
+    """
+    profiles = ProfileSerializer(many=True, read_only=True)
+
+    class Meta(StructureCompanySerializer.Meta):
+        fields = StructureCompanySerializer.Meta.fields + ['profiles']
+
+
+class StructureDetailSerializer(StructureSerializer):
+    """
+    Сериализатор организационной структуры с членами и компаниями
+    """
+    members = StructureMemberSerializer(many=True, read_only=True)
+    companies = StructureCompanySerializer(many=True, read_only=True)
+
+    class Meta(StructureSerializer.Meta):
+        fields = StructureSerializer.Meta.fields + ['members', 'companies']
+
+
+class StructureDetailWithProfilesSerializer(StructureDetailSerializer):
+    """
+    Сериализатор организационной структуры с членами, компаниями и их сотрудниками
+    """
+    companies = StructureCompanyWithProfilesSerializer(many=True, read_only=True)
+
+
+class StructureQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор параметров получения организационной структуры
+    """
+    expand = serializers.BooleanField(default=False, help_text='Добавить членов структуры и компании')
+    profiles = serializers.BooleanField(default=False, help_text='Добавить сотрудников компаний (для expand)')
+
+
 class SuccessResponseWithMember(serializers.Serializer):
     message = serializers.CharField(default='Операция прошла удачно')
     data = StructureMemberSerializer()
+
+
+class SuccessResponseWithHierarchy(serializers.Serializer):
+    message = serializers.CharField(default='Операция прошла удачно')
+    data = HierarchyMemberSerializer(many=True)
+
+
+class SuccessResponseWithSubtree(serializers.Serializer):
+    message = serializers.CharField(default='Операция прошла удачно')
+    data = SubtreeMemberSerializer()
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.authentication import invalidate_team_tokens
+from companies.cache import read_cache
+from companies.models import Company, Structure, StructureMember
+
+
+@receiver([post_save, post_delete], sender=Company, dispatch_uid='companies.invalidate_company')
+@receiver([post_save, post_delete], sender=Structure, dispatch_uid='companies.invalidate_structure')
+@receiver([post_save, post_delete], sender=StructureMember, dispatch_uid='companies.invalidate_member')
+def invalidate_read_cache(sender, **kwargs) -> None:
+    """
+    Сброс кэша компаний и структур при изменении компании, структуры или ее члена
+    """
+    read_cache.invalidate()
+
+
+@receiver(post_save, sender=Company, dispatch_uid='companies.invalidate_team_tokens')
+def invalidate_company_tokens(sender, instance: Company, created: bool, **kwargs) -> None:
+    """
+    Сброс кэша токенов сотрудников компании (компания профиля хранится в кэше токенов)
+    """
+    if not created:
+        invalidate_team_tokens(instance.id)
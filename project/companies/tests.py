@@ -1,7 +1,16 @@
-from django.test import TestCase, Client
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import RestrictedError
+from django.test import TestCase, TransactionTestCase, Client
 
+from accounts.authentication import token_cache
 from accounts.models import Profile
+from companies.cache import VERSION_KEY, read_cache
 from companies.constants import TestCompanyData
+from companies.models import Company, StructureMember
+from core.metrics import cache_counters
 
 
 class TestCompany(TestCase):
@@ -84,3 +93,202 @@ class TestCompany(TestCase):
         response = self.client.delete(path=f'{self.BUSINESS_URL}companies/{company['id']}/',
                                       headers={'Authorization': f'Token {self.profile_4.data['token']}'})
         self.assertEqual(response.status_code, 200)
+
+    # Добавление членов структуры по иерархии TestCompanyData.hierarchy
+    def create_hierarchy(self) -> list[int]:
+        structure = self.test_create_structure()
+        ids = []
+        for position, parent in self.data.hierarchy:
+            response = self.client.post(path=f'{self.BUSINESS_URL}structures/{structure['id']}/add-member/',
+                                        data={**self.data.structure_member, 'position': position,
+                                              **({'parent': ids[parent]} if parent is not None else {})},
+                                        headers={'Authorization': f'Token {self.profile_4.data['token']}'})
+            self.assertEqual(response.status_code, 201, response.data)
+            ids.append(response.data['data']['id'])
+        return ids
+
+    # Начальники и подчиненные члена структуры любой глубины
+    def test_member_hierarchy(self):
+        ceo, cto, developer, lead, engineer = self.create_hierarchy()
+        headers = {'Authorization': f'Token {self.profile_4.data['token']}'}
+
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{engineer}/ancestors/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(i['id'], i['depth']) for i in response.data['data']], [(lead, 1), (cto, 2), (ceo, 3)])
+
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{ceo}/descendants/', headers=headers)
+        self.assertEqual([(i['id'], i['depth']) for i in response.data['data']],
+                         [(cto, 1), (developer, 2), (lead, 2), (engineer, 3)])
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{ceo}/descendants/?depth=2',
+                                   headers=headers)
+        self.assertEqual([i['id'] for i in response.data['data']], [cto, developer, lead])
+
+        # Поддерево выбирается одним запросом (и запросом аутентификации)
+        with self.assertNumQueries(2):
+            response = self.client.get(path=f'{self.BUSINESS_URL}structures/{cto}/subtree/', headers=headers)
+        subtree = response.json()['data']
+        self.assertEqual((subtree['id'], subtree['parent']), (cto, ceo))
+        self.assertEqual([i['id'] for i in subtree['children']], [developer, lead])
+        self.assertEqual([i['id'] for i in subtree['children'][1]['children']], [engineer])
+
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/0/subtree/', headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+    # Подчиненные удаленного члена структуры переходят к его начальнику
+    def test_delete_member_hierarchy(self):
+        ceo, cto, developer, lead, engineer = self.create_hierarchy()
+        headers = {'Authorization': f'Token {self.profile_4.data['token']}'}
+
+        response = self.client.delete(path=f'{self.BUSINESS_URL}structures/{cto}/delete-member/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{ceo}/descendants/', headers=headers)
+        self.assertEqual([(i['id'], i['parent'], i['depth']) for i in response.data['data']],
+                         [(developer, ceo, 1), (lead, ceo, 1), (engineer, lead, 2)])
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{engineer}/ancestors/', headers=headers)
+        self.assertEqual([(i['id'], i['depth']) for i in response.data['data']], [(lead, 1), (ceo, 2)])
+
+    # Члены структуры, созданные, переведенные и удаленные в админке, согласованы с таблицей замыкания
+    def test_admin_member_hierarchy(self):
+        ceo, cto, developer, lead, engineer = self.create_hierarchy()
+        headers = {'Authorization': f'Token {self.profile_4.data['token']}'}
+        admin = Client()
+        admin.force_login(User.objects.create_superuser(username='admin', password='Admin-secret-1'))
+        url = '/admin/companies/structuremember/'
+        member = {**self.data.structure_member, 'structure': StructureMember.objects.get(id=ceo).structure_id}
+
+        response = admin.post(path=f'{url}add/', data={**member, 'position': 'Стажер', 'parent': engineer})
+        self.assertEqual(response.status_code, 302)
+        intern = StructureMember.objects.get(position='Стажер').id
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{intern}/ancestors/', headers=headers)
+        self.assertEqual([i['id'] for i in response.data['data']], [engineer, lead, cto, ceo])
+
+        # Перевод члена структуры вместе с подчиненными, цикл подчинения не допускается
+        response = admin.post(path=f'{url}{lead}/change/', data={**member, 'parent': ceo})
+        self.assertEqual(response.status_code, 302)
+        response = admin.post(path=f'{url}{lead}/change/', data={**member, 'parent': intern})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{intern}/ancestors/', headers=headers)
+        self.assertEqual([(i['id'], i['depth']) for i in response.data['data']], [(engineer, 1), (lead, 2), (ceo, 3)])
+
+        response = admin.post(path=f'{url}{lead}/delete/', data={'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{ceo}/subtree/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(i['id'], [j['id'] for j in i['children']]) for i in response.json()['data']['children']],
+                         [(cto, [developer]), (engineer, [intern])])
+
+    # Удаление начальника с подчиненными в обход Hierarchy запрещено, удаление всей структуры допускается
+    def test_delete_member_directly(self):
+        ceo, cto = self.create_hierarchy()[:2]
+        with self.assertRaises(RestrictedError), transaction.atomic():
+            StructureMember.objects.get(id=cto).delete()
+        self.assertEqual(StructureMember.objects.get(id=cto).parent_id, ceo)
+
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/{ceo}/subtree/',
+                                   headers={'Authorization': f'Token {self.profile_4.data['token']}'})
+        self.assertEqual(response.status_code, 200)
+
+        StructureMember.objects.get(id=ceo).structure.delete()
+        self.assertFalse(StructureMember.objects.exists())
+
+    # Начальник из другой структуры не допускается
+    def test_add_member_alien_parent(self):
+        ceo = self.create_hierarchy()[0]
+        structure = self.client.post(path=f'{self.BUSINESS_URL}structures/', data={'name': 'Матричная'},
+                                     headers={'Authorization': f'Token {self.profile_4.data['token']}'}).data
+        response = self.client.post(path=f'{self.BUSINESS_URL}structures/{structure['id']}/add-member/',
+                                    data={**self.data.structure_member, 'parent': ceo},
+                                    headers={'Authorization': f'Token {self.profile_4.data['token']}'})
+        self.assertEqual(response.status_code, 400)
+
+    # Получение структуры с членами, компаниями и сотрудниками фиксированным числом запросов
+    def test_get_structure_expanded(self):
+        company = self.test_create_company()
+        structure = Company.objects.get(id=company['id']).structure
+        StructureMember.objects.bulk_create(StructureMember(structure=structure, position=f'Инженер {i}',
+                                                            role='Контроль обработки данных')
+                                            for i in range(1000))
+        Profile.objects.filter(id=self.profile_5.data['profile']['id']).update(team_id=company['id'])
+        headers = {'Authorization': f'Token {self.profile_4.data['token']}'}
+
+        # Аутентификация, структура, члены структуры, компании
+        with self.assertNumQueries(4):
+            response = self.client.get(path=f'{self.BUSINESS_URL}structures/{structure.id}/?expand=true',
+                                       headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['members']), 1000)
+        self.assertEqual(response.data['members'][0]['structure'], structure.name)
+        self.assertEqual(response.data['companies'], [{'id': company['id'], 'name': 'Main'}])
+
+        # Дополнительно сотрудники компаний с пользователями
+        with self.assertNumQueries(5):
+            response = self.client.get(path=f'{self.BUSINESS_URL}structures/{structure.id}/'
+                                            f'?expand=true&profiles=true', headers=headers)
+        self.assertEqual([(i['name'], i['company_name']) for i in response.data['companies'][0]['profiles']],
+                         [(self.data.user_2['username'], 'Main')])
+
+        response = self.client.get(path=f'{self.BUSINESS_URL}structures/0/?expand=true', headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+
+class TestCompanyCache(TransactionTestCase):
+    """
+    Кэш компаний и структур заполняется только вне транзакций, поэтому тесты
+    выполняются без общей транзакции TestCase
+    """
+
+    def setUp(self):
+        self.BUSINESS_URL = '/api/v1/business/'
+        self.data = TestCompanyData()
+        token_cache.clear()
+        read_cache.cache.clear()
+        cache_counters.clear()
+        profile = Client().post(path='/api/v1/accounts/', data=self.data.user_1)
+        self.headers = {'Authorization': f'Token {profile.data['token']}'}
+        self.structure = self.client.post(path=f'{self.BUSINESS_URL}structures/', data={'name': 'Линейная'},
+                                          headers=self.headers).data
+        self.company = self.client.post(path=f'{self.BUSINESS_URL}companies/',
+                                        data={'name': 'Main', 'structure': self.structure['id']},
+                                        headers=self.headers).data
+
+    # Повторное получение списка и данных компании без запросов к БД
+    def test_cached_company(self):
+        for path in (f'{self.BUSINESS_URL}companies/', f'{self.BUSINESS_URL}companies/{self.company['id']}/'):
+            response = self.client.get(path=path, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            with self.assertNumQueries(0):
+                cached = self.client.get(path=path, headers=self.headers)
+            self.assertEqual(cached.json(), response.json())
+
+        self.assertEqual(self.client.get(path=f'{self.BUSINESS_URL}companies/',
+                                         headers=self.headers).json()[0]['structure_detail'],
+                         'Организационная структура - Линейная')
+        self.assertEqual(cache_counters.stats('companies'), {'hits': 3, 'misses': 2, 'hit_ratio': 0.6})
+
+    # Сброс кэша структур после изменения членов структуры
+    def test_cache_invalidation(self):
+        path = f'{self.BUSINESS_URL}structures/{self.structure['id']}/'
+        self.client.get(path=path, headers=self.headers)
+        self.client.get(path=path, headers=self.headers)
+        self.assertEqual(cache_counters.stats('companies')['hits'], 1)
+
+        self.client.post(path=f'{path}add-member/', data=self.data.structure_member, headers=self.headers)
+        with self.assertNumQueries(1):
+            self.client.get(path=path, headers=self.headers)
+        self.assertEqual(cache_counters.stats('companies')['misses'], 2)
+
+        self.client.delete(path=f'{self.BUSINESS_URL}companies/{self.company['id']}/', headers=self.headers)
+        self.assertEqual(self.client.get(path=f'{self.BUSINESS_URL}companies/', headers=self.headers).json(), [])
+
+    # Сдвиг версии в одном воркере виден экземпляру кэша другого воркера
+    def test_cache_invalidation_shared(self):
+        self.assertNotIsInstance(read_cache.cache, LocMemCache)
+        worker_2 = caches.create_connection(read_cache.alias)
+        self.client.get(path=f'{self.BUSINESS_URL}companies/', headers=self.headers)
+        version = worker_2.get(VERSION_KEY)
+        self.assertEqual(version, read_cache.version())
+
+        self.client.delete(path=f'{self.BUSINESS_URL}companies/{self.company['id']}/', headers=self.headers)
+        self.assertNotEqual(worker_2.get(VERSION_KEY), version)
+        self.assertEqual(worker_2.get(VERSION_KEY), read_cache.version())
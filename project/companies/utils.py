@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models import F
+
+from companies.models import StructureMember, StructureMemberPath
+
+# Поля члена структуры в ответах иерархии (выбираются через таблицу замыкания)
+NODE_FIELDS = ('id', 'position', 'role', 'parent_id')
+
+
+class Hierarchy:
+    """
+    Иерархия членов организационной структуры на таблице замыкания.
+    Начальники, подчиненные и поддерево любой глубины выбираются одним запросом
+    """
+
+    # Метод для добавления члена структуры в подчинение parent (или корневым при parent=None).
+    # Связи с начальниками копируются из связей parent с увеличением уровня подчинения
+    @staticmethod
+    def add_member(member: StructureMember) -> StructureMember:
+        with transaction.atomic():
+            member.save()
+            paths = [StructureMemberPath(ancestor_id=member.id, descendant_id=member.id, depth=0)]
+            if member.parent_id is not None:
+                paths += [StructureMemberPath(ancestor_id=ancestor, descendant_id=member.id, depth=depth + 1)
+                          for ancestor, depth in (StructureMemberPath.objects
+                                                  .filter(descendant_id=member.parent_id)
+                                                  .values_list('ancestor_id', 'depth'))]
+            StructureMemberPath.objects.bulk_create(paths)
+        return member
+
+    # Метод для удаления члена структуры. Подчиненные переходят к его начальнику,
+    # уровень подчинения между начальниками и подчиненными удаленного уменьшается на 1
+    @staticmethod
+    def remove_member(member: StructureMember) -> None:
+        with transaction.atomic():
+            StructureMember.objects.filter(parent_id=member.id).update(parent_id=member.parent_id)
+            (StructureMemberPath.objects
+             .filter(ancestor_id__in=(StructureMemberPath.objects
+                                      .filter(descendant_id=member.id, depth__gt=0)
+                                      .values('ancestor_id')),
+                     descendant_id__in=(StructureMemberPath.objects
+                                        .filter(ancestor_id=member.id, depth__gt=0)
+                                        .values('descendant_id')))
+             .update(depth=F('depth') - 1))
+            member.delete()
+
+    # Метод для перевода члена структуры вместе с подчиненными к новому начальнику member.parent.
+    # Связи поддерева с прежними начальниками удаляются, с новыми - создаются по связям member.parent
+    @staticmethod
+    def move_member(member: StructureMember) -> StructureMember:
+        with transaction.atomic():
+            member.save()
+            subtree = StructureMemberPath.objects.filter(ancestor_id=member.id)
+            (StructureMemberPath.objects
+             .filter(descendant_id__in=subtree.values('descendant_id'))
+             .exclude(ancestor_id__in=subtree.values('descendant_id'))
+             .delete())
+            if member.parent_id is not None:
+                descendants = list(subtree.values_list('descendant_id', 'depth'))
+                StructureMemberPath.objects.bulk_create(
+                    StructureMemberPath(ancestor_id=ancestor, descendant_id=descendant,
+                                        depth=ancestor_depth + descendant_depth + 1)
+                    for ancestor, ancestor_depth in (StructureMemberPath.objects
+                                                     .filter(descendant_id=member.parent_id)
+                                                     .values_list('ancestor_id', 'depth'))
+                    for descendant, descendant_depth in descendants)
+        return member
+
+    # Метод для проверки подчинения (любой глубины, включая совпадение) члена descendant_id члену ancestor_id
+    @staticmethod
+    def is_subordinate(descendant_id: int, ancestor_id: int) -> bool:
+        return StructureMemberPath.objects.filter(ancestor_id=ancestor_id, descendant_id=descendant_id).exists()
+
+    # Метод для получения начальников члена структуры от непосредственного до корневого
+    @staticmethod
+    def ancestors(member_id: int) -> list[dict]:
+        paths = StructureMemberPath.objects.filter(descendant_id=member_id).order_by('depth')
+        return Hierarchy.without_member(Hierarchy.nodes(paths, 'ancestor'))
+
+    # Метод для получения подчиненных члена структуры (всех или до уровня max_depth) по уровням
+    @staticmethod
+    def descendants(member_id: int, max_depth: int | None = None) -> list[dict]:
+        return Hierarchy.without_member(Hierarchy.subordinates(member_id, max_depth))
+
+    # Метод для получения поддерева члена структуры в виде вложенных узлов (children)
+    @staticmethod
+    def subtree(member_id: int) -> dict:
+        rows = Hierarchy.subordinates(member_id)
+        Hierarchy.without_member(rows)
+        nodes = {}
+        # Строки упорядочены по уровню подчинения, поэтому начальник узла уже добавлен
+        for row in rows:
+            row['children'] = []
+            nodes[row['id']] = row
+            if row['depth']:
+                nodes[row['parent']]['children'].append(row)
+        return rows[0]
+
+    # Метод для выборки члена структуры и его подчиненных одним запросом по индексу (ancestor, depth)
+    @staticmethod
+    def subordinates(member_id: int, max_depth: int | None = None) -> list[dict]:
+        paths = StructureMemberPath.objects.filter(ancestor_id=member_id)
+        if max_depth is not None:
+            paths = paths.filter(depth__lte=max_depth)
+        return Hierarchy.nodes(paths.order_by('depth', 'descendant_id'), 'descendant')
+
+    # Метод для выборки членов структуры со стороны side связей (ancestor/descendant) с уровнем подчинения
+    @staticmethod
+    def nodes(paths, side: str) -> list[dict]:
+        return [{'id': member, 'position': position, 'role': role, 'parent': parent, 'depth': depth}
+                for member, position, role, parent, depth
+                in paths.values_list(*(f'{side}__{i}' for i in NODE_FIELDS), 'depth')]
+
+    # Метод для исключения из результата связи члена структуры с самим собой.
+    # Связь есть у каждого существующего члена, поэтому ее отсутствие означает неверный ID
+    @staticmethod
+    def without_member(rows: list[dict]) -> list[dict]:
+        if not rows or rows[0]['depth'] != 0:
+            raise StructureMember.DoesNotExist('Structure member not found')
+        return rows[1:]
@@ -1,16 +1,24 @@
 from http import HTTPMethod
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse, OpenApiParameter
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from companies.cache import read_cache
 from companies.models import Company, Structure, StructureMember
 from companies.serializers import CompanySerializer, StructureSerializer, StructureMemberSerializer, \
-    SuccessResponseWithMember
+    SuccessResponseWithMember, HierarchyMemberSerializer, HierarchyQuerySerializer, SuccessResponseWithHierarchy, \
+    SuccessResponseWithSubtree, StructureDetailSerializer, StructureDetailWithProfilesSerializer, \
+    StructureQuerySerializer
+from companies.utils import Hierarchy
+from accounts.models import Profile
 from accounts.serializers import Error400Response, SuccessResponse, Error404Response
 
 
@@ -21,7 +29,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
     """
 
     serializer_class = CompanySerializer
-    queryset = Company.objects.all()
+    queryset = Company.objects.select_related('structure')
     permission_classes = [IsAdminUser]
     # Разрешенные методы класса
     http_method_names = ['head', 'options', 'get', 'post', 'delete', ]
@@ -64,12 +72,14 @@ class CompanyViewSet(viewsets.ModelViewSet):
                    ],
                    )
     def retrieve(self, request: Request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        return Response(read_cache.get_or_load(f'company:{kwargs.get('pk')}',
+                                               lambda: self.get_serializer(self.get_object()).data))
 
-    # Метод для получения списка компаний.
+    # Метод для получения списка компаний (ответ кэшируется до изменения компаний или структур).
     @extend_schema(summary='Получение списка компаний', )
     def list(self, request: Request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return Response(read_cache.get_or_load('company-list',
+                                               lambda: self.get_serializer(self.get_queryset(), many=True).data))
 
     # Метод для создания компании.
     @extend_schema(summary='Создание компании', )
@@ -112,10 +122,25 @@ class StructureViewSet(viewsets.ModelViewSet):
     # Метод для получения списка организационных структур.
     @extend_schema(summary='Получение списка организационных структур', )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return Response(read_cache.get_or_load('structure-list',
+                                               lambda: self.get_serializer(self.get_queryset(), many=True).data))
 
     # Метод для получения указанной организационной структуры.
+    # С expand - вместе с членами и компаниями (и их сотрудниками при profiles),
+    # связанные объекты загружаются отдельным запросом каждый независимо от размера структуры
     @extend_schema(summary='Получение указанной организационной структуры',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=StructureDetailWithProfilesSerializer,
+                           description='Организационная структура (members и companies - при expand, '
+                                       'profiles компаний - при profiles)'),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Некорректные параметры запроса'),
+                       status.HTTP_404_NOT_FOUND: OpenApiResponse(
+                           response=Error404Response,
+                           description='Структура не найдена'),
+                   },
                    parameters=[
                        OpenApiParameter(
                            name='id',
@@ -124,10 +149,49 @@ class StructureViewSet(viewsets.ModelViewSet):
                            required=True,
                            type=int
                        ),
+                       OpenApiParameter(
+                           name='expand',
+                           location=OpenApiParameter.QUERY,
+                           description='Добавить членов структуры и компании',
+                           required=False,
+                           type=bool
+                       ),
+                       OpenApiParameter(
+                           name='profiles',
+                           location=OpenApiParameter.QUERY,
+                           description='Добавить сотрудников компаний (вместе с expand)',
+                           required=False,
+                           type=bool
+                       ),
                    ],
                    )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        params = StructureQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if not params.validated_data['expand']:
+            return Response(read_cache.get_or_load(f'structure:{kwargs.get('pk')}',
+                                                   lambda: self.get_serializer(self.get_object()).data))
+
+        # Сотрудники компаний не отслеживаются сбросом кэша, поэтому такой ответ не кэшируется
+        if params.validated_data['profiles']:
+            return Response(self.get_expanded(kwargs.get('pk'), profiles=True))
+        return Response(read_cache.get_or_load(f'structure:{kwargs.get('pk')}:expanded',
+                                               lambda: self.get_expanded(kwargs.get('pk'), profiles=False)))
+
+    # Метод для получения структуры с членами и компаниями через prefetch_related
+    def get_expanded(self, pk, profiles: bool) -> dict:
+        companies = Company.objects.order_by('id')
+        if profiles:
+            companies = companies.prefetch_related(
+                Prefetch('profiles', queryset=Profile.objects.select_related('user').order_by('id')))
+        queryset = Structure.objects.prefetch_related(
+            Prefetch('members', queryset=StructureMember.objects.order_by('id')),
+            Prefetch('companies', queryset=companies))
+
+        structure = get_object_or_404(queryset, pk=pk)
+        self.check_object_permissions(self.request, structure)
+        serializer = StructureDetailWithProfilesSerializer if profiles else StructureDetailSerializer
+        return serializer(structure).data
 
     # Добавление члена организационной структуры
     @extend_schema(summary='Добавление члена организационной структуры',
@@ -147,6 +211,7 @@ class StructureViewSet(viewsets.ModelViewSet):
                            value={
                                'position': 'Инженер',
                                'role': 'Контроль инвентаризации объектов',
+                               'parent': 'ID начальника в структуре (необязательно)',
                                'subordinates': 'Техники',
                                'bosses': 'Главный инженер'
                            },
@@ -171,10 +236,15 @@ class StructureViewSet(viewsets.ModelViewSet):
             instance = StructureMember(**serializer.validated_data)
             structure = Structure.objects.get(pk=kwargs.get('pk'))
             instance.structure = structure
-            instance.save()
+
+            # Проверка принадлежности начальника к той же структуре
+            if instance.parent is not None and instance.parent.structure_id != structure.id:
+                raise ValidationError('Parent must be a member of the same structure')
+
+            Hierarchy.add_member(instance)
 
             return Response({'message': 'Успешное создание объекта.',
-                             'data': serializer.data
+                             'data': StructureMemberSerializer(instance).data
                              },
                             status=status.HTTP_201_CREATED, )
 
@@ -183,7 +253,8 @@ class StructureViewSet(viewsets.ModelViewSet):
                                         f'Детали ошибки: {error}'},
                             status=status.HTTP_400_BAD_REQUEST, )
 
-    # Удаление члена организационной структуры
+    # Удаление члена организационной структуры.
+    # Подчиненные удаленного члена переходят в подчинение его начальнику
     @extend_schema(summary='Удаление члена организационной структуры',
                    responses={
                        status.HTTP_200_OK: OpenApiResponse(
@@ -208,7 +279,7 @@ class StructureViewSet(viewsets.ModelViewSet):
     def delete_member(self, request: Request, *args, **kwargs) -> Response:
         try:
             instance = StructureMember.objects.get(pk=kwargs.get('pk'))
-            instance.delete()
+            Hierarchy.remove_member(instance)
 
             return Response({'message': 'Успешное удаление объекта.'},
                             status=status.HTTP_200_OK, )
@@ -216,3 +287,119 @@ class StructureViewSet(viewsets.ModelViewSet):
         except ObjectDoesNotExist:
             return Response({'message': 'Ошибка удаление члена структуры. Объект не найден'},
                             status=status.HTTP_404_NOT_FOUND)
+
+    # Начальники члена организационной структуры от непосредственного до корневого
+    @extend_schema(summary='Начальники члена организационной структуры',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=SuccessResponseWithHierarchy,
+                           description='Начальники члена структуры (depth - уровень подчинения)'),
+                       status.HTTP_404_NOT_FOUND: OpenApiResponse(
+                           response=Error404Response,
+                           description='Член структуры не найден'),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='id',
+                           location=OpenApiParameter.PATH,
+                           description='Параметр для указания ID члена структуры',
+                           required=True,
+                           type=int
+                       ),
+                   ],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=True, url_path='ancestors', )
+    def ancestors(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            result = HierarchyMemberSerializer(Hierarchy.ancestors(kwargs.get('pk')), many=True)
+
+            return Response({'message': f'Начальники члена структуры № {kwargs.get('pk')}',
+                             'data': result.data},
+                            status=status.HTTP_200_OK, )
+
+        except ObjectDoesNotExist:
+            return Response({'message': 'Ошибка получения начальников. Член структуры не найден'},
+                            status=status.HTTP_404_NOT_FOUND)
+
+    # Подчиненные члена организационной структуры всех уровней (или до уровня depth)
+    @extend_schema(summary='Подчиненные члена организационной структуры',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=SuccessResponseWithHierarchy,
+                           description='Подчиненные члена структуры по уровням подчинения'),
+                       status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+                           response=Error400Response,
+                           description='Некорректный уровень подчинения'),
+                       status.HTTP_404_NOT_FOUND: OpenApiResponse(
+                           response=Error404Response,
+                           description='Член структуры не найден'),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='id',
+                           location=OpenApiParameter.PATH,
+                           description='Параметр для указания ID члена структуры',
+                           required=True,
+                           type=int
+                       ),
+                       OpenApiParameter(
+                           name='depth',
+                           location=OpenApiParameter.QUERY,
+                           description='Максимальный уровень подчинения (1 - непосредственные подчиненные)',
+                           required=False,
+                           type=int
+                       ),
+                   ],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=True, url_path='descendants', )
+    def descendants(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            params = HierarchyQuerySerializer(data=request.query_params)
+            params.is_valid(raise_exception=True)
+            result = HierarchyMemberSerializer(Hierarchy.descendants(kwargs.get('pk'),
+                                                                     params.validated_data.get('depth')),
+                                               many=True)
+
+            return Response({'message': f'Подчиненные члена структуры № {kwargs.get('pk')}',
+                             'data': result.data},
+                            status=status.HTTP_200_OK, )
+
+        except ObjectDoesNotExist:
+            return Response({'message': 'Ошибка получения подчиненных. Член структуры не найден'},
+                            status=status.HTTP_404_NOT_FOUND)
+        except Exception as error:
+            return Response({'message': f'Ошибка получения подчиненных.'
+                                        f'Детали ошибки: {error}'},
+                            status=status.HTTP_400_BAD_REQUEST, )
+
+    # Поддерево подчиненных члена организационной структуры (вложенные узлы children).
+    # Узлы формируются без сериализатора: поддерево может содержать тысячи членов
+    @extend_schema(summary='Поддерево подчиненных члена организационной структуры',
+                   responses={
+                       status.HTTP_200_OK: OpenApiResponse(
+                           response=SuccessResponseWithSubtree,
+                           description='Член структуры с вложенными подчиненными'),
+                       status.HTTP_404_NOT_FOUND: OpenApiResponse(
+                           response=Error404Response,
+                           description='Член структуры не найден'),
+                   },
+                   parameters=[
+                       OpenApiParameter(
+                           name='id',
+                           location=OpenApiParameter.PATH,
+                           description='Параметр для указания ID члена структуры',
+                           required=True,
+                           type=int
+                       ),
+                   ],
+                   )
+    @action(methods=[HTTPMethod.GET, ], detail=True, url_path='subtree', )
+    def subtree(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            return Response({'message': f'Поддерево подчиненных члена структуры № {kwargs.get('pk')}',
+                             'data': Hierarchy.subtree(kwargs.get('pk'))},
+                            status=status.HTTP_200_OK, )
+
+        except ObjectDoesNotExist:
+            return Response({'message': 'Ошибка получения поддерева. Член структуры не найден'},
+                            status=status.HTTP_404_NOT_FOUND)
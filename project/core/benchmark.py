@@ -0,0 +1,153 @@
+import http.client
+import itertools
+import json
+import random
+import statistics
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from typing import Callable
+
+
+def summarize(timings: list[float]) -> dict:
+    """
+    Сводная статистика по замерам времени (в миллисекундах)
+    """
+    timings = sorted(timings)
+    return {
+        'runs': len(timings),
+        'min': round(timings[0], 3),
+        'median': round(statistics.median(timings), 3),
+        'p95': round(percentile(timings, 95), 3),
+        'p99': round(percentile(timings, 99), 3),
+        'max': round(timings[-1], 3),
+    }
+
+
+def percentile(timings: list[float], value: float) -> float:
+    """
+    Перцентиль по отсортированному списку замеров
+    """
+    index = min(len(timings) - 1, round(value / 100 * (len(timings) - 1)))
+    return timings[index]
+
+
+def measure(func: Callable, repeat: int = 100) -> dict:
+    """
+    Многократный замер времени выполнения функции
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return summarize(timings)
+
+
+def run_load(url: str, headers: dict | None = None, concurrency: int = 16, requests: int = 1000) -> dict:
+    """
+    Нагрузка на HTTP-адрес параллельными клиентами (keep-alive соединение на клиента).
+    Возвращает пропускную способность (запросов в секунду), статистику задержек и число ошибок
+    """
+    target = urllib.parse.urlsplit(url)
+    path = target.path + (f'?{target.query}' if target.query else '')
+    counter = itertools.count()
+    timings, errors = [], Counter()
+    lock = threading.Lock()
+
+    def client():
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        local_timings, local_errors = [], Counter()
+        while next(counter) < requests:
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers or {})
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors[response.status] += 1
+            except (OSError, http.client.HTTPException) as error:
+                local_errors[type(error).__name__] += 1
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+            local_timings.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with lock:
+            timings.extend(local_timings)
+            errors.update(local_errors)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {'rps': round(len(timings) / elapsed, 1), **summarize(timings), 'errors': dict(errors)}
+
+
+def run_scenario(url: str, scenario: Callable, concurrency: int = 16, requests: int = 1000,
+                 seed: int = 0) -> dict:
+    """
+    Нагрузка смесью запросов параллельными клиентами (keep-alive соединение на клиента).
+    scenario(rng) возвращает очередной запрос: (операция, метод, путь, заголовки, тело JSON или None).
+    Возвращает общую и пооперационную пропускную способность, статистику задержек и коды ответов.
+    Ошибками считаются ответы 5xx и ошибки соединения, ответы 4xx учитываются в кодах ответов
+    """
+    target = urllib.parse.urlsplit(url)
+    counter = itertools.count()
+    timings, statuses, errors = {}, {}, Counter()
+    lock = threading.Lock()
+
+    def client(number: int):
+        rng = random.Random(seed * 1_000_003 + number)
+        connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        local_timings, local_statuses, local_errors = {}, {}, Counter()
+        while next(counter) < requests:
+            operation, method, path, headers, body = scenario(rng)
+            if body is not None:
+                headers = {**headers, 'Content-Type': 'application/json'}
+                body = json.dumps(body)
+            started = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                code = response.status
+                if code >= 500:
+                    local_errors[code] += 1
+            except (OSError, http.client.HTTPException) as error:
+                code = type(error).__name__
+                local_errors[code] += 1
+                connection.close()
+                connection = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+            local_timings.setdefault(operation, []).append((time.perf_counter() - started) * 1000)
+            local_statuses.setdefault(operation, Counter())[code] += 1
+        connection.close()
+        with lock:
+            for operation, values in local_timings.items():
+                timings.setdefault(operation, []).extend(values)
+                statuses.setdefault(operation, Counter()).update(local_statuses[operation])
+            errors.update(local_errors)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = [i for values in timings.values() for i in values]
+    return {
+        'duration': round(elapsed, 3),
+        'rps': round(len(total) / elapsed, 1),
+        **summarize(total),
+        'errors': {str(key): value for key, value in errors.items()},
+        'operations': {operation: {'rps': round(len(values) / elapsed, 1),
+                                   **summarize(values),
+                                   'statuses': {str(key): value for key, value in statuses[operation].items()}}
+                       for operation, values in sorted(timings.items())},
+    }
@@ -0,0 +1,26 @@
+from django.db import connections
+
+
+def pool_stats(alias: str = 'default') -> dict | None:
+    """
+    Статистика пула соединений с БД текущего процесса (None, если пул не используется).
+    Счетчики requests, timeouts, wait_ms, connections накапливаются с запуска процесса
+    """
+    pool = connections[alias].pool
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    return {
+        'max_size': stats.get('pool_max', 0),
+        'size': stats.get('pool_size', 0),
+        'available': stats.get('pool_available', 0),
+        'in_use': stats.get('pool_size', 0) - stats.get('pool_available', 0),
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        # Ошибки получения соединения (в основном превышение DB_POOL_TIMEOUT)
+        'timeouts': stats.get('requests_errors', 0),
+        'wait_ms': stats.get('requests_wait_ms', 0),
+        'connections': stats.get('connections_num', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+    }
@@ -0,0 +1,30 @@
+"""
+Конфигурация gunicorn для запуска ASGI-приложения в production (воркеры uvicorn).
+Запуск из каталога project: gunicorn core.asgi:application -c core/gunicorn.conf.py
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = 'uvicorn.workers.UvicornWorker'
+# Количество процессов (по умолчанию 2 * CPU + 1)
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Периодический перезапуск воркеров ограничивает рост памяти
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+# Каталог снимков метрик воркеров: /metrics любого воркера объединяет метрики всех воркеров
+metrics_dir = os.environ['METRICS_DIR'] = (os.getenv('METRICS_DIR')
+                                           or os.path.join(tempfile.gettempdir(), 'business-metrics'))
+
+
+# Снимки метрик предыдущего запуска не учитываются
+def on_starting(server):
+    shutil.rmtree(metrics_dir, ignore_errors=True)
@@ -0,0 +1,422 @@
+import atexit
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+from core.db import pool_stats
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Границы интервалов гистограмм (секунды и количество запросов к БД)
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+HISTOGRAMS = {
+    'django_view_duration_seconds': ('Длительность обработки запроса по обработчикам', SECONDS_BUCKETS),
+    'django_view_db_queries': ('Количество SQL-запросов на запрос по обработчикам', QUERIES_BUCKETS),
+    'django_view_db_duration_seconds': ('Время выполнения SQL на запрос по обработчикам', SECONDS_BUCKETS),
+}
+
+
+class Histogram:
+    """
+    Гистограмма в формате Prometheus (счетчики по интервалам, сумма и количество наблюдений)
+    """
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: 'Histogram') -> None:
+        for index, value in enumerate(other.counts):
+            self.counts[index] += value
+        self.sum += other.sum
+        self.count += other.count
+
+
+class MetricsRegistry:
+    """
+    Хранилище метрик процесса-воркера.
+    Каждый поток пишет в собственный набор гистограмм без блокировок,
+    наборы объединяются только при выгрузке метрик
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.shards = []
+        self.retired = {}
+
+    # Метод для получения набора гистограмм текущего потока (блокировка только при первом обращении потока)
+    def shard(self) -> dict:
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = self.local.shard = {}
+            with self.lock:
+                self.shards.append((threading.current_thread(), shard))
+        return shard
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        shard = self.shard()
+        histogram = shard.get((name, labels))
+        if histogram is None:
+            histogram = shard[(name, labels)] = Histogram(HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+    # Метод для объединения гистограмм всех потоков. Наборы завершившихся потоков
+    # переносятся в общий итог, поэтому память не растет с количеством потоков
+    def collect(self) -> dict:
+        with self.lock:
+            alive = []
+            for thread, shard in self.shards:
+                if thread.is_alive():
+                    alive.append((thread, shard))
+                else:
+                    self.merge(self.retired, shard)
+            self.shards = alive
+            result = {}
+            self.merge(result, self.retired)
+            for _, shard in alive:
+                self.merge(result, dict(shard))
+        return result
+
+    @staticmethod
+    def merge(target: dict, source: dict) -> None:
+        for key, histogram in list(source.items()):
+            if key not in target:
+                target[key] = Histogram(histogram.buckets)
+            target[key].merge(histogram)
+
+    def clear(self) -> None:
+        with self.lock:
+            for _, shard in self.shards:
+                shard.clear()
+            self.retired.clear()
+
+
+registry = MetricsRegistry()
+
+
+class CacheCounters:
+    """
+    Счетчики попаданий и промахов кэшей чтения процесса-воркера
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, name: str, hit: bool) -> None:
+        with self.lock:
+            hits, misses = self.counts.get(name, (0, 0))
+            self.counts[name] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+    # Метод для получения количества попаданий, промахов и доли попаданий кэша
+    def stats(self, name: str) -> dict:
+        with self.lock:
+            hits, misses = self.counts.get(name, (0, 0))
+        return {'hits': hits, 'misses': misses,
+                'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0.0}
+
+    def clear(self) -> None:
+        with self.lock:
+            self.counts.clear()
+
+
+cache_counters = CacheCounters()
+
+
+class RequestStats:
+    """
+    Счетчики SQL-запросов текущего запроса клиента
+    """
+    __slots__ = ('queries', 'sql_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+
+
+# Счетчики текущего запроса (контекст копируется в потоки sync_to_async)
+request_stats = contextvars.ContextVar('request_stats', default=None)
+
+
+def sql_timer(execute, sql, params, many, context):
+    """
+    Обертка выполнения SQL для подсчета количества и времени запросов текущего запроса клиента
+    """
+    stats = request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_time += time.perf_counter() - started
+
+
+def install_sql_timer(sender, connection, **kwargs) -> None:
+    """
+    Подключение обертки SQL к каждому новому соединению (первой, чтобы не мешать execute_wrapper())
+    """
+    if sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, sql_timer)
+
+
+connection_created.connect(install_sql_timer, dispatch_uid='core.metrics.install_sql_timer')
+
+
+def view_name(request) -> str:
+    """
+    Имя обработчика запроса: Класс.действие для ViewSet, имя класса или функции для остальных
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unresolved>'
+    func = match.func
+    view = getattr(func, 'view_class', None) or getattr(func, 'cls', None)
+    if view is None:
+        return func.__name__
+    actions = getattr(func, 'actions', None)
+    if actions:
+        return f'{view.__name__}.{actions.get(request.method.lower(), request.method.lower())}'
+    return view.__name__
+
+
+class MetricsSnapshot:
+    """
+    Метрики процесса-воркера в виде, пригодном для сохранения в JSON и объединения с другими воркерами.
+    Гистограммы и счетчики суммируются, показатели пула соединений учитываются только у работающих
+    воркеров (у завершившихся - только накопленные счетчики timeouts и wait_ms)
+    """
+    POOL_COUNTERS = ('timeouts', 'wait_ms')
+
+    def __init__(self, histograms: dict | None = None, caches: dict | None = None, pool: dict | None = None,
+                 workers: int = 0):
+        self.histograms = histograms or {}
+        self.caches = caches or {}
+        self.pool = pool
+        self.workers = workers
+
+    # Метод для получения снимка метрик текущего процесса
+    @classmethod
+    def current(cls) -> 'MetricsSnapshot':
+        with cache_counters.lock:
+            caches = dict(cache_counters.counts)
+        return cls(registry.collect(), caches, pool_stats(), workers=1)
+
+    def to_json(self) -> dict:
+        return {'histograms': [[name, labels, histogram.counts, histogram.sum, histogram.count]
+                               for (name, labels), histogram in self.histograms.items()],
+                'caches': self.caches, 'pool': self.pool, 'workers': self.workers}
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'MetricsSnapshot':
+        histograms = {}
+        for name, labels, counts, total, count in data['histograms']:
+            if name not in HISTOGRAMS:
+                continue
+            histogram = Histogram(HISTOGRAMS[name][1])
+            histogram.counts, histogram.sum, histogram.count = counts, total, count
+            histograms[(name, tuple(tuple(i) for i in labels))] = histogram
+        return cls(histograms, {name: tuple(value) for name, value in data['caches'].items()},
+                   data['pool'], data['workers'])
+
+    # Метод для добавления метрик другого воркера (live=False - воркер завершился)
+    def merge(self, other: 'MetricsSnapshot', live: bool = True) -> None:
+        MetricsRegistry.merge(self.histograms, other.histograms)
+        for name, (hits, misses) in other.caches.items():
+            total_hits, total_misses = self.caches.get(name, (0, 0))
+            self.caches[name] = (total_hits + hits, total_misses + misses)
+        if other.pool is not None:
+            pool = other.pool if live else {key: other.pool.get(key, 0) for key in self.POOL_COUNTERS}
+            self.pool = dict(self.pool or {})
+            for key, value in pool.items():
+                self.pool[key] = self.pool.get(key, 0) + value
+        if live:
+            self.workers += other.workers
+
+
+class MetricsStore:
+    """
+    Общий для воркеров каталог метрик METRICS['DIR'] (без каталога - метрики только текущего процесса).
+    Каждый воркер сохраняет снимок своих метрик в {pid}.json не чаще METRICS['FLUSH_INTERVAL'] секунд,
+    /metrics объединяет снимки всех воркеров. Снимки завершившихся воркеров переносятся в archive.json,
+    поэтому счетчики и гистограммы не уменьшаются при перезапуске воркеров
+    """
+    ARCHIVE = 'archive.json'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flushed = 0.0
+        self.timer = None
+
+    @property
+    def directory(self) -> Path | None:
+        directory = settings.METRICS.get('DIR')
+        return Path(directory) if directory else None
+
+    # Метод для сохранения снимка метрик процесса (force - без учета интервала).
+    # Наблюдения внутри интервала сохраняются отложенно, поэтому снимок простаивающего воркера не устаревает
+    def flush(self, force: bool = False) -> None:
+        directory = self.directory
+        if directory is None:
+            return
+        now = time.monotonic()
+        interval = settings.METRICS.get('FLUSH_INTERVAL', 1)
+        if not force and now - self.flushed < interval:
+            if self.timer is None:
+                self.timer = threading.Timer(interval, self.flush, kwargs={'force': True})
+                self.timer.daemon = True
+                self.timer.start()
+            return
+        if not self.lock.acquire(blocking=force):
+            return
+        try:
+            self.flushed, self.timer = now, None
+            self.write(directory / f'{os.getpid()}.json', MetricsSnapshot.current())
+        finally:
+            self.lock.release()
+
+    # Метод для объединения метрик всех воркеров
+    def collect(self) -> MetricsSnapshot:
+        directory = self.directory
+        if directory is None:
+            return MetricsSnapshot.current()
+
+        self.flush(force=True)
+        with self.exclusive(directory):
+            archive = self.read(directory / self.ARCHIVE) or MetricsSnapshot()
+            total = MetricsSnapshot()
+            total.merge(archive, live=False)
+            retired = False
+            for path in sorted(directory.glob('*.json')):
+                snapshot = self.read(path) if path.stem.isdigit() else None
+                if snapshot is None:
+                    continue
+                if self.alive(int(path.stem)):
+                    total.merge(snapshot)
+                    continue
+                archive.merge(snapshot, live=False)
+                total.merge(snapshot, live=False)
+                path.unlink()
+                retired = True
+            if retired:
+                self.write(directory / self.ARCHIVE, archive)
+        return total
+
+    @staticmethod
+    def read(path: Path) -> MetricsSnapshot | None:
+        try:
+            return MetricsSnapshot.from_json(json.loads(path.read_text()))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    # Метод для атомарной записи снимка (чтение никогда не видит частично записанный файл)
+    @staticmethod
+    def write(path: Path, snapshot: MetricsSnapshot) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(snapshot.to_json()))
+        os.replace(temporary, path)
+
+    # Блокировка каталога на время объединения снимков (между процессами)
+    @staticmethod
+    @contextlib.contextmanager
+    def exclusive(directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @staticmethod
+    def alive(pid: int) -> bool:
+        # На Windows os.kill завершает процесс, а не проверяет его
+        if pid == os.getpid() or os.name == 'nt':
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+
+store = MetricsStore()
+# Последние метрики завершающегося воркера сохраняются для объединения
+atexit.register(store.flush, True)
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render() -> str:
+    """
+    Выгрузка метрик всех воркеров в текстовом формате Prometheus
+    """
+    snapshot = store.collect()
+    lines = []
+    for name, (description, buckets) in HISTOGRAMS.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+        for (metric, labels), histogram in sorted(snapshot.histograms.items()):
+            if metric != name:
+                continue
+            label = ','.join(f'{key}="{escape(value)}"' for key, value in labels)
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{label}}} {histogram.count}')
+
+    if snapshot.caches:
+        lines += ['# HELP django_read_cache_requests_total Обращения к кэшам чтения по результату',
+                  '# TYPE django_read_cache_requests_total counter']
+        for name, (hits, misses) in sorted(snapshot.caches.items()):
+            lines += [f'django_read_cache_requests_total{{cache="{escape(name)}",result="hit"}} {hits}',
+                      f'django_read_cache_requests_total{{cache="{escape(name)}",result="miss"}} {misses}']
+
+    stats = snapshot.pool
+    if stats is not None and 'in_use' in stats:
+        lines += ['# HELP django_db_pool_connections Соединения пулов БД работающих воркеров',
+                  '# TYPE django_db_pool_connections gauge',
+                  f'django_db_pool_connections{{state="in_use"}} {stats['in_use']}',
+                  f'django_db_pool_connections{{state="available"}} {stats['available']}',
+                  f'django_db_pool_connections{{state="max"}} {stats['max_size']}',
+                  '# HELP django_db_pool_requests_waiting Запросы, ожидающие соединение пула БД',
+                  '# TYPE django_db_pool_requests_waiting gauge',
+                  f'django_db_pool_requests_waiting {stats['waiting']}',
+                  '# HELP django_db_pool_timeouts_total Ошибки получения соединения из пула БД',
+                  '# TYPE django_db_pool_timeouts_total counter',
+                  f'django_db_pool_timeouts_total {stats['timeouts']}',
+                  '# HELP django_db_pool_wait_seconds_total Суммарное ожидание соединения пула БД',
+                  '# TYPE django_db_pool_wait_seconds_total counter',
+                  f'django_db_pool_wait_seconds_total {stats['wait_ms'] / 1000}']
+
+    lines += ['# HELP django_metrics_workers Работающие воркеры, метрики которых объединены',
+              '# TYPE django_metrics_workers gauge',
+              f'django_metrics_workers {snapshot.workers}']
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,72 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core.metrics import RequestStats, install_sql_timer, registry, request_stats, store, view_name
+
+
+class MetricsMiddleware:
+    """
+    Сбор метрик по обработчикам: длительность запроса, количество и время SQL-запросов.
+    Метрики выгружаются на /metrics (по всем воркерам при METRICS['DIR']),
+    при METRICS['SERVER_TIMING'] также в заголовке Server-Timing.
+    Поддерживает синхронную и асинхронную обработку без переключения между ними
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        return self.finish(request, response, stats, started)
+
+    async def __acall__(self, request):
+        stats, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_stats.reset(token)
+        return self.finish(request, response, stats, started)
+
+    # Метод для начала учета запроса. Обертка SQL подключается к уже открытым соединениям потока,
+    # новые соединения получают ее при создании
+    @staticmethod
+    def start():
+        for connection in connections.all(initialized_only=True):
+            install_sql_timer(None, connection)
+        stats = RequestStats()
+        return stats, request_stats.set(stats), time.perf_counter()
+
+    # Метод для учета метрик завершенного запроса
+    @staticmethod
+    def finish(request, response, stats: RequestStats, started: float):
+        duration = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name == 'metrics':
+            return response
+
+        labels = (('view', view_name(request)), ('method', request.method))
+        registry.observe('django_view_duration_seconds', labels, duration)
+        registry.observe('django_view_db_queries', labels, stats.queries)
+        registry.observe('django_view_db_duration_seconds', labels, stats.sql_time)
+        store.flush()
+
+        if settings.METRICS['SERVER_TIMING']:
+            response['Server-Timing'] = (f'app;dur={duration * 1000:.1f}, '
+                                         f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.queries} queries"')
+        return response
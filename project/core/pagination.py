@@ -0,0 +1,42 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по первичному ключу.
+    Стоимость получения любой страницы не зависит от ее номера
+    """
+    ordering = 'id'
+    page_size = settings.PAGINATION['PAGE_SIZE']
+    page_size_query_param = 'page_size'
+    max_page_size = settings.PAGINATION['MAX_PAGE_SIZE']
+
+
+class NewestCursorPagination(IdCursorPagination):
+    """
+    Курсорная пагинация от новых записей к старым
+    """
+    ordering = '-id'
+
+
+class DeadlineCursorPagination(IdCursorPagination):
+    """
+    Курсорная пагинация задач по сроку выполнения (индекс task_deadline_idx).
+    Первичный ключ задает порядок задач с одинаковым сроком
+    """
+    ordering = ('deadline', 'id')
+
+
+class FeedCursorPagination(IdCursorPagination):
+    """
+    Курсорная пагинация ленты новостей по дате создания (индекс news_created_at_idx)
+    """
+    ordering = ('-created_at', '-id')
+
+
+class MeetingCursorPagination(IdCursorPagination):
+    """
+    Курсорная пагинация встреч по времени начала (индекс meeting_start_at_idx)
+    """
+    ordering = ('start_at', 'id')
@@ -0,0 +1,20 @@
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+
+class ChunkedStreamingHttpResponse(StreamingHttpResponse):
+    """
+    Потоковый ответ с синхронным итератором для WSGI и ASGI.
+    Под ASGI StreamingHttpResponse собирает синхронный итератор в список до отправки первого байта,
+    здесь фрагменты получаются по одному в потоке обработчика (thread_sensitive) и сразу отправляются
+    """
+
+    async def __aiter__(self):
+        if self.is_async:
+            async for part in super().__aiter__():
+                yield part
+            return
+
+        iterator, end = iter(self.streaming_content), object()
+        while (part := await sync_to_async(next)(iterator, end)) is not end:
+            yield part
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -8,9 +9,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv('SECRET_KEY')
 
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'True').lower() in ('1', 'true', 'yes')
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [i.strip() for i in os.getenv('ALLOWED_HOSTS', '').split(',') if i.strip()]
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -19,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
@@ -30,6 +32,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -67,12 +70,37 @@ WSGI_APPLICATION = 'core.wsgi.application'
 #     }
 # }
 
+# Соединения с БД.
+# DB_POOL - пул соединений psycopg_pool в каждом процессе-воркере (по умолчанию),
+# иначе постоянные соединения на DB_CONN_MAX_AGE секунд. Перед использованием соединения проверяются.
+# Размер пула по умолчанию - доля DB_MAX_CONNECTIONS на один из WEB_CONCURRENCY воркеров.
+# DB_SERVER_SIDE_BINDING - серверная подстановка параметров и подготовленные запросы для запросов,
+# выполненных в соединении DB_PREPARE_THRESHOLD раз (несовместимо с PgBouncer в режиме транзакций)
+DB_POOL = os.getenv('DB_POOL', 'True').lower() in ('1', 'true', 'yes')
+DB_OPTIONS = {}
+if DB_POOL:
+    DB_OPTIONS['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE',
+                                  max(int(os.getenv('DB_MAX_CONNECTIONS', 80))
+                                      // int(os.getenv('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1)), 4))),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 600)),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 3600)),
+    }
+if os.getenv('DB_SERVER_SIDE_BINDING', 'False').lower() in ('1', 'true', 'yes'):
+    DB_OPTIONS['server_side_binding'] = True
+    DB_OPTIONS['prepare_threshold'] = int(os.getenv('DB_PREPARE_THRESHOLD', 5))
+
 DATABASES = {'default': {'ENGINE': 'django.db.backends.postgresql',
                          'NAME': os.getenv('DB_NAME'),
                          'USER': os.getenv('DB_USER'),
                          'PASSWORD': os.getenv('DB_PASSWORD'),
                          'HOST': os.getenv('DB_HOST'),
                          'PORT': os.getenv('DB_PORT'),
+                         'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+                         'CONN_HEALTH_CHECKS': True,
+                         'OPTIONS': DB_OPTIONS,
                          },
              }
 
@@ -117,7 +145,96 @@ SPECTACULAR_SETTINGS = {
 # Настройки аутентификации
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
+
+# Настройки курсорной пагинации списков
+PAGINATION = {
+    'PAGE_SIZE': int(os.getenv('PAGE_SIZE', 100)),
+    'MAX_PAGE_SIZE': int(os.getenv('MAX_PAGE_SIZE', 1000)),
+}
+
+# Настройки кэширования токенов аутентификации.
+# CACHE_ALIAS - общий для воркеров кэш из CACHES (пустое значение - только кэш процесса),
+# TTL - время жизни записей общего кэша, LOCAL_TTL - время жизни записей в памяти процесса (секунды).
+# Сброс токена (блокировка, удаление, изменение профиля) виден в других воркерах не позже чем через LOCAL_TTL
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.getenv('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.getenv('TOKEN_AUTH_CACHE_TTL', 60)),
+    'LOCAL_TTL': int(os.getenv('TOKEN_AUTH_CACHE_LOCAL_TTL', 5)),
+    'CACHE_ALIAS': os.getenv('TOKEN_AUTH_CACHE_ALIAS', 'tokens') or None,
+}
+
+
+# Кэши: default - память процесса, companies - кэш чтения компаний и структур,
+# leaderboard - рейтинги сотрудников компаний, tokens - общий уровень кэша токенов.
+# {NAME}_CACHE_BACKEND выбирает хранилище:
+# file - файловый кэш в {NAME}_CACHE_DIR, общий для воркеров только на одном хосте
+# (каждая запись сканирует каталог кэша, подходит для тысяч записей),
+# database - таблица в БД (общая для всех хостов, создается командой createcachetable),
+# redis - Redis по адресу {NAME}_CACHE_URL или REDIS_URL (общий для всех хостов, требует пакет redis),
+# locmem - кэш в памяти процесса (у каждого воркера свой, изменения в других воркерах видны по истечении TTL).
+# {NAME}_CACHE_MAX_ENTRIES - предел записей для file, database и locmem, при превышении удаляется треть записей
+def cache_backend(name: str, default: str, max_entries: int) -> dict:
+    options = {'OPTIONS': {'MAX_ENTRIES': int(os.getenv(f'{name.upper()}_CACHE_MAX_ENTRIES', max_entries))}}
+    backends = {
+        'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                   'LOCATION': name, **options},
+        'file': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                 'LOCATION': os.getenv(f'{name.upper()}_CACHE_DIR',
+                                       Path(tempfile.gettempdir()) / f'business-{name}-cache'),
+                 **options},
+        'database': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                     'LOCATION': f'business_{name}_cache', **options},
+        'redis': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                  'LOCATION': os.getenv(f'{name.upper()}_CACHE_URL',
+                                        os.getenv('REDIS_URL', 'redis://localhost:6379/0')),
+                  'KEY_PREFIX': name},
+    }
+    return backends[os.getenv(f'{name.upper()}_CACHE_BACKEND', default)]
+
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    # Версии данных компаний и рейтинга сдвигаются при изменениях, поэтому кэши общие для воркеров
+    'companies': cache_backend('companies', 'file', 10000),
+    'leaderboard': cache_backend('leaderboard', 'file', 10000),
+    # Предел записей общего кэша токенов совпадает с размером кэша процесса
+    'tokens': cache_backend('tokens', 'file', TOKEN_AUTH_CACHE['MAX_SIZE']),
+}
+
+# Настройки кэша чтения компаний и организационных структур.
+# TTL - время жизни записей (секунды), записи прежних версий данных удаляются по его истечении
+COMPANIES_CACHE = {
+    'CACHE_ALIAS': 'companies',
+    'TTL': int(os.getenv('COMPANIES_CACHE_TTL', 300)),
+}
+
+# Время жизни кэша рейтингов сотрудников компаний (секунды)
+LEADERBOARD_CACHE_TTL = int(os.getenv('LEADERBOARD_CACHE_TTL', 3600))
+
+# Настройки пакетного импорта сотрудников.
+# WORKERS - размер общего пула процессов хеширования паролей в каждом воркере (пул создается
+# при первом импорте, по умолчанию - доля CPU на один из WEB_CONCURRENCY воркеров, 1 - хеширование в потоке запроса),
+# CHUNK_SIZE - количество строк, сохраняемых в БД одной транзакцией
+EMPLOYEE_IMPORT = {
+    'WORKERS': int(os.getenv('EMPLOYEE_IMPORT_WORKERS',
+                             max((os.cpu_count() or 1)
+                                 // int(os.getenv('WEB_CONCURRENCY', (os.cpu_count() or 1) * 2 + 1)), 1))),
+    'CHUNK_SIZE': int(os.getenv('EMPLOYEE_IMPORT_CHUNK_SIZE', 500)),
+}
+
+# Метрики обработчиков в формате Prometheus (/metrics).
+# SERVER_TIMING - заголовок Server-Timing с длительностью запроса и SQL,
+# TOKEN - Bearer-токен для доступа к /metrics (без токена доступ открыт только при DEBUG),
+# DIR - общий для воркеров каталог снимков метрик (задается в core/gunicorn.conf.py, без него /metrics
+# отдает метрики только обработавшего запрос процесса), FLUSH_INTERVAL - период сохранения снимка воркера (секунды)
+METRICS = {
+    'ENABLED': os.getenv('METRICS_ENABLED', 'True').lower() in ('1', 'true', 'yes'),
+    'SERVER_TIMING': os.getenv('METRICS_SERVER_TIMING', 'False').lower() in ('1', 'true', 'yes'),
+    'TOKEN': os.getenv('METRICS_TOKEN'),
+    'DIR': os.getenv('METRICS_DIR') or None,
+    'FLUSH_INTERVAL': float(os.getenv('METRICS_FLUSH_INTERVAL', 1)),
+}
@@ -0,0 +1,69 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+
+from accounts.authentication import CachedTokenAuthentication
+from core.metrics import render as render_metrics
+
+
+class AsyncAPIView(View):
+    """
+    Базовый асинхронный обработчик API для ASGI.
+    Аутентификация по токену как в DRF (CachedTokenAuthentication), ответы в формате JSONRenderer.
+    Обработчики методов наследников должны быть асинхронными.
+    drf-spectacular описывает только DRF-представления, поэтому схема OpenAPI обработчика
+    берется из DRF-представления schema_view (оно не обрабатывает запросы)
+    """
+    authentication_class = CachedTokenAuthentication
+    renderer = JSONRenderer()
+    schema_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if cls.schema_view is not None:
+            view.cls, view.initkwargs = cls.schema_view, {}
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        authenticator = self.authentication_class()
+        try:
+            result = await authenticator.aauthenticate(request)
+        except exceptions.AuthenticationFailed as error:
+            return self.unauthorized(authenticator, error.detail)
+        if result is None:
+            return self.unauthorized(authenticator, exceptions.NotAuthenticated.default_detail)
+
+        request.user, request.auth = result
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as error:
+            return self.render({'detail': error.detail}, status=error.status_code)
+
+    # Метод для формирования ответа в формате JSON
+    def render(self, data, status: int = 200) -> HttpResponse:
+        return HttpResponse(self.renderer.render(data), status=status, content_type=self.renderer.media_type)
+
+    # Метод для формирования ответа об ошибке аутентификации (как в DRF)
+    def unauthorized(self, authenticator, detail: str) -> HttpResponse:
+        response = self.render({'detail': detail}, status=401)
+        response['WWW-Authenticate'] = authenticator.authenticate_header(self.request)
+        return response
+
+
+def metrics(request) -> HttpResponse:
+    """
+    Метрики воркеров в текстовом формате Prometheus.
+    Без METRICS['TOKEN'] доступ открыт только при DEBUG
+    """
+    token = settings.METRICS['TOKEN']
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')